@@ -0,0 +1,242 @@
+"""
+Benchmark the chart renderers.
+
+Every renderer draws every chart in a fresh process, so the first render includes the lazy imports
+and setup of the renderer. Run from the root of the project. The settings require a Discord token,
+but the benchmark does not use it, so any value will do:
+
+    DISCORD_TOKEN=unused poetry run python -m benchmarks.charts
+"""
+
+import argparse
+import datetime
+import json
+import math
+import resource
+import statistics
+import sys
+import time
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass
+from multiprocessing import get_context
+from pathlib import Path
+
+from courageous_comets.enums import Duration
+from courageous_comets.models import MessageFrequency
+from courageous_comets.ui.charts import frequency_line, keywords_bars
+
+# Renders before measuring the warm render time and memory, to fill caches of the libraries
+WARMUP_RENDERS = 10
+
+# Unit of `ru_maxrss` in bytes
+MAXRSS_UNIT = 1 if sys.platform == "darwin" else 1024
+
+
+@dataclass(frozen=True)
+class Result:
+    """
+    Measurements of a renderer drawing a chart.
+
+    Attributes
+    ----------
+    renderer : str
+        The name of the renderer.
+    case : str
+        The name of the chart.
+    cold_ms : float
+        The time of the first render in a fresh process, in milliseconds.
+    warm_median_ms : float
+        The median time of the measured renders, in milliseconds.
+    warm_p95_ms : float
+        The 95th percentile time of the measured renders, in milliseconds.
+    rss_growth_kib : int
+        The growth of the peak resident set size over the measured renders, in KiB. Should stay
+        close to zero. Steady growth points to figures or images that are never released.
+    png_bytes : int
+        The size of the rendered image.
+    """
+
+    renderer: str
+    case: str
+    cold_ms: float
+    warm_median_ms: float
+    warm_p95_ms: float
+    rss_growth_kib: int
+    png_bytes: int
+
+
+def _frequencies(count: int) -> tuple[list[MessageFrequency], Duration]:
+    """Create a message frequency series of one point per minute."""
+    start = datetime.datetime(2024, 7, 1, tzinfo=datetime.UTC)
+    frequencies = [
+        MessageFrequency(
+            timestamp=start + datetime.timedelta(minutes=minute),
+            num_messages=round(30 + 20 * math.sin(minute / 120) + minute % 7),
+        )
+        for minute in range(count)
+    ]
+    return frequencies, Duration.minute
+
+
+def _keywords() -> tuple[list[tuple[str, int]]]:
+    """Create the top 10 keywords."""
+    words = ["comet", "python", "discord", "redis", "search", "chart", "bot", "jam", "code", "fun"]
+    return ([(word, 100 - i * 9) for i, word in enumerate(words)],)
+
+
+# Charts to benchmark, with the renderers of the chart and its input data
+CASES: dict[str, tuple[dict[str, Callable[..., bytes]], Callable[[], tuple]]] = {
+    "frequency-1": (frequency_line.RENDERERS, lambda: _frequencies(1)),
+    "frequency-60": (frequency_line.RENDERERS, lambda: _frequencies(60)),
+    "frequency-1440": (frequency_line.RENDERERS, lambda: _frequencies(1440)),
+    "keywords-10": (keywords_bars.RENDERERS, _keywords),
+}
+
+
+def run(renderer: str, case: str, renders: int, output: Path | None) -> Result:
+    """
+    Measure a renderer drawing a chart. Call this in a fresh process.
+
+    Parameters
+    ----------
+    renderer : str
+        The name of the renderer. See `courageous_comets.settings.CHART_RENDERER`.
+    case : str
+        The name of the chart. See `CASES`.
+    renders : int
+        The number of renders to measure.
+    output : pathlib.Path | None
+        The directory to save the rendered chart to for visual comparison, if any.
+
+    Returns
+    -------
+    Result
+        The measurements.
+    """
+    renderers, data = CASES[case]
+    draw = renderers[renderer]
+    args = data()
+
+    start = time.perf_counter()
+    image = draw(*args)
+    cold = time.perf_counter() - start
+
+    for _ in range(WARMUP_RENDERS):
+        draw(*args)
+
+    baseline = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    timings: list[float] = []
+
+    for _ in range(renders):
+        start = time.perf_counter()
+        draw(*args)
+        timings.append(time.perf_counter() - start)
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    if output is not None:
+        output.mkdir(parents=True, exist_ok=True)
+        (output / f"{case}-{renderer}.png").write_bytes(image)
+
+    return Result(
+        renderer=renderer,
+        case=case,
+        cold_ms=cold * 1000,
+        warm_median_ms=statistics.median(timings) * 1000,
+        warm_p95_ms=statistics.quantiles(timings, n=20)[-1] * 1000 if renders > 1 else cold * 1000,
+        rss_growth_kib=(peak - baseline) * MAXRSS_UNIT // 1024,
+        png_bytes=len(image),
+    )
+
+
+def format_results(results: list[Result]) -> str:
+    """
+    Format the results as a table.
+
+    Parameters
+    ----------
+    results : list[Result]
+        The results to format.
+
+    Returns
+    -------
+    str
+        The table.
+    """
+    header = (
+        f"{'case':<16}{'renderer':<12}{'cold ms':>10}{'median ms':>11}{'p95 ms':>10}"
+        f"{'rss KiB':>10}{'png bytes':>11}"
+    )
+    rows = [
+        f"{result.case:<16}{result.renderer:<12}{result.cold_ms:>10.1f}"
+        f"{result.warm_median_ms:>11.2f}{result.warm_p95_ms:>10.2f}"
+        f"{result.rss_growth_kib:>10}{result.png_bytes:>11}"
+        for result in results
+    ]
+    return "\n".join([header, "-" * len(header), *rows])
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="benchmarks.charts",
+        description="Benchmark the chart renderers.",
+    )
+    parser.add_argument(
+        "--renderer",
+        action="append",
+        choices=sorted(frequency_line.RENDERERS),
+        help="A renderer to benchmark. Can be repeated (default: all).",
+    )
+    parser.add_argument(
+        "--case",
+        action="append",
+        choices=list(CASES),
+        help="A chart to benchmark. Can be repeated (default: all).",
+    )
+    parser.add_argument(
+        "--renders",
+        type=int,
+        default=1000,
+        help="The number of warm renders to measure per chart (default: 1000).",
+    )
+    parser.add_argument("--json", type=Path, help="Also write the results to a JSON file.")
+    parser.add_argument("--output", type=Path, help="Save the rendered charts to a directory.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    """Run the benchmarks and report the results."""
+    args = parse_args()
+    renderers = args.renderer or sorted(frequency_line.RENDERERS)
+    cases = args.case or list(CASES)
+
+    # A new process per measurement, so every cold render starts from scratch
+    with ProcessPoolExecutor(
+        max_workers=1,
+        mp_context=get_context("spawn"),
+        max_tasks_per_child=1,
+    ) as pool:
+        futures = [
+            pool.submit(run, renderer, case, args.renders, args.output)
+            for case in cases
+            for renderer in renderers
+        ]
+        results = [future.result() for future in futures]
+
+    sys.stdout.write(format_results(results) + "\n")
+
+    if args.json is not None:
+        args.json.write_text(json.dumps([asdict(result) for result in results], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
 import importlib.metadata
 import logging
+from typing import TYPE_CHECKING
 
-from .client import bot
+# Import the startup profiler first, so it can time the imports of the application
+from .startup import PROFILER  # noqa: F401
+
+if TYPE_CHECKING:
+    from .client import bot  # noqa: TCH004 (imported on first use, see `__getattr__`)
 
 __all__ = ["bot"]
 
@@ -11,3 +16,14 @@ try:
 except importlib.metadata.PackageNotFoundError:
     logging.warning("Could not determine the package version.")
     __version__ = "latest"
+
+
+def __getattr__(name: str) -> object:
+    """Import the bot on first use, so importing a module of the package does not create it."""
+    if name == "bot":
+        from .client import bot
+
+        return bot
+
+    message = f"module {__name__!r} has no attribute {name!r}"
+    raise AttributeError(message)
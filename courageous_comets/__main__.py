@@ -1,10 +1,18 @@
+import argparse
 import asyncio
 import contextlib
 import logging
+import sys
+from pathlib import Path
 
 import discord
 
 from courageous_comets import __version__, bot, exceptions, settings
+from courageous_comets.client import CONFIG
+from courageous_comets.nltk import init_nltk
+from courageous_comets.redis import init_binary_redis
+from courageous_comets.redis.bulk import export_guild, import_guild
+from courageous_comets.transformers import init_transformers
 
 
 async def main() -> None:
@@ -30,5 +38,129 @@ async def main() -> None:
         await bot.close()
 
 
+async def export_data(guild_id: str, directory: Path) -> None:
+    """
+    Export the messages of a guild from Redis to a directory.
+
+    Parameters
+    ----------
+    guild_id : str
+        The ID of the guild to export.
+    directory : pathlib.Path
+        The directory to write the export to.
+    """
+    settings.setup_logging()
+
+    try:
+        redis = await init_binary_redis()
+    except exceptions.CourageousCometsError as e:
+        logging.critical("Could not export the messages of guild %s.", guild_id, exc_info=e)
+        return
+
+    try:
+        await export_guild(redis, guild_id=guild_id, directory=directory)
+    except OSError as e:
+        logging.critical("Could not export the messages of guild %s.", guild_id, exc_info=e)
+    finally:
+        await redis.aclose()
+
+
+async def import_data(directory: Path) -> None:
+    """
+    Import the messages of a guild from a directory to Redis.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The directory of the export to import.
+    """
+    settings.setup_logging()
+
+    try:
+        redis = await init_binary_redis()
+    except exceptions.CourageousCometsError as e:
+        logging.critical("Could not import the messages in %s.", directory, exc_info=e)
+        return
+
+    try:
+        await import_guild(redis, directory=directory)
+    except (OSError, ValueError) as e:
+        logging.critical("Could not import the messages in %s.", directory, exc_info=e)
+    finally:
+        await redis.aclose()
+
+
+async def prepare() -> None:
+    """
+    Download the NLTK resources and transformer models in the bot configuration.
+
+    Run this ahead of time, for example when building an image, so the bot can start without the
+    network. Exits with an error if a resource cannot be downloaded.
+    """
+    settings.setup_logging()
+
+    try:
+        await init_nltk(CONFIG.get("nltk", []))
+        await init_transformers(CONFIG.get("transformers", []))
+    except (exceptions.CourageousCometsError, OSError) as e:
+        logging.critical("Could not download the resources of the application.", exc_info=e)
+        sys.exit(1)
+
+    logging.info("Downloaded the resources to %s and %s", settings.NLTK_DATA_DIR, settings.HF_HOME)
+
+
+def parse_args() -> argparse.Namespace:
+    """
+    Parse the command line arguments.
+
+    Without a command, the bot is started.
+
+    Returns
+    -------
+    argparse.Namespace
+        The parsed arguments.
+    """
+    parser = argparse.ArgumentParser(
+        prog="courageous_comets",
+        description="The Courageous Comets Discord bot.",
+    )
+    parser.add_argument(
+        "--profile-startup",
+        action="store_true",
+        help="Log how long each phase of the startup takes. Same as setting PROFILE_STARTUP=true.",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    export_parser = commands.add_parser(
+        "export",
+        help="Export the messages of a guild to a directory of columnar .npy files.",
+    )
+    export_parser.add_argument("guild_id", help="The ID of the guild to export.")
+    export_parser.add_argument("directory", type=Path, help="The directory to write to.")
+
+    import_parser = commands.add_parser(
+        "import",
+        help="Import the messages of a guild from a directory made with the export command.",
+    )
+    import_parser.add_argument("directory", type=Path, help="The directory to read from.")
+
+    commands.add_parser(
+        "prepare",
+        help="Download the NLTK resources and transformer models, for example at image build.",
+    )
+
+    return parser.parse_args()
+
+
+args = parse_args()
+
 with contextlib.suppress(KeyboardInterrupt):
-    asyncio.run(main())
+    match args.command:
+        case "export":
+            asyncio.run(export_data(args.guild_id, args.directory))
+        case "import":
+            asyncio.run(import_data(args.directory))
+        case "prepare":
+            asyncio.run(prepare())
+        case _:
+            asyncio.run(main())
@@ -0,0 +1,203 @@
+from collections.abc import Iterator, MutableMapping
+from dataclasses import dataclass
+from typing import override
+
+from cachetools import TTLCache
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """
+    A snapshot of the usage of a cache.
+
+    Attributes
+    ----------
+    hits : int
+        The number of lookups that found a value.
+    misses : int
+        The number of lookups that did not find a value.
+    evictions : int
+        The number of values removed to make room for new ones.
+    size : int
+        The number of values in the cache.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+    @property
+    def hit_rate(self) -> float:
+        """The fraction of lookups that found a value, or 0 if there were no lookups."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class InstrumentedTTLCache[K, V](TTLCache[K, V]):
+    """
+    A size-bounded LRU cache with a time-to-live that keeps track of its hit rate.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of values to keep. The least recently used value is evicted first.
+    ttl : float
+        The number of seconds a value stays valid.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # Removals read values through __getitem__ as well; those are not lookups
+        self._counting = True
+
+    @override
+    def __getitem__(self, key: K) -> V:
+        try:
+            value = super().__getitem__(key)
+        except KeyError:
+            if self._counting:
+                self._misses += 1
+            raise
+
+        if self._counting:
+            self._hits += 1
+
+        return value
+
+    @override
+    def get(self, key: K, default: V | None = None) -> V | None:
+        # The base class checks membership first, so a missing key never reaches __getitem__
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    @override
+    def pop(self, key: K, *args: V) -> V:
+        self._counting = False
+        try:
+            return super().pop(key, *args)
+        finally:
+            self._counting = True
+
+    @override
+    def popitem(self) -> tuple[K, V]:
+        # Called by the base class when the cache is full
+        self._counting = False
+        try:
+            result = super().popitem()
+        finally:
+            self._counting = True
+
+        self._evictions += 1
+        return result
+
+    @property
+    def stats(self) -> CacheStats:
+        """A snapshot of the usage of the cache."""
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            size=len(self),
+        )
+
+
+class TwoTierCache[K, V](MutableMapping[K, V | None]):
+    """
+    A cache of lookups that may find nothing, with a shorter time-to-live for empty results.
+
+    Values are kept in the positive tier. Lookups that found nothing are stored as `None` in the
+    negative tier, so they are retried sooner. Both tiers are size-bounded LRU caches.
+
+    Parameters
+    ----------
+    maxsize : int
+        The maximum number of values to keep in each tier.
+    ttl : float
+        The number of seconds a value stays valid.
+    negative_ttl : float
+        The number of seconds an empty result stays valid.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, negative_ttl: float) -> None:
+        self.positive = InstrumentedTTLCache[K, V](maxsize=maxsize, ttl=ttl)
+        self.negative = InstrumentedTTLCache[K, None](maxsize=maxsize, ttl=negative_ttl)
+
+    @override
+    def __getitem__(self, key: K) -> V | None:
+        try:
+            return self.positive[key]
+        except KeyError:
+            return self.negative[key]
+
+    @override
+    def __setitem__(self, key: K, value: V | None) -> None:
+        self.discard(key)
+
+        if value is None:
+            self.negative[key] = None
+        else:
+            self.positive[key] = value
+
+    @override
+    def __delitem__(self, key: K) -> None:
+        if key not in self:
+            raise KeyError(key)
+
+        self.discard(key)
+
+    @override
+    def __contains__(self, key: object) -> bool:
+        return key in self.positive or key in self.negative
+
+    @override
+    def __iter__(self) -> Iterator[K]:
+        yield from self.positive
+        yield from self.negative
+
+    @override
+    def __len__(self) -> int:
+        return len(self.positive) + len(self.negative)
+
+    def discard(self, key: K) -> None:
+        """
+        Remove a key from both tiers, if present, without counting it as a lookup.
+
+        Parameters
+        ----------
+        key : K
+            The key to remove.
+        """
+        if key in self.positive:
+            del self.positive[key]
+
+        if key in self.negative:
+            del self.negative[key]
+
+    @override
+    def clear(self) -> None:
+        """Remove all keys from both tiers."""
+        self.positive.clear()
+        self.negative.clear()
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        A snapshot of the usage of both tiers combined.
+
+        Lookups that found an empty result count as hits. The stats of each tier are available
+        through `positive.stats` and `negative.stats`.
+        """
+        positive, negative = self.positive.stats, self.negative.stats
+        return CacheStats(
+            hits=positive.hits + negative.hits,
+            # Only lookups that missed the positive tier reach the negative tier
+            misses=negative.misses,
+            evictions=positive.evictions + negative.evictions,
+            size=positive.size + negative.size,
+        )
@@ -1,17 +1,31 @@
+import asyncio
+import itertools
 import logging
+import time
 import typing
-from typing import override
+from collections.abc import Awaitable, Callable
+from typing import TYPE_CHECKING, override
 
 import discord
 import yaml
 from discord import Intents
 from discord.ext import commands
-from redis.asyncio import Redis
 
-from courageous_comets import settings
+from courageous_comets import exceptions, models, settings
+from courageous_comets.discord import SCHEDULER
+from courageous_comets.discord.messages import MESSAGE_CACHE
+from courageous_comets.local_index import LocalSearch
 from courageous_comets.nltk import init_nltk
-from courageous_comets.redis import init_redis
-from courageous_comets.vectorizer import Vectorizer
+from courageous_comets.redis import RedisClient, init_binary_redis, init_redis, init_replicas
+from courageous_comets.redis.cache import QUERY_CACHE
+from courageous_comets.redis.cluster import close_shards
+from courageous_comets.redis.messages import delete_messages
+from courageous_comets.redis.replicas import ReplicaPool
+from courageous_comets.startup import PROFILER
+from courageous_comets.ui.charts.cache import CHART_CACHE
+
+if TYPE_CHECKING:
+    from courageous_comets.vectorizer import Vectorizer
 
 DESCRIPTION = """
 Thank you for using Courageous Comets! ☄️
@@ -40,26 +54,80 @@ class CourageousCometsBot(commands.Bot):
 
     Attributes
     ----------
-    redis : redis.asyncio.Redis | None
+    redis : courageous_comets.redis.RedisClient | None
         The Redis connection instance for the bot, or `None` if not connected.
+    redis_binary : courageous_comets.redis.RedisClient | None
+        The binary-safe Redis connection instance for vector payloads, or `None` if not connected.
+    replicas : courageous_comets.redis.replicas.ReplicaPool | None
+        The Redis read replicas for the bot, or `None` if no replicas are configured.
+    local_search : courageous_comets.local_index.LocalSearch
+        The in-memory search indexes for the guilds in `LOCAL_SEARCH_GUILDS`.
+    vectorizer : courageous_comets.vectorizer.Vectorizer | None
+        The model to encode messages with, or `None` while it is loading.
+    vectorizer_ready : asyncio.Event
+        Set once the vectorizer is loaded.
     """
 
-    redis: Redis | None = None
-    vectorizer = Vectorizer()
+    redis: RedisClient | None = None
+    redis_binary: RedisClient | None = None
+    replicas: ReplicaPool | None = None
+    vectorizer: "Vectorizer | None" = None
 
     def __init__(self) -> None:
         super().__init__(
             command_prefix=commands.when_mentioned,
             intents=intents,
             description=DESCRIPTION,
+            http_trace=SCHEDULER.trace_config(),
+        )
+        self._replicas_monitor: asyncio.Task[None] | None = None
+        self._local_search_loader: asyncio.Task[None] | None = None
+        self._vectorizer_loader: asyncio.Task[None] | None = None
+        self.vectorizer_ready = asyncio.Event()
+        self.local_search = LocalSearch(
+            settings.LOCAL_SEARCH_GUILDS,
+            snapshot_dir=settings.SNAPSHOT_DIR,
         )
 
+    async def read[T](self, query: Callable[[RedisClient], Awaitable[T]]) -> T:
+        """
+        Run a search or aggregation query.
+
+        The query runs on a healthy read replica if replicas are configured, otherwise on the
+        primary. A query that fails because its replica cannot be reached runs again on the
+        primary.
+
+        Parameters
+        ----------
+        query : Callable[[courageous_comets.redis.RedisClient], Awaitable[T]]
+            The query to run, given the connection to run it on.
+
+        Returns
+        -------
+        T
+            The result of the query.
+
+        Raises
+        ------
+        courageous_comets.exceptions.DatabaseConnectionError
+            If the bot is not connected to Redis.
+        """
+        if self.redis is None:
+            message = "The bot is not connected to Redis"
+            raise exceptions.DatabaseConnectionError(message)
+
+        if self.replicas is None:
+            return await query(self.redis)
+
+        return await self.replicas.read(query)
+
     @override
     async def close(self) -> None:
         """
         Gracefully shut down the application.
 
-        First closes the Discord client, then the Redis connection if it exists.
+        First closes the Discord client, then saves the snapshots of the in-memory search indexes
+        and closes the Redis connections if they exist.
 
         Overrides the `close` method in `discord.ext.commands.Bot`.
         """
@@ -67,42 +135,221 @@ class CourageousCometsBot(commands.Bot):
 
         await super().close()
 
+        if self._replicas_monitor is not None:
+            self._replicas_monitor.cancel()
+
+        if self._local_search_loader is not None:
+            self._local_search_loader.cancel()
+
+        # The loader closes the bot itself if the vectorizer cannot be loaded
+        loader = self._vectorizer_loader
+
+        if loader is not None and loader is not asyncio.current_task():
+            loader.cancel()
+
+        if settings.LOCAL_SEARCH_GUILDS and self.redis is not None:
+            await self.local_search.save(self.redis)
+            logger.info("Saved the snapshots of the in-memory search indexes")
+
+        if self.replicas is not None:
+            await self.replicas.aclose()
+            logger.info("Closed the Redis replica connections")
+
         if self.redis is not None:
             await self.redis.aclose()
+            await close_shards()
             logger.info("Closed the Redis connection")
 
+        if self.redis_binary is not None:
+            await self.redis_binary.aclose()
+            logger.info("Closed the binary Redis connection")
+
+        for name, stats in [("Query", QUERY_CACHE.stats), ("Message", MESSAGE_CACHE.stats)]:
+            logger.info(
+                "%s cache hit rate: %.1f%% (%s hits, %s misses, %s evictions)",
+                name,
+                stats.hit_rate * 100,
+                stats.hits,
+                stats.misses,
+                stats.evictions,
+            )
+
+        for priority, queue in SCHEDULER.stats.items():
+            logger.info(
+                "Discord API %s requests: %s (mean wait %.3fs, max wait %.3fs)",
+                priority.name.lower(),
+                queue.requests,
+                queue.mean_wait,
+                queue.max_wait,
+            )
+
         logger.info("Application shutdown complete. Goodbye! 👋")
 
+    async def wait_for_vectorizer(self) -> "Vectorizer":
+        """
+        Wait until the vectorizer is loaded.
+
+        Use this for background work, such as processing new messages, so the work is queued until
+        the model is ready. Commands should not wait, but tell the user the bot is warming up.
+
+        Returns
+        -------
+        courageous_comets.vectorizer.Vectorizer
+            The vectorizer.
+        """
+        await self.vectorizer_ready.wait()
+        return typing.cast("Vectorizer", self.vectorizer)
+
+    async def _load_vectorizer(self) -> None:
+        """
+        Load and warm up the vectorizer in a worker thread and signal that it is ready.
+
+        If the vectorizer cannot be loaded for any reason, the bot is closed. Otherwise, work that
+        waits for the vectorizer would wait forever.
+        """
+        logger.info("Loading the vectorizer...")
+        start = time.perf_counter()
+
+        try:
+            # Import here, so importing the client does not load PyTorch and the transformers
+            from courageous_comets.vectorizer import load_vectorizer
+
+            with PROFILER.phase("load_vectorizer"):
+                self.vectorizer = await asyncio.to_thread(load_vectorizer)
+        except Exception as e:  # noqa: BLE001
+            logger.critical("Could not load the vectorizer.", exc_info=e)
+            await self.close()
+            return
+
+        self.vectorizer_ready.set()
+        logger.info("Vectorizer loaded in %.1fs", time.perf_counter() - start)
+
+    async def forget_messages(self, guild_id: str, message_ids: list[str]) -> int:
+        """
+        Delete messages from Redis and the in-memory search indexes.
+
+        Parameters
+        ----------
+        guild_id : str
+            The ID of the guild the messages were sent in.
+        message_ids : list[str]
+            The IDs of the messages to delete.
+
+        Returns
+        -------
+        int
+            The number of messages that were deleted from Redis.
+
+        Raises
+        ------
+        courageous_comets.exceptions.DatabaseConnectionError
+            If the bot is not connected to Redis.
+        """
+        if self.redis is None:
+            message = "The bot is not connected to Redis"
+            raise exceptions.DatabaseConnectionError(message)
+
+        deleted = await delete_messages(self.redis, guild_id=guild_id, message_ids=message_ids)
+
+        for message_id in message_ids:
+            self.local_search.remove_message(guild_id, message_id)
+
+        return deleted
+
+    async def prune_messages(self, messages: list[models.Message]) -> None:
+        """
+        Delete search results that no longer exist on Discord.
+
+        Pass this as `on_not_found` to `resolve_messages`, so later searches do not try to fetch
+        the messages again.
+
+        Parameters
+        ----------
+        messages : list[courageous_comets.models.Message]
+            The messages to delete.
+        """
+
+        def guild_id(message: models.Message) -> str:
+            return message.guild_id
+
+        for guild, group in itertools.groupby(sorted(messages, key=guild_id), key=guild_id):
+            message_ids = [message.message_id for message in group]
+
+            try:
+                await self.forget_messages(guild, message_ids)
+            except exceptions.DatabaseConnectionError:
+                logger.warning("Could not prune messages %s", message_ids)
+
     async def load_cogs(self, cogs: list[str]) -> None:
         """Load all given cogs."""
         for cog in cogs:
             try:
-                await bot.load_extension(cog)
+                with PROFILER.phase(f"load_cog {cog}"):
+                    await bot.load_extension(cog)
                 logger.debug("Loaded cog %s", cog)
             except commands.ExtensionError as e:
                 logger.exception("Failed to load cog %s", cog, exc_info=e)
 
     async def on_ready(self) -> None:
-        """Log a message when the bot is ready."""
+        """
+        Log a message when the bot is ready.
+
+        If the startup is profiled, logs the startup profile once the vectorizer is loaded as well.
+        """
         logger.info("Logged in as %s", self.user)
 
+        if PROFILER.enabled and not PROFILER.reported:
+            PROFILER.mark("ready")
+            await self.vectorizer_ready.wait()
+            PROFILER.log_report()
+
     async def setup_hook(self) -> None:
         """
         On startup, initialize the bot.
 
         Performs the following setup actions:
 
-        - Connect to Redis.
+        - Start loading the vectorizer in the background.
+        - Connect to Redis and its read replicas.
+        - Share rendered charts on Redis, if enabled.
+        - Load the in-memory search indexes.
         - Load the NLTK resources.
-        - Set up the vectorizer.
         - Load the cogs.
+
+        The bot connects to Discord without waiting for the vectorizer. Until it is loaded, new
+        messages are queued and commands that need it reply that the bot is warming up.
         """
         logger.info("Initializing the Discord client...")
 
-        self.redis = await init_redis()
+        self._vectorizer_loader = asyncio.create_task(self._load_vectorizer())
+
+        with PROFILER.phase("init_redis"):
+            self.redis = await init_redis()
+
+        with PROFILER.phase("init_binary_redis"):
+            self.redis_binary = await init_binary_redis()
+
+        if settings.CHART_CACHE_REDIS_TTL > 0:
+            CHART_CACHE.redis = self.redis_binary
+
+        with PROFILER.phase("init_replicas"):
+            self.replicas = await init_replicas(self.redis)
+
+        if self.replicas is not None:
+            self._replicas_monitor = asyncio.create_task(
+                self.replicas.monitor(settings.REDIS_REPLICA_HEALTH_CHECK_INTERVAL),
+            )
+
+        if settings.LOCAL_SEARCH_GUILDS:
+            # Load in the background. New messages are indexed as they arrive in the meantime.
+            self._local_search_loader = asyncio.create_task(
+                self.local_search.load(self.redis_binary),
+            )
 
         nltk_resources = CONFIG.get("nltk", [])
-        await init_nltk(nltk_resources)
+
+        with PROFILER.phase("init_nltk"):
+            await init_nltk(nltk_resources)
 
         cogs = CONFIG.get("cogs", [])
         await self.load_cogs(cogs)
@@ -83,11 +83,14 @@ class Frequency(commands.Cog):
                 ephemeral=True,
             )
 
-        frequencies = await get_messages_frequency(
-            self.bot.redis,
-            guild_id=str(interaction.guild.id),
-            duration=duration,
-            limit=10_000,
+        guild_id = str(interaction.guild.id)
+        frequencies = await self.bot.read(
+            lambda redis: get_messages_frequency(
+                redis,
+                guild_id=guild_id,
+                duration=duration,
+                limit=10_000,
+            ),
         )
 
         if not frequencies:
@@ -102,7 +105,7 @@ class Frequency(commands.Cog):
 
         embed = message_frequency.render(frequencies, duration)
 
-        chart = frequency_line.render(frequencies, duration)
+        chart = await frequency_line.render(frequencies, duration)
         embed.set_image(url=f"attachment://{chart.filename}")
 
         logger.debug(
@@ -1,17 +1,24 @@
+import datetime
 import logging
 
 import discord
 from discord import app_commands
 from discord.ext import commands
 
-from courageous_comets import preprocessing
+from courageous_comets import models, preprocessing
 from courageous_comets.client import CourageousCometsBot
-from courageous_comets.discord.messages import resolve_messages
-from courageous_comets.redis.messages import get_messages_by_semantics_similarity
-from courageous_comets.ui.embeds import search_results
+from courageous_comets.redis.messages import (
+    get_messages_by_hybrid_similarity,
+    get_messages_within_distance,
+)
+from courageous_comets.redis.search import save_search_results
+from courageous_comets.ui.views.search_results import SearchResultsView
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of best matches to page through
+MAX_RESULTS = 25
+
 
 class SearchCommand(commands.Cog):
     """
@@ -29,10 +36,19 @@ class SearchCommand(commands.Cog):
         self.bot = bot
 
     @app_commands.command(name="search", description="Search for related messages.")
-    async def search_by_topic(
+    @app_commands.describe(
+        query="The topic to search for.",
+        sentiment="Prefer messages with this sentiment, from -1 (negative) to 1 (positive).",
+        days="Only search messages from the last number of days.",
+        distance="Show all messages within this distance (0-2) instead of the best matches.",
+    )
+    async def search_by_topic(  # noqa: PLR0911, PLR0913
         self,
         interaction: discord.Interaction,
         query: str,
+        sentiment: app_commands.Range[float, -1, 1] | None = None,
+        days: app_commands.Range[int, 1, 365] | None = None,
+        distance: app_commands.Range[float, 0, 2] | None = None,
     ) -> None:
         """
         Search for related messages using the /search command.
@@ -43,6 +59,13 @@ class SearchCommand(commands.Cog):
             The interaction that triggered the command.
         query : str
             The query to search for related messages.
+        sentiment : float | None
+            The sentiment to search for, if any. Ignored if `distance` is given.
+        days : int | None
+            The number of days to search back, if any. Ignored if `distance` is given.
+        distance : float | None
+            The maximum distance of the results to the query, if any. Returns all messages
+            within the distance instead of the best matches.
         """
         logger.info(
             "User %s requested a search for related messages %s using the /search command.",
@@ -60,6 +83,16 @@ class SearchCommand(commands.Cog):
                 ephemeral=True,
             )
 
+        if self.bot.vectorizer is None:
+            logger.info(
+                "Could not answer search request %s due to the vectorizer still loading.",
+                interaction.id,
+            )
+            return await interaction.response.send_message(
+                "The bot is still warming up. Please try again in a moment.",
+                ephemeral=True,
+            )
+
         if not interaction.guild:
             logger.debug(
                 "Could not answer search request %s due to it being used outside of a guild.",
@@ -95,24 +128,51 @@ class SearchCommand(commands.Cog):
         query_processed = preprocessing.process(query)
         embedding = await self.bot.vectorizer.aencode(query_processed)
 
-        messages = await get_messages_by_semantics_similarity(
-            self.bot.redis,
-            guild_id=str(interaction.guild.id),
-            embedding=embedding,
-            limit=5,
-        )
-
-        resolved_messages = await resolve_messages(self.bot, messages)
+        guild_id = str(interaction.guild.id)
+        since = discord.utils.utcnow() - datetime.timedelta(days=days) if days else None
+        local_index = self.bot.local_search.get(guild_id)
+
+        if distance is not None:
+            messages = await self.bot.read(
+                lambda redis: get_messages_within_distance(
+                    redis,
+                    guild_id=guild_id,
+                    embedding=embedding,
+                    distance=distance,
+                ),
+            )
+        elif local_index is not None:
+            messages = local_index.search(
+                embedding,
+                sentiment=sentiment,
+                since=since,
+                limit=MAX_RESULTS,
+                weights=models.SearchWeights(),
+            )
+        else:
+            messages = await self.bot.read(
+                lambda redis: get_messages_by_hybrid_similarity(
+                    redis,
+                    guild_id=guild_id,
+                    embedding=embedding,
+                    sentiment=sentiment,
+                    since=since,
+                    limit=MAX_RESULTS,
+                ),
+            )
 
-        if not resolved_messages:
+        if not messages:
             logger.debug("No related messages were found for search request %s.", interaction.id)
             return await interaction.followup.send("No related messages were found.")
 
-        embed = search_results.render(query, resolved_messages)
+        # Store the results on the primary, so that pages can be read back right away
+        page = await save_search_results(self.bot.redis, messages, guild_id=guild_id)
+        view = SearchResultsView(self.bot.redis, guild_id=guild_id, query=query, page=page)
+        embed = await view.render(self.bot)
 
         logger.debug("Returning search results for search request %s.", interaction.id)
 
-        return await interaction.followup.send(embed=embed)
+        return await interaction.followup.send(embed=embed, view=view)
 
 
 async def setup(bot: CourageousCometsBot) -> None:
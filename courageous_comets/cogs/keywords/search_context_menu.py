@@ -6,7 +6,11 @@ from discord.ext import commands
 
 from courageous_comets import preprocessing
 from courageous_comets.client import CourageousCometsBot
-from courageous_comets.discord.messages import resolve_messages
+from courageous_comets.discord.messages import (
+    OVERSAMPLING,
+    most_recent_first,
+    resolve_messages,
+)
 from courageous_comets.processing import process_message
 from courageous_comets.redis.keys import key_schema
 from courageous_comets.redis.messages import get_messages_by_semantics_similarity
@@ -14,6 +18,9 @@ from courageous_comets.ui.embeds import search_results
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of messages shown in the search results
+MAX_RESULTS = 5
+
 
 class SearchContextMenu(commands.Cog):
     """A boilerplate cog."""
@@ -49,7 +56,7 @@ class SearchContextMenu(commands.Cog):
             message.id,
         )
 
-        if self.bot.redis is None:
+        if self.bot.redis is None or self.bot.redis_binary is None:
             logger.error(
                 "Could not answer search request %s due to Redis being unavailable.",
                 interaction.id,
@@ -59,6 +66,16 @@ class SearchContextMenu(commands.Cog):
                 ephemeral=True,
             )
 
+        if self.bot.vectorizer is None:
+            logger.info(
+                "Could not answer search request %s due to the vectorizer still loading.",
+                interaction.id,
+            )
+            return await interaction.response.send_message(
+                "The bot is still warming up. Please try again in a moment.",
+                ephemeral=True,
+            )
+
         if message.guild is None:
             logger.debug(
                 "Could not answer search request %s due to it being used outside of a guild.",
@@ -76,28 +93,40 @@ class SearchContextMenu(commands.Cog):
             message_id=message.id,
         )
 
-        if not self.bot.redis.exists(key):
+        if not await self.bot.redis.exists(key):
             await process_message(
                 message,
-                redis=self.bot.redis,
+                redis=self.bot.redis_binary,
                 vectorizer=self.bot.vectorizer,
+                local_search=self.bot.local_search,
             )
 
         content_processed = preprocessing.process(message.clean_content)
         embedding = await self.bot.vectorizer.aencode(content_processed)
 
-        messages = await get_messages_by_semantics_similarity(
-            self.bot.redis,
-            guild_id=str(message.guild.id),
-            embedding=embedding,
-            limit=6,
-        )
+        guild_id = str(message.guild.id)
+        local_index = self.bot.local_search.get(guild_id)
+
+        if local_index is not None:
+            messages = local_index.search(embedding, limit=MAX_RESULTS * OVERSAMPLING + 1)
+        else:
+            messages = await self.bot.read(
+                lambda redis: get_messages_by_semantics_similarity(
+                    redis,
+                    guild_id=guild_id,
+                    embedding=embedding,
+                    limit=MAX_RESULTS * OVERSAMPLING + 1,
+                ),
+            )
 
-        resolved_messages = [
-            resolved_message
-            for resolved_message in await resolve_messages(self.bot, messages)
-            if resolved_message.id != message.id
-        ]
+        resolved_messages = await resolve_messages(
+            self.bot,
+            [result for result in messages if result.message_id != str(message.id)],
+            # Snippets are looked up by key, which is cheap enough for the primary
+            redis=self.bot.redis,
+            limit=MAX_RESULTS,
+            on_not_found=self.bot.prune_messages,
+        )
 
         if not resolved_messages:
             logger.debug("No related messages were found for search request %s.", interaction.id)
@@ -106,7 +135,10 @@ class SearchContextMenu(commands.Cog):
                 ephemeral=True,
             )
 
-        embed = search_results.render(message.clean_content, resolved_messages)
+        embed = search_results.render(
+            message.clean_content,
+            most_recent_first(resolved_messages),
+        )
 
         logger.debug("Returning search results for search request %s.", interaction.id)
 
@@ -1,12 +1,15 @@
+import asyncio
 import logging
+from collections import Counter
 
 import discord
 import discord.ext
 import discord.ext.commands
 
+from courageous_comets import settings
 from courageous_comets.client import CourageousCometsBot
 from courageous_comets.enums import StatisticScope
-from courageous_comets.redis.messages import get_tokens_count
+from courageous_comets.redis.messages import get_tokens_count, get_tokens_count_exact
 from courageous_comets.ui.charts import keywords_bars
 from courageous_comets.ui.embeds import popular_topics
 
@@ -95,12 +98,7 @@ class TopicsCommand(discord.ext.commands.Cog):
             else None
         )
 
-        keywords = await get_tokens_count(
-            self.bot.redis,
-            guild_id=str(interaction.guild.id),
-            scope=scope,
-            ids=ids,
-        )
+        keywords = await self._count_keywords(str(interaction.guild.id), scope, ids)
 
         if not keywords:
             logger.debug(
@@ -114,11 +112,50 @@ class TopicsCommand(discord.ext.commands.Cog):
 
         embed = popular_topics.render(scope, keywords)
 
-        chart = keywords_bars.render(keywords)
+        chart = await keywords_bars.render(keywords)
         embed.set_image(url=f"attachment://{chart.filename}")
 
         return await interaction.followup.send(embed=embed, file=chart, ephemeral=True)
 
+    async def _count_keywords(
+        self,
+        guild_id: str,
+        scope: StatisticScope,
+        ids: list[str] | None,
+    ) -> Counter[str]:
+        """
+        Count the keywords in the given scope.
+
+        Guild-wide counts cover all messages in the guild. If that takes longer than
+        `courageous_comets.settings.AGGREGATE_TIMEOUT`, the aggregation is cancelled and the count
+        falls back to the most recent messages. Other scopes always count the most recent messages.
+        """
+        if scope == StatisticScope.GUILD:
+            try:
+                async with asyncio.timeout(settings.AGGREGATE_TIMEOUT):
+                    return await self.bot.read(
+                        lambda redis: get_tokens_count_exact(
+                            redis,
+                            guild_id=guild_id,
+                            scope=scope,
+                            ids=ids,
+                        ),
+                    )
+            except TimeoutError:
+                logger.warning(
+                    "Counting all keywords in guild %s timed out. Falling back to recent messages.",
+                    guild_id,
+                )
+
+        return await self.bot.read(
+            lambda redis: get_tokens_count(
+                redis,
+                guild_id=guild_id,
+                scope=scope,
+                ids=ids,
+            ),
+        )
+
 
 async def setup(bot: CourageousCometsBot) -> None:
     """Load the cog."""
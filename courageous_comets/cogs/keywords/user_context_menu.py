@@ -79,16 +79,19 @@ class KeywordsUserContextMenu(discord.ext.commands.Cog):
 
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        tokens = await get_tokens_count(
-            self.bot.redis,
-            guild_id=str(interaction.guild.id),
-            scope=StatisticScope.USER,
-            ids=[str(user.id)],
+        guild_id = str(interaction.guild.id)
+        tokens = await self.bot.read(
+            lambda redis: get_tokens_count(
+                redis,
+                guild_id=guild_id,
+                scope=StatisticScope.USER,
+                ids=[str(user.id)],
+            ),
         )
 
         embed = user_keywords.render(user, tokens)
 
-        chart = keywords_bars.render(tokens)
+        chart = await keywords_bars.render(tokens)
         embed.set_image(url=f"attachment://{chart.filename}")
 
         return await interaction.followup.send(embed=embed, file=chart, ephemeral=True)
@@ -4,6 +4,8 @@ import discord
 from discord.ext import commands
 
 from courageous_comets.client import CourageousCometsBot
+from courageous_comets.discord import SCHEDULER, Priority
+from courageous_comets.discord.messages import invalidate_message
 from courageous_comets.processing import process_message
 
 logger = logging.getLogger(__name__)
@@ -13,6 +15,9 @@ class Messages(commands.Cog):
     """
     A cog that listens for messages from discord and forwards them to processing.
 
+    Edited messages are processed again and deleted messages are deleted from Redis, so the
+    stored data matches the messages on Discord.
+
     Attributes
     ----------
     bot : CourageousCometsBot
@@ -34,7 +39,92 @@ class Messages(commands.Cog):
         message : discord.Message
             The message to save.
         """
-        if not self.bot.redis:
+        await self._process(message)
+
+    @commands.Cog.listener(name="on_message_edit")
+    async def on_message_edit(self, before: discord.Message, after: discord.Message) -> None:
+        """
+        When a cached message is edited, process it again to update its stored analysis.
+
+        Parameters
+        ----------
+        before : discord.Message
+            The message before the edit.
+        after : discord.Message
+            The message after the edit.
+        """
+        if before.content != after.content:
+            await self._process(after)
+
+    @commands.Cog.listener(name="on_raw_message_edit")
+    async def on_raw_message_edit(self, payload: discord.RawMessageUpdateEvent) -> None:
+        """
+        When a message that is not cached is edited, fetch it and process it again.
+
+        Edits of cached messages are handled by `on_message_edit`. In both cases, the message is
+        removed from the cache of messages fetched for search results.
+
+        Parameters
+        ----------
+        payload : discord.RawMessageUpdateEvent
+            The edit event.
+        """
+        invalidate_message(payload.channel_id, payload.message_id)
+
+        if payload.cached_message is not None or "content" not in payload.data:
+            return
+
+        channel = self.bot.get_channel(payload.channel_id)
+
+        if not isinstance(channel, discord.TextChannel):
+            return
+
+        try:
+            async with SCHEDULER.request(
+                "GET",
+                f"/channels/{channel.id}/messages/{payload.message_id}",
+                priority=Priority.RESOLUTION,
+            ):
+                message = await channel.fetch_message(payload.message_id)
+        except discord.NotFound:
+            logger.debug("Edited message %s no longer exists", payload.message_id)
+            return
+
+        await self._process(message)
+
+    @commands.Cog.listener(name="on_raw_message_delete")
+    async def on_raw_message_delete(self, payload: discord.RawMessageDeleteEvent) -> None:
+        """
+        When a message is deleted, delete it from Redis as well.
+
+        Parameters
+        ----------
+        payload : discord.RawMessageDeleteEvent
+            The delete event.
+        """
+        invalidate_message(payload.channel_id, payload.message_id)
+        await self._delete(payload.guild_id, [payload.message_id])
+
+    @commands.Cog.listener(name="on_raw_bulk_message_delete")
+    async def on_raw_bulk_message_delete(
+        self,
+        payload: discord.RawBulkMessageDeleteEvent,
+    ) -> None:
+        """
+        When messages are deleted in bulk, delete them from Redis as well.
+
+        Parameters
+        ----------
+        payload : discord.RawBulkMessageDeleteEvent
+            The bulk delete event.
+        """
+        for message_id in payload.message_ids:
+            invalidate_message(payload.channel_id, message_id)
+
+        await self._delete(payload.guild_id, list(payload.message_ids))
+
+    async def _process(self, message: discord.Message) -> None:
+        if not self.bot.redis_binary:
             return logger.error(
                 "Ignoring message %s because the bot is not connected to Redis",
                 message.id,
@@ -53,10 +143,14 @@ class Messages(commands.Cog):
                 validation_errors,
             )
 
+        if not self.bot.vectorizer_ready.is_set():
+            logger.debug("Queueing message %s until the vectorizer is loaded", message.id)
+
         key = await process_message(
             message,
-            redis=self.bot.redis,
-            vectorizer=self.bot.vectorizer,
+            redis=self.bot.redis_binary,
+            vectorizer=await self.bot.wait_for_vectorizer(),
+            local_search=self.bot.local_search,
         )
 
         return logger.debug(
@@ -65,6 +159,23 @@ class Messages(commands.Cog):
             key,
         )
 
+    async def _delete(self, guild_id: int | None, message_ids: list[int]) -> None:
+        if guild_id is None:
+            return None
+
+        if not self.bot.redis:
+            return logger.error(
+                "Not deleting messages %s because the bot is not connected to Redis",
+                message_ids,
+            )
+
+        deleted = await self.bot.forget_messages(
+            str(guild_id),
+            [str(message_id) for message_id in message_ids],
+        )
+
+        return logger.debug("Deleted %s of messages %s", deleted, message_ids)
+
 
 async def setup(bot: CourageousCometsBot) -> None:
     """
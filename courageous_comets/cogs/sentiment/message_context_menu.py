@@ -61,7 +61,7 @@ class SentimentMessageContextMenu(commands.Cog):
             message.id,
         )
 
-        if self.bot.redis is None:
+        if self.bot.redis is None or self.bot.redis_binary is None:
             logger.error(
                 "Could not answer sentiment request %s due to Redis being unavailable.",
                 interaction.id,
@@ -89,11 +89,24 @@ class SentimentMessageContextMenu(commands.Cog):
         )
 
         if not await self.bot.redis.exists(key):
+            if self.bot.vectorizer is None:
+                logger.info(
+                    "Could not process message %s for sentiment request %s due to the vectorizer "
+                    "still loading.",
+                    message.id,
+                    interaction.id,
+                )
+                return await interaction.followup.send(
+                    "The bot is still warming up. Please try again in a moment.",
+                    ephemeral=True,
+                )
+
             logger.debug("Message %s is not previously saved. Processing it.", message.id)
             await process_message(
                 message,
-                redis=self.bot.redis,
+                redis=self.bot.redis_binary,
                 vectorizer=self.bot.vectorizer,
+                local_search=self.bot.local_search,
             )
 
         analysis_result = await get_message_sentiment(key, redis=self.bot.redis)
@@ -107,7 +120,7 @@ class SentimentMessageContextMenu(commands.Cog):
 
         embed = message_sentiment.render(analysis_result)
 
-        chart = sentiment_bars.for_message(message.id, analysis_result)
+        chart = await sentiment_bars.for_message(message.id, analysis_result)
         embed.set_image(url=f"attachment://{chart.filename}")
 
         view = SentimentView(message.author, analysis_result)
@@ -6,13 +6,20 @@ from discord.ext import commands
 
 from courageous_comets import preprocessing
 from courageous_comets.client import CourageousCometsBot
-from courageous_comets.discord.messages import resolve_messages
+from courageous_comets.discord.messages import (
+    OVERSAMPLING,
+    most_recent_first,
+    resolve_messages,
+)
 from courageous_comets.redis.messages import get_messages_by_sentiment_similarity
 from courageous_comets.sentiment import calculate_sentiment
 from courageous_comets.ui.embeds import search_results
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of messages shown in the search results
+MAX_RESULTS = 5
+
 
 class SentimentSearchCommand(commands.Cog):
     """
@@ -77,15 +84,23 @@ class SentimentSearchCommand(commands.Cog):
         prepared_content = preprocessing.process(query)
         sentiment = calculate_sentiment(prepared_content)
 
-        messages = await get_messages_by_sentiment_similarity(
-            self.bot.redis,
-            guild_id=str(interaction.guild.id),
-            sentiment=sentiment.compound,
-            radius=0.1,
-            limit=5,
+        guild_id = str(interaction.guild.id)
+        messages = await self.bot.read(
+            lambda redis: get_messages_by_sentiment_similarity(
+                redis,
+                guild_id=guild_id,
+                sentiment=sentiment.compound,
+                radius=0.1,
+                limit=MAX_RESULTS * OVERSAMPLING,
+            ),
         )
 
-        resolved_messages = await resolve_messages(self.bot, messages)
+        resolved_messages = await resolve_messages(
+            self.bot,
+            messages,
+            limit=MAX_RESULTS,
+            on_not_found=self.bot.prune_messages,
+        )
 
         if not resolved_messages:
             logger.debug("No data found for sentiment request %s.", interaction.id)
@@ -94,7 +109,7 @@ class SentimentSearchCommand(commands.Cog):
                 ephemeral=True,
             )
 
-        embed = search_results.render(query, resolved_messages)
+        embed = search_results.render(query, most_recent_first(resolved_messages))
 
         logger.debug("Sending sentiment analysis results for %s.", interaction.id)
 
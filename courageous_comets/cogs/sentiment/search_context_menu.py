@@ -5,7 +5,11 @@ from discord import app_commands
 from discord.ext import commands
 
 from courageous_comets.client import CourageousCometsBot
-from courageous_comets.discord.messages import resolve_messages
+from courageous_comets.discord.messages import (
+    OVERSAMPLING,
+    most_recent_first,
+    resolve_messages,
+)
 from courageous_comets.processing import process_message
 from courageous_comets.redis.keys import key_schema
 from courageous_comets.redis.messages import (
@@ -16,6 +20,9 @@ from courageous_comets.ui.embeds import search_results
 
 logger = logging.getLogger(__name__)
 
+# Maximum number of messages shown in the search results
+MAX_RESULTS = 5
+
 
 class SentimentSearchContextMenu(commands.Cog):
     """
@@ -58,7 +65,7 @@ class SentimentSearchContextMenu(commands.Cog):
             message.id,
         )
 
-        if self.bot.redis is None:
+        if self.bot.redis is None or self.bot.redis_binary is None:
             logger.error(
                 "Could not answer sentiment request %s due to Redis being unavailable.",
                 interaction.id,
@@ -86,11 +93,24 @@ class SentimentSearchContextMenu(commands.Cog):
         )
 
         if not await self.bot.redis.exists(key):
+            if self.bot.vectorizer is None:
+                logger.info(
+                    "Could not process message %s for sentiment request %s due to the vectorizer "
+                    "still loading.",
+                    message.id,
+                    interaction.id,
+                )
+                return await interaction.followup.send(
+                    "The bot is still warming up. Please try again in a moment.",
+                    ephemeral=True,
+                )
+
             logger.debug("Message %s is not previously saved. Processing it.", message.id)
             await process_message(
                 message,
-                redis=self.bot.redis,
+                redis=self.bot.redis_binary,
                 vectorizer=self.bot.vectorizer,
+                local_search=self.bot.local_search,
             )
 
         analysis_result = await get_message_sentiment(key, redis=self.bot.redis)
@@ -102,19 +122,23 @@ class SentimentSearchContextMenu(commands.Cog):
                 ephemeral=True,
             )
 
-        messages = await get_messages_by_sentiment_similarity(
-            self.bot.redis,
-            guild_id=str(message.guild.id),
-            sentiment=analysis_result.compound,
-            radius=0.1,
-            limit=6,
+        guild_id = str(message.guild.id)
+        messages = await self.bot.read(
+            lambda redis: get_messages_by_sentiment_similarity(
+                redis,
+                guild_id=guild_id,
+                sentiment=analysis_result.compound,
+                radius=0.1,
+                limit=MAX_RESULTS * OVERSAMPLING + 1,
+            ),
         )
 
-        resolved_messages = [
-            resolved_message
-            for resolved_message in await resolve_messages(self.bot, messages)
-            if resolved_message.id != message.id
-        ]
+        resolved_messages = await resolve_messages(
+            self.bot,
+            [result for result in messages if result.message_id != str(message.id)],
+            limit=MAX_RESULTS,
+            on_not_found=self.bot.prune_messages,
+        )
 
         if not resolved_messages:
             logger.debug("No search results found for sentiment request %s.", interaction.id)
@@ -123,7 +147,7 @@ class SentimentSearchContextMenu(commands.Cog):
                 ephemeral=True,
             )
 
-        embed = search_results.render(message.clean_content, resolved_messages)
+        embed = search_results.render(message.clean_content, most_recent_first(resolved_messages))
 
         logger.debug("Sending sentiment analysis results for %s.", interaction.id)
 
@@ -83,11 +83,14 @@ class SentimentUserContextMenu(commands.Cog):
 
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        sentiment_results = await get_average_sentiment(
-            redis=self.bot.redis,
-            guild_id=str(interaction.guild.id),
-            ids=[str(user.id)],
-            scope=StatisticScope.USER,
+        guild_id = str(interaction.guild.id)
+        sentiment_results = await self.bot.read(
+            lambda redis: get_average_sentiment(
+                redis=redis,
+                guild_id=guild_id,
+                ids=[str(user.id)],
+                scope=StatisticScope.USER,
+            ),
         )
 
         if not sentiment_results:
@@ -101,7 +104,7 @@ class SentimentUserContextMenu(commands.Cog):
 
         embed = user_sentiment.render(user, average_sentiment)
 
-        chart = sentiment_bars.for_user(average_sentiment)
+        chart = await sentiment_bars.for_user(average_sentiment)
         embed.set_image(url=f"attachment://{chart.filename}")
 
         view = SentimentView(user, average_sentiment)
@@ -1,8 +1,7 @@
-import asyncio
-
 from courageous_comets import settings
+from courageous_comets.discord.scheduler import Priority, Scheduler
 
-# Limit the number of concurrent requests to the Discord API.
-SEMAPHORE = asyncio.Semaphore(settings.DISCORD_API_CONCURRENCY)
+# Schedules requests to the Discord API by priority, within the rate limits of each route.
+SCHEDULER = Scheduler(settings.DISCORD_API_CONCURRENCY)
 
-__all__ = ["SEMAPHORE"]
+__all__ = ["SCHEDULER", "Priority"]
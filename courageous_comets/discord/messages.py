@@ -1,22 +1,54 @@
 import asyncio
+import itertools
 import logging
+from collections.abc import Awaitable, Callable
 
 import discord
 from asyncache import cached
-from cachetools import LRUCache
 
-from courageous_comets import models
-from courageous_comets.discord import SEMAPHORE
+from courageous_comets import models, settings
+from courageous_comets.caching import TwoTierCache
+from courageous_comets.discord import SCHEDULER, Priority
+from courageous_comets.redis import RedisClient
+from courageous_comets.redis.keys import key_schema
+from courageous_comets.redis.messages import get_message_snippets
 
 logger = logging.getLogger(__name__)
 
+# Messages fetched from Discord by channel and message ID, or `None` if they were not found
+MESSAGE_CACHE: TwoTierCache[str, discord.Message] = TwoTierCache(
+    maxsize=settings.MESSAGE_CACHE_SIZE,
+    ttl=settings.MESSAGE_CACHE_TTL,
+    negative_ttl=settings.MESSAGE_NEGATIVE_CACHE_TTL,
+)
+
+# Number of messages returned by a single history request
+HISTORY_LIMIT = 100
+
+# Number of search results to fetch per message shown, to make up for unresolvable messages
+OVERSAMPLING = 2
 
-async def resolve_messages(
+
+async def resolve_messages(  # noqa: PLR0913
     client: discord.Client,
     messages: list[models.Message],
-) -> list[discord.Message]:
+    *,
+    redis: RedisClient | None = None,
+    limit: int | None = None,
+    priority: Priority = Priority.INTERACTIVE,
+    on_not_found: Callable[[list[models.Message]], Awaitable[object]] | None = None,
+) -> list[discord.Message | models.Message]:
     """
-    Try and resolve a list of messages from Redis to Discord messages.
+    Try and resolve a list of messages from Redis to displayable messages.
+
+    Messages with a stored snippet are returned as is, without calling the Discord API. Edited
+    messages are processed again and deleted messages are removed from Redis, so snippets are
+    up to date. Only the messages without a snippet are fetched from Discord, in bulk per channel
+    where possible. See `get_channel_messages`.
+
+    Channels are fetched concurrently. Once `limit` messages are resolved, the remaining fetches
+    are cancelled, so a slow channel does not delay the result. Pass more messages than `limit`
+    to make up for messages that cannot be resolved. See `OVERSAMPLING`.
 
     Messages that could not be resolved are not included in the returned list. Messages that have no
     content are also filtered out.
@@ -26,37 +58,308 @@ async def resolve_messages(
     client : discord.Client
         The discord client to use to fetch the messages.
     messages : list[models.Message]
-        The messages to resolve.
+        The messages to resolve, most relevant first.
+    redis : courageous_comets.redis.RedisClient | None
+        If given, snippets missing from `messages` are read from Redis before falling back to
+        Discord. Use this for messages that were not read from Redis themselves.
+    limit : int | None
+        The maximum number of messages to return, or `None` to resolve all messages.
+    priority : courageous_comets.discord.Priority
+        The priority of the requests to Discord (default: INTERACTIVE).
+    on_not_found : Callable[[list[models.Message]], Awaitable[object]] | None
+        If given, called with the messages that no longer exist on Discord, for example to
+        remove them from the index.
 
     Returns
     -------
-    list[discord.Message]
-        A list of `discord.Message` instances that were found.
+    list[discord.Message | courageous_comets.models.Message]
+        The messages that were found, in the same order as `messages`.
     """
-    requests = [
-        get_message(client, int(message.channel_id), int(message.message_id))
-        for message in messages
+    if redis is not None:
+        messages = await _with_snippets(messages, redis=redis)
+
+    # Messages ranked below the first `limit` messages with a snippet can never be returned
+    candidates: list[models.Message] = []
+    found = 0
+
+    for message in messages:
+        if limit is not None and found >= limit:
+            break
+
+        candidates.append(message)
+        found += bool(message.snippet)
+
+    pending = sorted(
+        (int(message.channel_id), int(message.message_id))
+        for message in candidates
+        if message.snippet is None
+    )
+    fetched: dict[int, discord.Message | None] = {}
+    tasks = [
+        asyncio.create_task(
+            _get_channel_messages(
+                client,
+                channel_id,
+                [message_id for _, message_id in group],
+                priority=priority,
+            ),
+        )
+        for channel_id, group in itertools.groupby(pending, key=lambda pair: pair[0])
     ]
+
+    try:
+        for task in asyncio.as_completed(tasks):
+            channel_messages = await task
+            fetched.update(channel_messages)
+            found += sum(
+                1 for message in channel_messages.values() if message and message.clean_content
+            )
+
+            if limit is not None and found >= limit:
+                break
+    finally:
+        for task in tasks:
+            task.cancel()
+
+        # Let the cancelled fetches give back their slots of the scheduler
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    not_found = [
+        message
+        for message in candidates
+        if message.snippet is None
+        and int(message.message_id) in fetched
+        and fetched[int(message.message_id)] is None
+    ]
+
+    if not_found and on_not_found is not None:
+        logger.debug("Pruning %s messages that no longer exist on Discord", len(not_found))
+        await on_not_found(not_found)
+
+    resolved = [
+        message if message.snippet is not None else fetched.get(int(message.message_id))
+        for message in candidates
+    ]
+
     return [
         message
-        for message in await asyncio.gather(*requests)
-        if message is not None and message.clean_content
+        for message in resolved
+        if message is not None
+        and (message.snippet if isinstance(message, models.Message) else message.clean_content)
+    ][:limit]
+
+
+def most_recent_first(
+    messages: list[discord.Message | models.Message],
+) -> list[discord.Message | models.Message]:
+    """
+    Sort resolved messages for display, most recent first.
+
+    Resolve messages in order of relevance and sort them afterwards, so that `resolve_messages`
+    keeps the most relevant messages when it stops at its limit.
+
+    Parameters
+    ----------
+    messages : list[discord.Message | courageous_comets.models.Message]
+        The resolved messages.
+
+    Returns
+    -------
+    list[discord.Message | courageous_comets.models.Message]
+        The messages, most recent first.
+    """
+    return sorted(
+        messages,
+        key=lambda message: (
+            message.timestamp if isinstance(message, models.Message) else message.created_at
+        ),
+        reverse=True,
+    )
+
+
+async def _get_channel_messages(
+    client: discord.Client,
+    channel_id: int,
+    message_ids: list[int],
+    *,
+    priority: Priority,
+) -> dict[int, discord.Message | None]:
+    """Fetch the messages of a channel, treating failed requests as unresolved messages."""
+    try:
+        return await get_channel_messages(client, channel_id, message_ids, priority=priority)
+    except discord.HTTPException:
+        logger.warning("Could not fetch messages from channel %s", channel_id, exc_info=True)
+        return {}
+
+
+async def _with_snippets(
+    messages: list[models.Message],
+    *,
+    redis: RedisClient,
+) -> list[models.Message]:
+    """Fill in the stored snippets of the messages that do not have one."""
+    missing = [message for message in messages if message.snippet is None]
+    keys = [
+        key_schema.guild_messages(
+            guild_id=int(message.guild_id),
+            message_id=int(message.message_id),
+        )
+        for message in missing
     ]
+    snippets = dict(
+        zip(
+            (message.message_id for message in missing),
+            await get_message_snippets(keys, redis=redis),
+            strict=True,
+        ),
+    )
+
+    return [
+        message.model_copy(update={"snippet": snippets[message.message_id]})
+        if message.message_id in snippets
+        else message
+        for message in messages
+    ]
+
+
+async def get_channel_messages(
+    client: discord.Client,
+    channel_id: int,
+    message_ids: list[int],
+    *,
+    priority: Priority = Priority.INTERACTIVE,
+) -> dict[int, discord.Message | None]:
+    """
+    Try and fetch multiple messages of the same channel from Discord.
+
+    The history of the channel is read in pages of `HISTORY_LIMIT` messages, starting at the
+    oldest message that is still missing, so messages that are close together in the channel
+    share a request however far apart in time they were sent. Messages that were not on the page
+    that covered them, and a last message without a close neighbour, are fetched one by one. All
+    fetched messages are added to the message cache.
+
+    Parameters
+    ----------
+    client : discord.Client
+        The discord client to use to fetch the messages.
+    channel_id : int
+        The ID of the channel the messages were sent in.
+    message_ids : list[int]
+        The IDs of the messages to fetch.
+    priority : courageous_comets.discord.Priority
+        The priority of the requests to Discord (default: INTERACTIVE).
+
+    Returns
+    -------
+    dict[int, discord.Message | None]
+        The messages that were found, by ID. Messages that no longer exist on Discord are `None`.
+    """
+    channel = client.get_channel(channel_id)
+
+    if not channel or not isinstance(channel, discord.TextChannel):
+        return {}
+
+    result: dict[int, discord.Message | None] = {}
+    missing: list[int] = []
+
+    for message_id in sorted(set(message_ids)):
+        key = _cache_key(channel_id, message_id)
+
+        try:
+            result[message_id] = MESSAGE_CACHE[key]
+        except KeyError:
+            missing.append(message_id)
+
+    # Page through the history from the oldest message that is still missing. Each page holds
+    # the next `HISTORY_LIMIT` messages, so it covers a long time in a quiet channel and a short
+    # time in a busy one.
+    unresolved: list[int] = []
+
+    while len(missing) > 1:
+        page = await _get_history_page(channel, after=missing[0] - 1, priority=priority)
+        result.update(
+            (message_id, page[message_id]) for message_id in missing if message_id in page
+        )
+
+        # A short page reaches the end of the channel
+        end = max(page) if len(page) == HISTORY_LIMIT else None
+        unresolved.extend(
+            message_id
+            for message_id in missing
+            if (end is None or message_id <= end) and message_id not in page
+        )
+        missing = [message_id for message_id in missing if end is not None and message_id > end]
+
+    # Fetch the last message and the messages missing from the pages that covered them one by one,
+    # so that deleted messages are recognized
+    unresolved.extend(missing)
+    messages = await asyncio.gather(
+        *(
+            get_message(client, channel_id, message_id, priority=priority)
+            for message_id in unresolved
+        ),
+    )
+    result.update(zip(unresolved, messages, strict=True))
+
+    return result
+
+
+async def _get_history_page(
+    channel: discord.TextChannel,
+    *,
+    after: int,
+    priority: Priority,
+) -> dict[int, discord.Message]:
+    """Fetch the next `HISTORY_LIMIT` messages after a message with a single history request."""
+    async with SCHEDULER.request("GET", f"/channels/{channel.id}/messages", priority=priority):
+        logger.debug("Fetching the messages after %s from channel %s", after, channel.id)
+        page = {
+            message.id: message
+            async for message in channel.history(limit=HISTORY_LIMIT, after=discord.Object(after))
+        }
+
+    for message in page.values():
+        MESSAGE_CACHE[_cache_key(channel.id, message.id)] = message
+
+    return page
+
+
+def _cache_key(channel_id: int, message_id: int) -> str:
+    return f"{channel_id}-{message_id}"
+
+
+def invalidate_message(channel_id: int, message_id: int) -> None:
+    """
+    Remove a message from the message cache, so it is fetched again when it is next needed.
+
+    Call this when a message is edited or deleted.
+
+    Parameters
+    ----------
+    channel_id : int
+        The ID of the channel the message was sent in.
+    message_id : int
+        The ID of the message.
+    """
+    MESSAGE_CACHE.discard(_cache_key(channel_id, message_id))
 
 
 @cached(
-    LRUCache(maxsize=256),
-    key=lambda _, channel_id, message_id: f"{channel_id}-{message_id}",
+    MESSAGE_CACHE,
+    key=lambda _, channel_id, message_id, **__: _cache_key(channel_id, message_id),
 )
 async def get_message(
     client: discord.Client,
     channel_id: int,
     message_id: int,
+    *,
+    priority: Priority = Priority.INTERACTIVE,
 ) -> discord.Message | None:
     """
     Try and fetch a message from Discord given a `channel_id` and `message_id`.
 
-    Uses a cache to avoid fetching the same message multiple times.
+    Uses a cache to avoid fetching the same message multiple times. Messages that no longer exist
+    are cached as `None`.
 
     Parameters
     ----------
@@ -66,6 +369,8 @@ async def get_message(
         The channel id of the message.
     message_id : int
         The message id of the message.
+    priority : courageous_comets.discord.Priority
+        The priority of the request to Discord (default: INTERACTIVE).
 
     Returns
     -------
@@ -77,11 +382,12 @@ async def get_message(
     if not channel or not isinstance(channel, discord.TextChannel):
         return None
 
-    async with SEMAPHORE:
-        logging.debug("Fetching message %s from channel %s", message_id, channel_id)
-        resolved_message = await channel.fetch_message(message_id)
+    path = f"/channels/{channel_id}/messages/{message_id}"
 
-    if not resolved_message:
-        return None
-
-    return resolved_message
+    async with SCHEDULER.request("GET", path, priority=priority):
+        logging.debug("Fetching message %s from channel %s", message_id, channel_id)
+        try:
+            return await channel.fetch_message(message_id)
+        except discord.NotFound:
+            logger.debug("Message %s no longer exists in channel %s", message_id, channel_id)
+            return None
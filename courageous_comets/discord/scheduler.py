@@ -0,0 +1,344 @@
+import asyncio
+import contextlib
+import enum
+import heapq
+import itertools
+import logging
+import re
+import time
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass
+from types import SimpleNamespace
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Path segments whose ID is part of the rate limit bucket of a route
+MAJOR_PARAMETERS = ("channels", "guilds", "webhooks")
+
+# Matches the API version prefix of request paths
+API_PREFIX = re.compile(r"^/api(/v\d+)?")
+
+
+class Priority(enum.IntEnum):
+    """
+    Priority classes of requests to the Discord API, most urgent first.
+
+    Attributes
+    ----------
+    INTERACTIVE
+        Requests made to respond to an interaction, which must complete before its deadline.
+    RESOLUTION
+        Requests made in the background to keep data up to date.
+    BACKFILL
+        Bulk requests that can wait for all other requests.
+    """
+
+    INTERACTIVE = 0
+    RESOLUTION = 1
+    BACKFILL = 2
+
+
+@dataclass(frozen=True)
+class QueueStats:
+    """
+    A snapshot of the requests of a priority class.
+
+    Attributes
+    ----------
+    waiting : int
+        The number of requests waiting for their turn.
+    requests : int
+        The number of requests that got their turn.
+    total_wait : float
+        The total number of seconds requests waited for their turn.
+    max_wait : float
+        The longest number of seconds a request waited for its turn.
+    """
+
+    waiting: int
+    requests: int
+    total_wait: float
+    max_wait: float
+
+    @property
+    def mean_wait(self) -> float:
+        """The mean number of seconds requests waited for their turn, or 0 if there were none."""
+        return self.total_wait / self.requests if self.requests else 0.0
+
+
+class TokenBucket:
+    """
+    The rate limit of a route, as reported by the Discord API.
+
+    A bucket allows any number of requests until the API reports a limit. After that, requests
+    take a token each, and wait for the bucket to reset when no tokens are left. Until a response
+    reports when the new window resets, it is assumed to be as long as the longest reset reported
+    so far, so the bucket resets even if no response arrives.
+    """
+
+    def __init__(self) -> None:
+        self.limit: int | None = None
+        self.remaining = 0
+        self.reset_at = 0.0
+        self.window = 0.0
+        self._version = 0
+
+    async def acquire(self) -> int:
+        """
+        Take a token, waiting for the bucket to reset if none are left.
+
+        Returns
+        -------
+        int
+            The version of the bucket the token was taken from. See `release`.
+        """
+        while self.limit is not None:
+            now = time.monotonic()
+
+            if now >= self.reset_at:
+                self.remaining = self.limit
+                self.reset_at = now + self.window
+                self._version += 1
+
+            if self.remaining > 0:
+                self.remaining -= 1
+                return self._version
+
+            await asyncio.sleep(min(self.reset_at - now, 1.0))
+
+        return self._version
+
+    def release(self, version: int) -> None:
+        """
+        Give back a token that was not counted by the API.
+
+        The token is only given back if the bucket was neither reset nor updated since it was
+        taken, for example because the request was cancelled or failed before a response arrived.
+
+        Parameters
+        ----------
+        version : int
+            The version of the bucket returned by `acquire`.
+        """
+        if self.limit is not None and version == self._version:
+            self.remaining = min(self.remaining + 1, self.limit)
+
+    def update(self, *, limit: int, remaining: int, reset_after: float) -> None:
+        """
+        Update the bucket from the rate limit headers of a response.
+
+        Parameters
+        ----------
+        limit : int
+            The number of requests allowed per window.
+        remaining : int
+            The number of requests left in the current window.
+        reset_after : float
+            The number of seconds until the window resets.
+        """
+        if self.limit == limit:
+            # Responses can arrive out of order, so never hand out tokens the API already counted
+            self.remaining = min(self.remaining, remaining)
+            self.window = max(self.window, reset_after)
+        else:
+            self.remaining = remaining
+            self.window = reset_after
+
+        self.limit = limit
+        self.reset_at = time.monotonic() + reset_after
+        self._version += 1
+
+
+class Scheduler:
+    """
+    Schedule requests to the Discord API by priority and rate limit.
+
+    A request first waits for a token from the bucket of its route, which is kept up to date with
+    the rate limit headers of the responses. See `trace_config`. At most `concurrency` requests
+    are then made at once. When a slot frees up, it is given to the most urgent waiting request, in
+    order of arrival within a priority class. Requests that wait for their route to reset do not
+    hold a slot, so they cannot hold up requests on other routes.
+
+    Parameters
+    ----------
+    concurrency : int
+        The maximum number of concurrent requests.
+    """
+
+    def __init__(self, concurrency: int) -> None:
+        self._available = concurrency
+        self._waiters: list[tuple[Priority, int, asyncio.Future[None]]] = []
+        self._order = itertools.count()
+        self._buckets: dict[str, TokenBucket] = {}
+        self._requests = dict.fromkeys(Priority, 0)
+        self._total_wait = dict.fromkeys(Priority, 0.0)
+        self._max_wait = dict.fromkeys(Priority, 0.0)
+
+    @property
+    def stats(self) -> dict[Priority, QueueStats]:
+        """A snapshot of the requests of each priority class."""
+        waiting = dict.fromkeys(Priority, 0)
+
+        for priority, _, future in self._waiters:
+            if not future.done():
+                waiting[priority] += 1
+
+        return {
+            priority: QueueStats(
+                waiting=waiting[priority],
+                requests=self._requests[priority],
+                total_wait=self._total_wait[priority],
+                max_wait=self._max_wait[priority],
+            )
+            for priority in Priority
+        }
+
+    @contextlib.asynccontextmanager
+    async def request(
+        self,
+        method: str,
+        path: str,
+        *,
+        priority: Priority = Priority.INTERACTIVE,
+    ) -> AsyncIterator[None]:
+        """
+        Wait for the rate limit and turn of a request, and hold a slot while it is made.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        path : str
+            The path of the request, for example `/channels/1/messages/2`.
+        priority : courageous_comets.discord.scheduler.Priority
+            The priority class of the request (default: INTERACTIVE).
+        """
+        start = time.monotonic()
+        bucket = self._buckets.setdefault(route(method, path), TokenBucket())
+        version = await bucket.acquire()
+
+        try:
+            await self._acquire(priority)
+
+            try:
+                wait = time.monotonic() - start
+                self._requests[priority] += 1
+                self._total_wait[priority] += wait
+                self._max_wait[priority] = max(self._max_wait[priority], wait)
+
+                yield
+            finally:
+                self._release()
+        finally:
+            # Give back the token if no response reported the rate limit of the route
+            bucket.release(version)
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """
+        Create a trace configuration that updates the buckets from responses.
+
+        Pass it as `http_trace` to the `discord.Client`.
+
+        Returns
+        -------
+        aiohttp.TraceConfig
+            The trace configuration.
+        """
+        config = aiohttp.TraceConfig()
+        config.on_request_end.append(self._on_request_end)
+        return config
+
+    def update(self, method: str, path: str, headers: Mapping[str, str]) -> None:
+        """
+        Update the bucket of a route from the rate limit headers of a response.
+
+        Responses without rate limit headers are ignored.
+
+        Parameters
+        ----------
+        method : str
+            The HTTP method of the request.
+        path : str
+            The path of the request.
+        headers : Mapping[str, str]
+            The headers of the response.
+        """
+        try:
+            limit = int(headers["X-RateLimit-Limit"])
+            remaining = int(headers["X-RateLimit-Remaining"])
+            reset_after = float(headers["X-RateLimit-Reset-After"])
+        except (KeyError, ValueError):
+            return
+
+        key = route(method, path)
+        self._buckets.setdefault(key, TokenBucket()).update(
+            limit=limit,
+            remaining=remaining,
+            reset_after=reset_after,
+        )
+
+        if remaining == 0:
+            logger.debug("Rate limit of %s reached, resets in %.2fs", key, reset_after)
+
+    async def _acquire(self, priority: Priority) -> None:
+        if self._available > 0 and not self._waiters:
+            self._available -= 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._order), future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Pass on a slot that was handed over just before the cancellation
+            if future.done() and not future.cancelled():
+                self._release()
+            raise
+
+    def _release(self) -> None:
+        while self._waiters:
+            _, _, future = heapq.heappop(self._waiters)
+
+            if not future.done():
+                future.set_result(None)
+                return
+
+        self._available += 1
+
+    async def _on_request_end(
+        self,
+        _: aiohttp.ClientSession,
+        __: SimpleNamespace,
+        params: aiohttp.TraceRequestEndParams,
+    ) -> None:
+        self.update(params.method, params.url.path, params.response.headers)
+
+
+def route(method: str, path: str) -> str:
+    """
+    Get the rate limit route of a request.
+
+    IDs are replaced by a placeholder, except for the major parameters that Discord keeps separate
+    buckets for.
+
+    Parameters
+    ----------
+    method : str
+        The HTTP method of the request.
+    path : str
+        The path of the request, with or without the API prefix.
+
+    Returns
+    -------
+    str
+        The route, for example `GET /channels/1/messages/{id}`.
+    """
+    segments = API_PREFIX.sub("", path).strip("/").split("/")
+    result = [
+        "{id}" if segment.isdigit() and segments[i - 1] not in MAJOR_PARAMETERS else segment
+        for i, segment in enumerate(segments)
+    ]
+    return f"{method.upper()} /{"/".join(result)}"
@@ -0,0 +1,647 @@
+import asyncio
+import copy
+import datetime
+import logging
+import math
+from collections.abc import Iterable
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+import numpy.typing as npt
+
+from courageous_comets import models
+from courageous_comets.enums import StatisticScope
+from courageous_comets.redis.cache import get_generation
+from courageous_comets.redis.cluster import RedisClient
+from courageous_comets.redis.embeddings import scan_guild_messages
+from courageous_comets.redis.schema import EMBEDDING_DIMS
+from courageous_comets.snapshots import METADATA_DTYPE, Snapshot, SnapshotWriter, load_snapshot
+
+logger = logging.getLogger(__name__)
+
+# Number of dimensions of the message embeddings
+DIMS = EMBEDDING_DIMS
+
+# Number of rows to score at once. Bounds the size of the temporary score arrays.
+BLOCK_SIZE = 65_536
+
+# Number of rows to allocate for a new index
+INITIAL_CAPACITY = 1024
+
+# Hash fields to read when loading an index from Redis, in the order expected by `add`
+LOAD_FIELDS = [
+    "message_id",
+    "channel_id",
+    "user_id",
+    "timestamp",
+    "sentiment_compound",
+    "embedding",
+]
+
+
+class GuildVectorIndex:
+    """
+    An exact in-memory vector index over the messages of a single guild.
+
+    Embeddings are kept in a contiguous float32 matrix with one row per message. The IDs,
+    timestamps and sentiment of each message are kept in parallel arrays, so that filters can be
+    evaluated for all messages at once. Searches score every message in blocks of rows with a
+    single matrix multiplication per block and select the best rows with `numpy.argpartition`.
+
+    An index restored from a snapshot reads the memory-mapped snapshot files directly, until the
+    first change to the index copies the arrays into memory.
+
+    The index is not thread-safe. Use it from the event loop only.
+
+    Attributes
+    ----------
+    guild_id : str
+        The ID of the guild.
+    loaded : bool
+        Whether the index holds all messages of the guild, either restored from a snapshot or
+        loaded from Redis.
+    """
+
+    def __init__(self, guild_id: str, *, capacity: int = INITIAL_CAPACITY) -> None:
+        self.guild_id = guild_id
+        self.loaded = False
+        self._size = 0
+        self._positions: dict[int, int] = {}
+        self._vectors = np.empty((capacity, DIMS), dtype=np.float32)
+        self._message_ids = np.empty(capacity, dtype=np.uint64)
+        self._channel_ids = np.empty(capacity, dtype=np.uint64)
+        self._user_ids = np.empty(capacity, dtype=np.uint64)
+        self._timestamps = np.empty(capacity, dtype=np.float64)
+        self._sentiment = np.empty(capacity, dtype=np.float32)
+
+    def __len__(self) -> int:
+        """Return the number of messages in the index."""
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        """The number of bytes allocated or mapped by the index."""
+        return sum(array.nbytes for array in self._arrays())
+
+    def add(  # noqa: PLR0913
+        self,
+        *,
+        message_id: int,
+        channel_id: int,
+        user_id: int,
+        timestamp: float,
+        sentiment: float,
+        embedding: bytes | memoryview,
+    ) -> None:
+        """
+        Add a message to the index, or replace it if it is already indexed.
+
+        Parameters
+        ----------
+        message_id : int
+            The ID of the message.
+        channel_id : int
+            The ID of the channel the message was sent in.
+        user_id : int
+            The ID of the user who sent the message.
+        timestamp : float
+            The time the message was sent, in seconds since the epoch.
+        sentiment : float
+            The compound sentiment score of the message.
+        embedding : bytes | memoryview
+            The normalized float32 embedding vector of the message.
+        """
+        self._ensure_writable()
+        row = self._positions.get(message_id)
+
+        if row is None:
+            if self._size == len(self._vectors):
+                self._grow()
+
+            row = self._size
+            self._size += 1
+            self._positions[message_id] = row
+
+        self._vectors[row] = np.frombuffer(embedding, dtype=np.float32)
+        self._message_ids[row] = message_id
+        self._channel_ids[row] = channel_id
+        self._user_ids[row] = user_id
+        self._timestamps[row] = timestamp
+        self._sentiment[row] = sentiment
+
+    def add_message(self, message: models.MessageAnalysis) -> None:
+        """
+        Add an analyzed message to the index.
+
+        Parameters
+        ----------
+        message : courageous_comets.models.MessageAnalysis
+            The message to add.
+        """
+        self.add(
+            message_id=int(message.message_id),
+            channel_id=int(message.channel_id),
+            user_id=int(message.user_id),
+            timestamp=message.timestamp.timestamp(),
+            sentiment=message.sentiment.compound,
+            embedding=message.embedding,
+        )
+
+    def remove(self, message_id: int) -> bool:
+        """
+        Remove a message from the index.
+
+        The last row is moved into the place of the removed row to keep the arrays contiguous.
+
+        Parameters
+        ----------
+        message_id : int
+            The ID of the message.
+
+        Returns
+        -------
+        bool
+            Whether the message was indexed.
+        """
+        if message_id not in self._positions:
+            return False
+
+        self._ensure_writable()
+        row = self._positions.pop(message_id)
+        last = self._size - 1
+
+        if row != last:
+            for array in self._arrays():
+                array[row] = array[last]
+            self._positions[int(self._message_ids[row])] = row
+
+        self._size = last
+        return True
+
+    def restore(self, snapshot: Snapshot) -> None:
+        """
+        Replace the contents of the index with the messages in a snapshot.
+
+        Messages that were added to the index before the snapshot was restored are kept.
+
+        Parameters
+        ----------
+        snapshot : courageous_comets.snapshots.Snapshot
+            The snapshot to restore.
+        """
+        pending = [array[: self._size].copy() for array in self._arrays()]
+
+        metadata = snapshot.metadata
+        self._vectors = snapshot.embeddings
+        self._message_ids = metadata["message_id"]
+        self._channel_ids = metadata["channel_id"]
+        self._user_ids = metadata["user_id"]
+        self._timestamps = metadata["timestamp"]
+        self._sentiment = metadata["sentiment"]
+        self._size = len(snapshot)
+        self._positions = {
+            message_id: row for row, message_id in enumerate(self._message_ids.tolist())
+        }
+
+        for embedding, message_id, channel_id, user_id, timestamp, sentiment in zip(
+            *pending,
+            strict=True,
+        ):
+            self.add(
+                message_id=int(message_id),
+                channel_id=int(channel_id),
+                user_id=int(user_id),
+                timestamp=float(timestamp),
+                sentiment=float(sentiment),
+                embedding=embedding.tobytes(),
+            )
+
+    def copy(self) -> "GuildVectorIndex":
+        """
+        Copy the messages of the index into a new index.
+
+        Read the copy from another thread, for example to write a snapshot, while the index keeps
+        changing on the event loop.
+
+        Returns
+        -------
+        courageous_comets.local_index.GuildVectorIndex
+            The copy of the index.
+        """
+        result = copy.copy(self)
+        result._detach()  # noqa: SLF001
+        return result
+
+    def _detach(self) -> None:
+        """Give a copied index arrays of its own, holding only its messages."""
+        (
+            self._vectors,
+            self._message_ids,
+            self._channel_ids,
+            self._user_ids,
+            self._timestamps,
+            self._sentiment,
+        ) = (array[: self._size].copy() for array in self._arrays())
+        self._positions = self._positions.copy()
+
+    def write_snapshot(self, directory: Path, *, generation: int) -> None:
+        """
+        Write the contents of the index to a snapshot.
+
+        The rows are written in blocks, so the snapshot is never copied in memory as a whole.
+
+        Parameters
+        ----------
+        directory : pathlib.Path
+            The directory of the snapshot.
+        generation : int
+            The generation of the guild the index is up to date with.
+        """
+        size = self._size
+        arrays = self._arrays()
+
+        with SnapshotWriter(directory, generation=generation, dims=DIMS) as writer:
+            for start in range(0, size, BLOCK_SIZE):
+                stop = min(start + BLOCK_SIZE, size)
+                vectors, message_ids, channel_ids, user_ids, timestamps, sentiment = (
+                    array[start:stop] for array in arrays
+                )
+
+                metadata = np.empty(stop - start, dtype=METADATA_DTYPE)
+                metadata["message_id"] = message_ids
+                metadata["channel_id"] = channel_ids
+                metadata["user_id"] = user_ids
+                metadata["timestamp"] = timestamps
+                metadata["sentiment"] = sentiment
+
+                writer.append(vectors, metadata)
+
+    def search(  # noqa: PLR0913
+        self,
+        embedding: bytes,
+        *,
+        ids: list[str] | None = None,
+        scope: StatisticScope = StatisticScope.CHANNEL,
+        limit: int = 10,
+        sentiment: float | None = None,
+        sentiment_radius: float = 0.5,
+        since: datetime.datetime | None = None,
+        weights: models.SearchWeights | None = None,
+    ) -> list[models.Message]:
+        """
+        Get the messages that best match the given embedding.
+
+        Without `weights`, messages are ranked by cosine similarity only. With `weights`, messages
+        are ranked by the same weighted score as
+        `courageous_comets.redis.messages.get_messages_by_hybrid_similarity`, but over all
+        messages instead of the semantically closest candidates.
+
+        Parameters
+        ----------
+        embedding : bytes
+            The normalized float32 embedding vector of the query.
+        ids : list[str] | None
+            Optional list of IDs to search for.
+        scope : courageous_comets.enums.StatisticScope
+            The scope of additional IDs (default: courageous_comets.enums.StatisticScope.CHANNEL).
+            Ignored if it is set to courageous_comets.enums.StatisticScope.GUILD.
+        limit : int
+            The number of messages to return (default: 10).
+        sentiment : float | None
+            Only include messages within `sentiment_radius` of this sentiment, if given.
+        sentiment_radius : float
+            The maximum distance to the target sentiment (default: 0.5).
+        since : datetime.datetime | None
+            Only include messages sent after this moment, if given.
+        weights : courageous_comets.models.SearchWeights | None
+            The weights of the ranking signals, if any.
+
+        Returns
+        -------
+        list[courageous_comets.models.Message]
+            The best matching messages, best match first.
+        """
+        if not self._size or limit <= 0:
+            return []
+
+        query = np.frombuffer(embedding, dtype=np.float32)
+        mask = self._filter(ids, scope, sentiment, sentiment_radius, since)
+        now = datetime.datetime.now(datetime.UTC).timestamp()
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+
+        for start in range(0, self._size, BLOCK_SIZE):
+            stop = min(start + BLOCK_SIZE, self._size)
+            scores = self._score(start, stop, query, sentiment, weights, now)
+
+            if mask is not None:
+                scores[~mask[start:stop]] = -np.inf
+
+            rows = _top(scores, limit) + start
+            best_rows = np.concatenate([best_rows, rows])
+            best_scores = np.concatenate([best_scores, scores[rows - start]])
+
+            if len(best_rows) > limit:
+                keep = _top(best_scores, limit)
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+
+        order = np.argsort(-best_scores, kind="stable")
+        rows = best_rows[order][np.isfinite(best_scores[order])]
+
+        return [self._message(row) for row in rows]
+
+    def _score(  # noqa: PLR0913
+        self,
+        start: int,
+        stop: int,
+        query: npt.NDArray[np.float32],
+        sentiment: float | None,
+        weights: models.SearchWeights | None,
+        now: float,
+    ) -> npt.NDArray[np.float32]:
+        """Score the rows from `start` to `stop`."""
+        # Embeddings are normalized, so the dot product is the cosine similarity
+        similarity = self._vectors[start:stop] @ query
+
+        if weights is None:
+            return similarity
+
+        # Scale each signal to a score between 0 and 1, like the hybrid search on Redis
+        decay = math.log(2) / weights.recency_half_life
+        scores = weights.semantics * (1 + similarity) / 2
+        scores += weights.recency * np.exp(-decay * (now - self._timestamps[start:stop]))
+
+        if sentiment is not None:
+            proximity = 1 - np.abs(self._sentiment[start:stop] - sentiment) / 2
+            scores += weights.sentiment * proximity
+
+        return scores.astype(np.float32, copy=False)
+
+    def _filter(  # noqa: PLR0913
+        self,
+        ids: list[str] | None,
+        scope: StatisticScope,
+        sentiment: float | None,
+        sentiment_radius: float,
+        since: datetime.datetime | None,
+    ) -> npt.NDArray[np.bool_] | None:
+        """Get a mask of the rows that pass the filters, or None if there are no filters."""
+        mask: npt.NDArray[np.bool_] | None = None
+
+        def restrict(condition: npt.NDArray[np.bool_]) -> None:
+            nonlocal mask
+            mask = condition if mask is None else mask & condition
+
+        if ids and scope != StatisticScope.GUILD:
+            column = self._channel_ids if scope == StatisticScope.CHANNEL else self._user_ids
+            restrict(np.isin(column[: self._size], np.array(ids, dtype=np.uint64)))
+
+        if sentiment is not None:
+            distance = np.abs(self._sentiment[: self._size] - sentiment)
+            restrict(distance <= sentiment_radius)
+
+        if since is not None:
+            restrict(self._timestamps[: self._size] >= since.timestamp())
+
+        return mask
+
+    def _message(self, row: int) -> models.Message:
+        """Get the message stored at the given row."""
+        return models.Message(
+            message_id=str(self._message_ids[row]),
+            channel_id=str(self._channel_ids[row]),
+            guild_id=self.guild_id,
+            timestamp=datetime.datetime.fromtimestamp(self._timestamps[row], datetime.UTC),
+            user_id=str(self._user_ids[row]),
+        )
+
+    def _arrays(self) -> list[np.ndarray]:
+        return [
+            self._vectors,
+            self._message_ids,
+            self._channel_ids,
+            self._user_ids,
+            self._timestamps,
+            self._sentiment,
+        ]
+
+    def _ensure_writable(self) -> None:
+        """Copy the arrays of a restored snapshot into memory before the first change."""
+        if not self._vectors.flags.writeable:
+            logger.debug("Copying the snapshot of guild %s into memory", self.guild_id)
+            self._reallocate(self._size + INITIAL_CAPACITY)
+
+    def _grow(self) -> None:
+        """Double the capacity of the index."""
+        capacity = max(len(self._vectors) * 2, INITIAL_CAPACITY)
+        logger.debug("Growing the local index of guild %s to %s rows", self.guild_id, capacity)
+        self._reallocate(capacity)
+
+    def _reallocate(self, capacity: int) -> None:
+        (
+            self._vectors,
+            self._message_ids,
+            self._channel_ids,
+            self._user_ids,
+            self._timestamps,
+            self._sentiment,
+        ) = (self._resize(array, capacity) for array in self._arrays())
+
+    def _resize(self, array: np.ndarray, capacity: int) -> np.ndarray:
+        result = np.empty((capacity, *array.shape[1:]), dtype=array.dtype)
+        result[: self._size] = array[: self._size]
+        return result
+
+
+def _top(scores: npt.NDArray[np.float32], k: int) -> npt.NDArray[np.int64]:
+    """Get the indices of the `k` highest scores, in no particular order."""
+    if len(scores) <= k:
+        return np.arange(len(scores))
+    return np.argpartition(scores, -k)[-k:]
+
+
+class LocalSearch:
+    """
+    In-memory vector indexes for a selection of guilds.
+
+    Serves searches for very active guilds from memory instead of Redis. The indexes are loaded
+    on startup and kept up to date with newly processed messages.
+
+    If a snapshot directory is given, each index is restored from its snapshot if the snapshot is
+    up to date with the guild on Redis, and loaded from Redis otherwise. Snapshots are written
+    after loading from Redis and on `save`.
+
+    Parameters
+    ----------
+    guild_ids : collections.abc.Iterable[int]
+        The IDs of the guilds to search locally.
+    snapshot_dir : pathlib.Path | None
+        The directory to keep the snapshots of the indexes in, if any.
+    """
+
+    def __init__(self, guild_ids: Iterable[int], *, snapshot_dir: Path | None = None) -> None:
+        self.snapshot_dir = snapshot_dir
+        self._indexes = {str(guild_id): GuildVectorIndex(str(guild_id)) for guild_id in guild_ids}
+
+    def get(self, guild_id: str) -> GuildVectorIndex | None:
+        """
+        Get the index of the given guild, if it is ready to search.
+
+        Parameters
+        ----------
+        guild_id : str
+            The ID of the guild.
+
+        Returns
+        -------
+        courageous_comets.local_index.GuildVectorIndex | None
+            The index of the guild, or None if the guild is not searched locally or its index is
+            still loading. Search Redis instead in that case.
+        """
+        index = self._indexes.get(guild_id)
+        return index if index is not None and index.loaded else None
+
+    def add_message(self, message: models.MessageAnalysis) -> None:
+        """
+        Add an analyzed message to the index of its guild, if the guild is searched locally.
+
+        Parameters
+        ----------
+        message : courageous_comets.models.MessageAnalysis
+            The message to add.
+        """
+        # Indexes that are still loading also take new messages
+        index = self._indexes.get(message.guild_id)
+
+        if index is not None:
+            index.add_message(message)
+
+    def remove_message(self, guild_id: str, message_id: str) -> None:
+        """
+        Remove a message from the index of its guild, if the guild is searched locally.
+
+        Parameters
+        ----------
+        guild_id : str
+            The ID of the guild the message was sent in.
+        message_id : str
+            The ID of the message.
+        """
+        index = self._indexes.get(guild_id)
+
+        if index is not None:
+            index.remove(int(message_id))
+
+    async def load(self, redis: RedisClient) -> None:
+        """
+        Load the indexes from their snapshots or the messages stored on Redis.
+
+        Each index is searchable once it is loaded. Until then, `get` returns None for its guild.
+
+        Parameters
+        ----------
+        redis : courageous_comets.redis.cluster.RedisClient
+            A binary Redis connection instance. See `courageous_comets.redis.init_binary_redis`.
+        """
+        for guild_id, index in self._indexes.items():
+            # Read the generation first, so that changes made while loading outdate the snapshot
+            generation = await get_generation(redis, guild_id)
+
+            if self._restore(index, generation):
+                index.loaded = True
+                continue
+
+            await self._load_from_redis(index, redis)
+            index.loaded = True
+
+            logger.info(
+                "Loaded %s messages of guild %s into the local index (%.1f MB)",
+                len(index),
+                guild_id,
+                index.nbytes / 1e6,
+            )
+
+            await self._write_snapshot(index, generation)
+
+    async def save(self, redis: RedisClient) -> None:
+        """
+        Write a snapshot of each loaded index, if a snapshot directory is configured.
+
+        Indexes that are still loading are skipped, since a snapshot of a partial index would be
+        trusted as complete on the next start.
+
+        Parameters
+        ----------
+        redis : courageous_comets.redis.cluster.RedisClient
+            The Redis connection instance.
+        """
+        for guild_id, index in self._indexes.items():
+            if not index.loaded:
+                logger.info("Skipping the snapshot of guild %s, which is still loading", guild_id)
+                continue
+
+            generation = await get_generation(redis, guild_id)
+            await self._write_snapshot(index, generation)
+
+    def _restore(self, index: GuildVectorIndex, generation: int) -> bool:
+        """Restore an index from its snapshot if the snapshot is up to date."""
+        if self.snapshot_dir is None:
+            return False
+
+        snapshot = load_snapshot(self.snapshot_dir / index.guild_id, dims=DIMS)
+
+        if snapshot is None:
+            return False
+
+        if snapshot.generation != generation:
+            logger.info(
+                "Snapshot of guild %s is outdated (generation %s, expected %s)",
+                index.guild_id,
+                snapshot.generation,
+                generation,
+            )
+            return False
+
+        index.restore(snapshot)
+        logger.info(
+            "Restored %s messages of guild %s from a snapshot",
+            len(snapshot),
+            index.guild_id,
+        )
+        return True
+
+    async def _write_snapshot(self, index: GuildVectorIndex, generation: int) -> None:
+        if self.snapshot_dir is None:
+            return
+
+        # Changes made while writing increment the generation, which outdates the snapshot. Write a
+        # copy, since the index itself keeps changing on the event loop.
+        directory = self.snapshot_dir / index.guild_id
+        frozen = index.copy()
+        try:
+            await asyncio.to_thread(frozen.write_snapshot, directory, generation=generation)
+        except OSError:
+            logger.exception("Failed to write a snapshot of guild %s", index.guild_id)
+
+    @staticmethod
+    async def _load_from_redis(index: GuildVectorIndex, redis: RedisClient) -> None:
+        async for rows in scan_guild_messages(redis, guild_id=index.guild_id, fields=LOAD_FIELDS):
+            for row in rows:
+                # Skip messages that were deleted while scanning
+                if any(value is None for value in row):
+                    continue
+
+                message_id, channel_id, user_id, timestamp, sentiment, embedding = cast(
+                    list[bytes],
+                    row,
+                )
+                index.add(
+                    message_id=int(message_id),
+                    channel_id=int(channel_id),
+                    user_id=int(user_id),
+                    timestamp=float(timestamp),
+                    sentiment=float(sentiment),
+                    embedding=embedding,
+                )
@@ -0,0 +1,173 @@
+import hashlib
+import logging
+import os
+from collections.abc import Iterable
+from pathlib import Path
+
+import pydantic
+
+from courageous_comets.models import BaseModel
+
+logger = logging.getLogger(__name__)
+
+# Name of the manifest file in a data directory
+MANIFEST_FILE = "courageous_comets_manifest.json"
+
+
+class ManifestFile(BaseModel):
+    """
+    A file in a data directory.
+
+    Attributes
+    ----------
+    size : int
+        The size of the file in bytes.
+    mtime_ns : int
+        The modification time of the file in nanoseconds.
+    sha256 : str
+        The hex digest of the content of the file.
+    """
+
+    size: int
+    mtime_ns: int
+    sha256: str
+
+
+class Manifest(BaseModel):
+    """
+    The downloaded resources in a data directory and the files they consist of.
+
+    Attributes
+    ----------
+    resources : list[str]
+        The names of the resources in the directory.
+    files : dict[str, ManifestFile]
+        The files in the directory, by path relative to the directory.
+    """
+
+    resources: list[str]
+    files: dict[str, ManifestFile]
+
+
+def write_manifest(directory: Path, resources: Iterable[str]) -> Manifest:
+    """
+    Record the resources in a data directory and the checksums of all of its files.
+
+    Call this after downloading resources to the directory. Resources recorded earlier are kept.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The data directory.
+    resources : Iterable[str]
+        The names of the resources that were downloaded to the directory.
+
+    Returns
+    -------
+    Manifest
+        The manifest that was written.
+    """
+    previous = read_manifest(directory)
+    known = set(previous.resources) if previous is not None else set()
+    files = {
+        path.relative_to(directory).as_posix(): ManifestFile(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            sha256=_sha256(path),
+        )
+        for path, stat in _files(directory)
+    }
+    manifest = Manifest(resources=sorted(known | set(resources)), files=files)
+
+    (directory / MANIFEST_FILE).write_text(manifest.model_dump_json(indent=2))
+    logger.debug("Recorded %s files of %s in %s", len(files), manifest.resources, directory)
+
+    return manifest
+
+
+def read_manifest(directory: Path) -> Manifest | None:
+    """
+    Read the manifest of a data directory.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The data directory.
+
+    Returns
+    -------
+    Manifest | None
+        The manifest, or `None` if the directory has no valid manifest.
+    """
+    try:
+        return Manifest.model_validate_json((directory / MANIFEST_FILE).read_bytes())
+    except FileNotFoundError:
+        return None
+    except pydantic.ValidationError:
+        logger.warning("Ignoring the invalid manifest in %s", directory)
+        return None
+
+
+def verify_manifest(directory: Path, resources: Iterable[str]) -> bool:
+    """
+    Check whether the resources are present in a data directory, without using the network.
+
+    The resources must be listed in the manifest of the directory, and every file in the manifest
+    must exist. Files with the same size and modification time as recorded are trusted. Other
+    files must have the recorded checksum. A verified directory only takes a `stat` per file.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The data directory.
+    resources : Iterable[str]
+        The names of the resources that must be present.
+
+    Returns
+    -------
+    bool
+        Whether all resources are present and intact.
+    """
+    manifest = read_manifest(directory)
+
+    if manifest is None:
+        return False
+
+    if missing := set(resources) - set(manifest.resources):
+        logger.debug("Resources %s are not in the manifest of %s", sorted(missing), directory)
+        return False
+
+    for name, expected in manifest.files.items():
+        path = directory / name
+
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            logger.warning("File %s of the manifest is missing", path)
+            return False
+
+        if stat.st_size == expected.size and stat.st_mtime_ns == expected.mtime_ns:
+            continue
+
+        if stat.st_size != expected.size or _sha256(path) != expected.sha256:
+            logger.warning("File %s does not match the manifest", path)
+            return False
+
+    return True
+
+
+def _files(directory: Path) -> list[tuple[Path, os.stat_result]]:
+    """List the files in a directory and its subdirectories, except links, locks and manifests."""
+    return [
+        (path, path.stat())
+        for path in sorted(directory.rglob("*"))
+        if path.is_file()
+        and not path.is_symlink()
+        and path.suffix != ".lock"
+        and path.name != MANIFEST_FILE
+    ]
+
+
+def _sha256(path: Path) -> str:
+    with path.open("rb") as file:
+        return hashlib.file_digest(file, "sha256").hexdigest()
@@ -42,6 +42,8 @@ class Message(BaseModel):
         The timestamp when the message was sent.
     user_id : str
         The ID of the user who sent the message.
+    snippet : str | None
+        The start of the clean content of the message, or None if it was not stored.
     """
 
     message_id: str
@@ -49,6 +51,7 @@ class Message(BaseModel):
     guild_id: str
     timestamp: UnixTimestamp
     user_id: str
+    snippet: str | None = None
 
 
 class SentimentResult(BaseModel):
@@ -121,3 +124,49 @@ class MessageFrequency(BaseModel):
 
     timestamp: UnixTimestamp
     num_messages: int
+
+
+class SearchWeights(BaseModel):
+    """
+    Weights of the ranking signals in a hybrid search.
+
+    Each signal is scored between 0 and 1. The rank of a message is the weighted sum of its scores.
+
+    Attributes
+    ----------
+    semantics : float
+        The weight of the semantic similarity to the query.
+    sentiment : float
+        The weight of the proximity to the target sentiment. Ignored without a target sentiment.
+    recency : float
+        The weight of the age of the message.
+    recency_half_life : float
+        The age in seconds at which the recency score of a message is halved.
+    """
+
+    semantics: float = 1.0
+    sentiment: float = 0.5
+    recency: float = 0.25
+    recency_half_life: float = 7 * 24 * 60 * 60
+
+
+class SearchPage(BaseModel):
+    """
+    A page of search results.
+
+    Attributes
+    ----------
+    cursor_id : str
+        The ID of the stored search results the page belongs to.
+    page : int
+        The zero-based index of the page.
+    page_count : int
+        The number of pages in the search results.
+    messages : list[courageous_comets.models.Message]
+        The messages on the page.
+    """
+
+    cursor_id: str
+    page: int
+    page_count: int
+    messages: list[Message]
@@ -5,6 +5,7 @@ from pathlib import Path
 import nltk
 
 from courageous_comets import exceptions, settings
+from courageous_comets.manifest import verify_manifest, write_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +15,7 @@ async def download_nltk_resource(resource: str, semaphore: asyncio.Semaphore) ->
     async with semaphore:
         logger.debug("Downloading NLTK resource '%s'...", resource)
         try:
-            await asyncio.to_thread(
+            downloaded = await asyncio.to_thread(
                 nltk.download,
                 resource,
                 download_dir=settings.NLTK_DATA_DIR,
@@ -25,24 +26,37 @@ async def download_nltk_resource(resource: str, semaphore: asyncio.Semaphore) ->
             message = f"Invalid NLTK resource '{resource}'"
             raise exceptions.NltkInitializationError(message) from e
 
+    if not downloaded:
+        message = f"Could not download NLTK resource '{resource}'"
+        raise exceptions.NltkInitializationError(message)
+
 
 async def init_nltk(resources: list[str]) -> None:
     """
     Ensure all required NLTK resources are downloaded.
 
-    Downloads the resources specified in the bot configuration file.
+    Downloads the resources specified in the bot configuration file. If the manifest of the NLTK
+    data directory shows the resources are present and intact, nothing is downloaded. After a
+    download, the manifest is updated so the next start does not need the network.
     """
     if not any(resources):
         logger.debug("No NLTK resources to download")
         return
 
+    directory = Path(settings.NLTK_DATA_DIR)
+
+    if await asyncio.to_thread(verify_manifest, directory, resources):
+        logger.debug("NLTK resources found in %s", directory)
+        return
+
     # Create the NLTK data directory if it does not exist to avoid a race condition when running
     # multiple download tasks concurrently
-    Path(settings.NLTK_DATA_DIR).mkdir(parents=True, exist_ok=True)
+    directory.mkdir(parents=True, exist_ok=True)
 
     semaphore = asyncio.Semaphore(settings.NLTK_DOWNLOAD_CONCURRENCY)
     download_tasks = [download_nltk_resource(resource, semaphore) for resource in resources]
 
     await asyncio.gather(*download_tasks)
+    await asyncio.to_thread(write_manifest, directory, resources)
 
     logger.debug("NLTK resources downloaded")
@@ -0,0 +1,82 @@
+import os
+from pathlib import Path
+from typing import BinaryIO
+
+import numpy as np
+from numpy.lib import format as npy
+
+
+class NpyAppender:
+    """
+    Append rows to a `.npy` file whose length is not known up front.
+
+    Rows are written to the file as they are appended. The length of the array in the header is
+    updated on close. NumPy pads the header so that the length fits in place however large it
+    grows.
+
+    Parameters
+    ----------
+    path : pathlib.Path
+        The path of the file to write. An existing file is overwritten.
+    dtype : numpy.dtype
+        The data type of the array.
+    row_shape : tuple[int, ...]
+        The shape of a single row of the array (default: scalar rows).
+
+    Attributes
+    ----------
+    rows : int
+        The number of rows written so far.
+    """
+
+    def __init__(self, path: Path, dtype: np.dtype, row_shape: tuple[int, ...] = ()) -> None:
+        self.path = path
+        self.rows = 0
+        self._dtype = dtype
+        self._row_shape = row_shape
+        self._file: BinaryIO = path.open("wb")
+        self._write_header()
+
+    def append(self, rows: np.ndarray) -> None:
+        """
+        Append rows to the array.
+
+        Parameters
+        ----------
+        rows : numpy.ndarray
+            The rows to append. Converted to the data type of the array.
+
+        Raises
+        ------
+        ValueError
+            If the rows do not have the expected shape.
+        """
+        rows = np.ascontiguousarray(rows, dtype=self._dtype)
+
+        if rows.shape[1:] != self._row_shape:
+            message = f"Expected rows of shape {self._row_shape}, got {rows.shape[1:]}"
+            raise ValueError(message)
+
+        self._file.write(rows.data)
+        self.rows += len(rows)
+
+    def close(self) -> None:
+        """Write the final length to the header and flush the file to disk."""
+        self._file.seek(0)
+        self._write_header()
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+
+    def abort(self) -> None:
+        """Close and delete the file."""
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+    def _write_header(self) -> None:
+        header = {
+            "descr": npy.dtype_to_descr(self._dtype),
+            "fortran_order": False,
+            "shape": (self.rows, *self._row_shape),
+        }
+        npy.write_array_header_1_0(self._file, header)
@@ -1,24 +1,36 @@
 import asyncio
 import logging
+from typing import TYPE_CHECKING
 
 import discord
-from redis.asyncio import Redis
 
-from courageous_comets import preprocessing
+from courageous_comets import preprocessing, settings
+from courageous_comets.local_index import LocalSearch
 from courageous_comets.models import MessageAnalysis
-from courageous_comets.redis import messages
+from courageous_comets.redis import RedisClient, messages
 from courageous_comets.sentiment import calculate_sentiment
-from courageous_comets.vectorizer import Vectorizer
+from courageous_comets.singleflight import coalesce
 from courageous_comets.words import tokenize_sentence, word_frequency
 
+if TYPE_CHECKING:
+    from courageous_comets.vectorizer import Vectorizer
+
 logger = logging.getLogger(__name__)
 
 
+def _snippet(content: str) -> str | None:
+    """Get the part of the content to store for display, or None if snippets are disabled."""
+    return content[: settings.SNIPPET_LENGTH] if settings.SNIPPET_LENGTH > 0 else None
+
+
+# An edit made while the original content is processed starts a run of its own
+@coalesce(key=lambda message, **_: (message.id, message.content))
 async def process_message(
     message: discord.Message,
     *,
-    redis: Redis,
-    vectorizer: Vectorizer,
+    redis: RedisClient,
+    vectorizer: "Vectorizer",
+    local_search: LocalSearch | None = None,
 ) -> str | None:
     """
     Process a message and save it to Redis.
@@ -29,15 +41,20 @@ async def process_message(
     - Encode the message content.
     - Calculate the sentiment of the message.
     - Tokenize the message content.
+    - Keep the start of the clean content to display in search results.
+
+    Concurrent calls for the same message and content share a single run.
 
     Parameters
     ----------
     message : discord.Message
         The message to process.
-    redis : Redis
-        The Redis connection.
+    redis : courageous_comets.redis.RedisClient
+        The binary-safe Redis connection, which the embedding is written through.
     vectorizer : Vectorizer
         The vectorizer to use for encoding the message.
+    local_search : courageous_comets.local_index.LocalSearch | None
+        The in-memory indexes to add the message to, if any.
 
     Returns
     -------
@@ -64,16 +81,21 @@ async def process_message(
         asyncio.to_thread(tokenize_sentence, text),
     )
 
-    return await messages.save_message(
-        redis,
-        MessageAnalysis(
-            user_id=str(message.author.id),
-            message_id=str(message.id),
-            channel_id=str(message.channel.id),
-            guild_id=str(message.guild.id),
-            timestamp=message.created_at,
-            embedding=embedding,
-            sentiment=sentiment,
-            tokens=word_frequency(tokens),
-        ),
+    analysis = MessageAnalysis(
+        user_id=str(message.author.id),
+        message_id=str(message.id),
+        channel_id=str(message.channel.id),
+        guild_id=str(message.guild.id),
+        timestamp=message.created_at,
+        embedding=embedding,
+        sentiment=sentiment,
+        tokens=word_frequency(tokens),
+        snippet=_snippet(message.clean_content),
     )
+
+    key = await messages.save_message(redis, analysis)
+
+    if local_search is not None:
+        local_search.add_message(analysis)
+
+    return key
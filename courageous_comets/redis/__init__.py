@@ -1,3 +1,4 @@
-from .helpers import init_redis
+from .cluster import RedisClient
+from .helpers import init_binary_redis, init_redis, init_replicas
 
-__all__ = ["init_redis"]
+__all__ = ["RedisClient", "init_binary_redis", "init_redis", "init_replicas"]
@@ -0,0 +1,268 @@
+import json
+import logging
+from collections.abc import Sequence
+from pathlib import Path
+from typing import cast
+
+import numpy as np
+
+from courageous_comets import settings
+from courageous_comets.npy import NpyAppender
+from courageous_comets.redis.cluster import RedisClient
+from courageous_comets.redis.embeddings import scan_guild_messages
+from courageous_comets.redis.keys import key_schema
+from courageous_comets.redis.messages import SENTIMENT_FIELDS
+from courageous_comets.redis.schema import EMBEDDING_DIMS
+
+logger = logging.getLogger(__name__)
+
+# Version of the layout of an export. Increment on incompatible changes.
+EXPORT_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+VOCABULARY_FILE = "vocabulary.npy"
+
+# Hash fields to read when exporting, in the order expected by `_append_chunk`
+EXPORT_FIELDS = [
+    "message_id",
+    "channel_id",
+    "user_id",
+    "timestamp",
+    *SENTIMENT_FIELDS,
+    "embedding",
+    "tokens",
+    "snippet",
+]
+
+# Hash fields that every exported message must have. Messages may not have a snippet.
+REQUIRED_FIELDS = len(EXPORT_FIELDS) - 1
+
+# Data type and row shape of each column of an export. Tokens are stored as a dictionary: each
+# message has `token_lengths` entries in `token_ids` and `token_counts`, and the token IDs are
+# indexes into the vocabulary. Snippets are stored as UTF-8: each message has `snippet_lengths`
+# bytes in `snippet_data`, or a length of -1 if it has no snippet.
+COLUMNS: dict[str, tuple[np.dtype, tuple[int, ...]]] = {
+    "message_id": (np.dtype("<u8"), ()),
+    "channel_id": (np.dtype("<u8"), ()),
+    "user_id": (np.dtype("<u8"), ()),
+    "timestamp": (np.dtype("<f8"), ()),
+    "sentiment": (np.dtype("<f8"), (len(SENTIMENT_FIELDS),)),
+    "embedding": (np.dtype("<f4"), (EMBEDDING_DIMS,)),
+    "token_lengths": (np.dtype("<u4"), ()),
+    "token_ids": (np.dtype("<u4"), ()),
+    "token_counts": (np.dtype("<u4"), ()),
+    "snippet_lengths": (np.dtype("<i4"), ()),
+    "snippet_data": (np.dtype("u1"), ()),
+}
+
+
+async def export_guild(
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    directory: Path,
+    chunk_size: int = settings.AGGREGATE_CHUNK_SIZE,
+) -> int:
+    """
+    Export the analyzed messages of a guild to a directory of columnar `.npy` files.
+
+    Messages are read with SCAN and pipelined HMGET, and each chunk is appended to the files
+    before the next chunk is read. Only the current chunk and the token vocabulary are held in
+    memory. The files can be loaded with `numpy.load`, for example for offline analysis.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        A binary Redis connection instance. See `courageous_comets.redis.init_binary_redis`.
+    guild_id : str
+        The ID of the guild to export.
+    directory : pathlib.Path
+        The directory to write the export to. Created if it does not exist.
+    chunk_size : int
+        The number of messages to read per round trip
+        (default: courageous_comets.settings.AGGREGATE_CHUNK_SIZE).
+
+    Returns
+    -------
+    int
+        The number of exported messages.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    # The manifest is written last, so that an incomplete export cannot be imported
+    (directory / MANIFEST_FILE).unlink(missing_ok=True)
+
+    columns = {
+        name: NpyAppender(directory / f"{name}.npy", dtype, row_shape)
+        for name, (dtype, row_shape) in COLUMNS.items()
+    }
+    vocabulary: dict[str, int] = {}
+
+    try:
+        async for rows in scan_guild_messages(
+            redis,
+            guild_id=guild_id,
+            fields=EXPORT_FIELDS,
+            chunk_size=chunk_size,
+        ):
+            # Skip messages that were deleted while scanning
+            complete = [row for row in rows if None not in row[:REQUIRED_FIELDS]]
+            _append_chunk(columns, complete, vocabulary)
+    except BaseException:
+        for column in columns.values():
+            column.abort()
+        raise
+
+    for column in columns.values():
+        column.close()
+
+    np.save(directory / VOCABULARY_FILE, np.array(list(vocabulary), dtype=np.str_))
+
+    count = columns["message_id"].rows
+    manifest = {
+        "version": EXPORT_FORMAT_VERSION,
+        "guild_id": guild_id,
+        "count": count,
+        "dims": EMBEDDING_DIMS,
+    }
+    (directory / MANIFEST_FILE).write_text(json.dumps(manifest))
+
+    logger.info("Exported %s messages of guild %s to %s", count, guild_id, directory)
+
+    return count
+
+
+async def import_guild(
+    redis: RedisClient,
+    *,
+    directory: Path,
+    chunk_size: int = settings.AGGREGATE_CHUNK_SIZE,
+) -> int:
+    """
+    Import the analyzed messages of a guild from an export made by `export_guild`.
+
+    Messages are written with pipelined HSET in chunks. Existing messages with the same ID are
+    overwritten. The generation of the guild is incremented once the import is complete.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    directory : pathlib.Path
+        The directory of the export.
+    chunk_size : int
+        The number of messages to write per round trip
+        (default: courageous_comets.settings.AGGREGATE_CHUNK_SIZE).
+
+    Returns
+    -------
+    int
+        The number of imported messages.
+
+    Raises
+    ------
+    ValueError
+        If the export has an unsupported version or embeddings of a different size.
+    """
+    manifest = json.loads((directory / MANIFEST_FILE).read_text())
+
+    if manifest.get("version") != EXPORT_FORMAT_VERSION:
+        message = f"Unsupported export version {manifest.get("version")} in {directory}"
+        raise ValueError(message)
+
+    if manifest.get("dims") != EMBEDDING_DIMS:
+        message = f"Expected embeddings of {EMBEDDING_DIMS} dimensions, got {manifest.get("dims")}"
+        raise ValueError(message)
+
+    guild_id = str(manifest["guild_id"])
+    columns = {name: np.load(directory / f"{name}.npy", mmap_mode="r") for name in COLUMNS}
+    vocabulary = np.load(directory / VOCABULARY_FILE).tolist()
+    token_offsets = _offsets(columns["token_lengths"])
+    snippet_offsets = _offsets(np.maximum(columns["snippet_lengths"], 0))
+    count = len(columns["message_id"])
+
+    for start in range(0, count, chunk_size):
+        stop = min(start + chunk_size, count)
+
+        async with redis.pipeline(transaction=False) as pipeline:
+            for row in range(start, stop):
+                first, last = token_offsets[row], token_offsets[row + 1]
+                tokens = zip(
+                    columns["token_ids"][first:last].tolist(),
+                    columns["token_counts"][first:last].tolist(),
+                    strict=True,
+                )
+                payload = {
+                    "message_id": str(columns["message_id"][row]),
+                    "channel_id": str(columns["channel_id"][row]),
+                    "guild_id": guild_id,
+                    "timestamp": float(columns["timestamp"][row]),
+                    "user_id": str(columns["user_id"][row]),
+                    **dict(zip(SENTIMENT_FIELDS, columns["sentiment"][row].tolist(), strict=True)),
+                    "embedding": columns["embedding"][row].tobytes(),
+                    "tokens": json.dumps({vocabulary[token]: n for token, n in tokens}),
+                }
+
+                if columns["snippet_lengths"][row] >= 0:
+                    first, last = snippet_offsets[row], snippet_offsets[row + 1]
+                    payload["snippet"] = columns["snippet_data"][first:last].tobytes().decode()
+
+                key = key_schema.guild_messages(
+                    guild_id=int(guild_id),
+                    message_id=int(columns["message_id"][row]),
+                )
+                pipeline.hset(key, mapping=payload)
+
+            await pipeline.execute()
+
+        logger.debug("Imported %s of %s messages of guild %s", stop, count, guild_id)
+
+    # Invalidate cached query results and snapshots of the guild
+    await redis.incr(key_schema.guild_generation(int(guild_id)))
+
+    logger.info("Imported %s messages of guild %s from %s", count, guild_id, directory)
+
+    return count
+
+
+def _offsets(lengths: np.ndarray) -> np.ndarray:
+    """Get the start of each entry, and the end of the last entry, given the length of each."""
+    return np.concatenate([[0], np.cumsum(lengths, dtype=np.int64)])
+
+
+def _append_chunk(
+    columns: dict[str, NpyAppender],
+    rows: Sequence[list[bytes | None]],
+    vocabulary: dict[str, int],
+) -> None:
+    """Append a chunk of messages, read with `EXPORT_FIELDS`, to the columns of an export."""
+    values: dict[str, list] = {name: [] for name in COLUMNS}
+
+    for row in rows:
+        *required, snippet = row
+        message_id, channel_id, user_id, timestamp, *sentiment, embedding, tokens = cast(
+            list[bytes],
+            required,
+        )
+        values["message_id"].append(int(message_id))
+        values["channel_id"].append(int(channel_id))
+        values["user_id"].append(int(user_id))
+        values["timestamp"].append(float(timestamp))
+        values["sentiment"].append([float(value) for value in sentiment])
+        values["embedding"].append(np.frombuffer(embedding, dtype=np.float32))
+
+        counts: dict[str, int] = json.loads(tokens)
+        values["token_lengths"].append(len(counts))
+
+        for token, n in counts.items():
+            values["token_ids"].append(vocabulary.setdefault(token, len(vocabulary)))
+            values["token_counts"].append(n)
+
+        if snippet is None:
+            values["snippet_lengths"].append(-1)
+        else:
+            values["snippet_lengths"].append(len(snippet))
+            values["snippet_data"].extend(snippet)
+
+    for name, column in columns.items():
+        dtype, row_shape = COLUMNS[name]
+        column.append(np.array(values[name], dtype=dtype).reshape(-1, *row_shape))
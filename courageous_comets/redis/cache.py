@@ -0,0 +1,105 @@
+import functools
+import inspect
+import logging
+from collections.abc import Awaitable, Callable, Hashable
+from typing import Any
+
+from courageous_comets import settings
+from courageous_comets.caching import InstrumentedTTLCache
+from courageous_comets.redis.cluster import RedisClient
+from courageous_comets.redis.keys import key_schema
+from courageous_comets.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Results of cached queries, indexed by query, guild generation and arguments
+QUERY_CACHE: InstrumentedTTLCache[Hashable, Any] = InstrumentedTTLCache(
+    maxsize=settings.QUERY_CACHE_SIZE,
+    ttl=settings.QUERY_CACHE_TTL,
+)
+
+# Cache misses in flight, so that concurrent identical queries are only executed once
+_flights = SingleFlight[Any]()
+
+
+async def get_generation(redis: RedisClient, guild_id: str) -> int:
+    """
+    Get the current data generation of a guild.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild.
+
+    Returns
+    -------
+    int
+        The generation of the guild, or 0 if its data never changed.
+    """
+    value = await redis.get(key_schema.guild_generation(int(guild_id)))
+    return int(value or 0)
+
+
+def _freeze(value: Any) -> Hashable:  # noqa: ANN401
+    """Convert an argument to a hashable value."""
+    if isinstance(value, list):
+        return tuple(value)
+    return value
+
+
+def cached_query[**P, T](func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+    """
+    Cache the results of a query on the data of a guild.
+
+    The decorated function must take the Redis connection as `redis` and the guild as `guild_id`.
+    Results are cached by the other arguments and the generation of the guild, which is
+    incremented whenever a message of the guild is saved. A cache hit costs a single GET.
+    Concurrent calls that miss the cache with the same key share a single query.
+
+    Cached results are shared between callers and must not be modified.
+
+    Parameters
+    ----------
+    func : Callable[P, Awaitable[T]]
+        The query function to decorate.
+
+    Returns
+    -------
+    Callable[P, Awaitable[T]]
+        The decorated function.
+    """
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+
+        arguments = dict(bound.arguments)
+        redis: RedisClient = arguments.pop("redis")
+        generation = await get_generation(redis, arguments["guild_id"])
+
+        key = (
+            func.__qualname__,
+            generation,
+            *((name, _freeze(value)) for name, value in arguments.items()),
+        )
+
+        try:
+            result = QUERY_CACHE[key]
+        except KeyError:
+            logger.debug("Query cache miss for %s", func.__qualname__)
+        else:
+            logger.debug("Query cache hit for %s", func.__qualname__)
+            return result
+
+        async def execute() -> T:
+            result = await func(*args, **kwargs)
+            QUERY_CACHE[key] = result
+            return result
+
+        return await _flights.do(key, execute)
+
+    return wrapper
@@ -0,0 +1,141 @@
+import asyncio
+import heapq
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+from redis.asyncio import Redis, RedisCluster
+from redis.asyncio.cluster import ClusterNode
+
+from courageous_comets import exceptions, settings
+from courageous_comets.redis.keys import hash_tag
+
+logger = logging.getLogger(__name__)
+
+type RedisClient = Redis | RedisCluster
+
+# Direct connections to the primary nodes of the cluster, indexed by node name.
+_shards: dict[str, Redis] = {}
+
+
+def _connect_shard(node: ClusterNode) -> Redis:
+    """
+    Get a direct connection to the given cluster node.
+
+    Search indexes are local to each shard of a Redis Cluster, so search commands need to be sent
+    to a specific node rather than be routed by key. Connections are reused across calls.
+    """
+    shard = _shards.get(node.name)
+
+    if shard is None:
+        logger.debug("Connecting to Redis Cluster shard %s", node.name)
+        shard = Redis(
+            host=node.host,
+            port=int(node.port),
+            password=settings.REDIS_PASSWORD,
+            decode_responses=True,
+        )
+        _shards[node.name] = shard
+
+    return shard
+
+
+def get_shard(redis: RedisClient, guild_id: str) -> Redis:
+    """
+    Get the connection to the shard that holds the data of the given guild.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild.
+
+    Returns
+    -------
+    redis.asyncio.Redis
+        The connection to the shard. If not connected to a cluster, returns `redis` as is.
+
+    Raises
+    ------
+    courageous_comets.exceptions.DatabaseConnectionError
+        If no node of the cluster holds the data of the guild.
+    """
+    if isinstance(redis, Redis):
+        return redis
+
+    node = redis.get_node_from_key(hash_tag(guild_id))
+
+    if node is None:
+        message = f"No Redis Cluster node holds the data for guild {guild_id}"
+        raise exceptions.DatabaseConnectionError(message)
+
+    return _connect_shard(node)
+
+
+def get_shards(redis: RedisClient) -> list[Redis]:
+    """
+    Get the connections to all primary shards.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+
+    Returns
+    -------
+    list[redis.asyncio.Redis]
+        The connections to the shards. If not connected to a cluster, returns `[redis]`.
+    """
+    if isinstance(redis, Redis):
+        return [redis]
+
+    return [_connect_shard(node) for node in redis.get_primaries()]
+
+
+async def fan_out[T](
+    shards: list[Redis],
+    query: Callable[[Redis], Awaitable[list[T]]],
+    *,
+    key: Callable[[T], Any],
+    limit: int,
+    reverse: bool = False,
+) -> list[T]:
+    """
+    Run a query on multiple shards concurrently and merge the top `limit` results.
+
+    Parameters
+    ----------
+    shards : list[redis.asyncio.Redis]
+        The shards to run the query on.
+    query : Callable[[redis.asyncio.Redis], Awaitable[list[T]]]
+        The query to run. Must return results ordered by `key`.
+    key : Callable[[T], Any]
+        The sort key of the results.
+    limit : int
+        The maximum number of results to return.
+    reverse : bool
+        Whether the results are ordered in descending order (default: False).
+
+    Returns
+    -------
+    list[T]
+        The merged results in the same order as the results of each shard.
+    """
+    results = await asyncio.gather(*(query(shard) for shard in shards))
+
+    if len(results) == 1:
+        return results[0][:limit]
+
+    merged = heapq.merge(*results, key=key, reverse=reverse)
+    return list(itertools.islice(merged, limit))
+
+
+async def close_shards() -> None:
+    """Close all direct connections to cluster shards."""
+    shards = list(_shards.values())
+    _shards.clear()
+
+    for shard in shards:
+        await shard.aclose()
@@ -0,0 +1,154 @@
+import logging
+from collections.abc import AsyncGenerator, Mapping
+
+from courageous_comets import settings
+from courageous_comets.redis.cluster import RedisClient
+from courageous_comets.redis.keys import key_schema
+
+logger = logging.getLogger(__name__)
+
+type Buffer = bytes | memoryview
+
+# Hash field that holds the embedding vector of a message
+EMBEDDING_FIELD = "embedding"
+
+
+def _ensure_binary(redis: RedisClient) -> None:
+    """
+    Ensure that the given connection does not decode replies.
+
+    Embedding vectors are raw float32 bytes and are not valid UTF-8 in general.
+
+    Raises
+    ------
+    ValueError
+        If the connection decodes replies.
+    """
+    if redis.get_encoder().decode_responses:
+        message = "Embeddings must be read with a binary Redis connection (decode_responses=False)"
+        raise ValueError(message)
+
+
+async def get_embeddings(
+    keys: list[str],
+    *,
+    redis: RedisClient,
+) -> list[bytes | None]:
+    """
+    Get the embedding vectors of multiple messages given their keys.
+
+    All lookups are sent in a single pipeline.
+
+    Parameters
+    ----------
+    keys : list[str]
+        The keys of the messages to fetch.
+    redis : courageous_comets.redis.cluster.RedisClient
+        A binary Redis connection instance. See `courageous_comets.redis.init_binary_redis`.
+
+    Returns
+    -------
+    list[bytes | None]
+        The raw embedding vector of each message, in the same order as `keys`. None if the
+        message is not found.
+
+    Raises
+    ------
+    ValueError
+        If `redis` decodes replies.
+    """
+    _ensure_binary(redis)
+
+    if not keys:
+        return []
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        for key in keys:
+            pipeline.hget(key, EMBEDDING_FIELD)
+        return await pipeline.execute()
+
+
+async def save_embeddings(
+    embeddings: Mapping[str, Buffer],
+    *,
+    redis: RedisClient,
+) -> None:
+    """
+    Save the embedding vectors of multiple messages.
+
+    Buffers are sent to Redis as is, so a `memoryview` over a larger array can be written without
+    copying it to `bytes` first. All writes are sent in a single pipeline.
+
+    Parameters
+    ----------
+    embeddings : collections.abc.Mapping[str, courageous_comets.redis.embeddings.Buffer]
+        Mapping of message keys to their raw embedding vectors.
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    """
+    if not embeddings:
+        return
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        for key, embedding in embeddings.items():
+            pipeline.hset(key, EMBEDDING_FIELD, embedding)  # type: ignore
+        await pipeline.execute()
+
+    logger.debug("Saved %s embeddings", len(embeddings))
+
+
+async def scan_guild_messages(
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    fields: list[str],
+    chunk_size: int = settings.AGGREGATE_CHUNK_SIZE,
+) -> AsyncGenerator[list[list[bytes | None]], None]:
+    """
+    Stream the given fields of all messages of a guild in chunks.
+
+    Keys are found with SCAN, and the fields of each chunk of keys are read in a single
+    pipeline. Only one chunk is held in memory at a time.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        A binary Redis connection instance. See `courageous_comets.redis.init_binary_redis`.
+    guild_id : str
+        The ID of the guild.
+    fields : list[str]
+        The hash fields to read.
+    chunk_size : int
+        The number of messages to read per round trip
+        (default: courageous_comets.settings.AGGREGATE_CHUNK_SIZE).
+
+    Yields
+    ------
+    list[list[bytes | None]]
+        The values of `fields` for each message in the next chunk.
+
+    Raises
+    ------
+    ValueError
+        If `redis` decodes replies.
+    """
+    _ensure_binary(redis)
+
+    pattern = key_schema.guild_messages_pattern(int(guild_id))
+    keys: list[bytes] = []
+
+    async def read(keys: list[bytes]) -> list[list[bytes | None]]:
+        async with redis.pipeline(transaction=False) as pipeline:
+            for key in keys:
+                pipeline.hmget(key, fields)  # type: ignore
+            return await pipeline.execute()
+
+    async for key in redis.scan_iter(match=pattern, count=chunk_size):
+        keys.append(key)
+
+        if len(keys) >= chunk_size:
+            yield await read(keys)
+            keys = []
+
+    if keys:
+        yield await read(keys)
@@ -1,34 +1,76 @@
 import logging
 
 import redis.asyncio as redis
+from redis.exceptions import RedisClusterException
 from redisvl.index import AsyncSearchIndex
 
 from courageous_comets import exceptions, settings
 from courageous_comets.redis import schema
+from courageous_comets.redis.cluster import RedisClient, get_shards
+from courageous_comets.redis.replicas import ReplicaPool
+from courageous_comets.startup import PROFILER
 
 logger = logging.getLogger(__name__)
 
 
-async def create_indexes(redis: redis.Redis) -> None:
-    """Create search indexes on Redis."""
+async def create_indexes(redis: RedisClient) -> None:
+    """
+    Create search indexes on Redis.
+
+    Search indexes are local to each shard of a Redis Cluster, so the indexes are created on every
+    primary shard when connected to a cluster.
+    """
     logger.debug("Creating indexes on redis...")
 
-    message_index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
-    message_index.set_client(redis)
+    for shard in get_shards(redis):
+        message_index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
+        message_index.set_client(shard)
 
-    await message_index.create(overwrite=True)
+        await message_index.create(overwrite=True)
 
     logger.debug("Created indexes on Redis")
 
 
-async def init_redis() -> redis.Redis:
+def create_client(*, decode_responses: bool = True) -> RedisClient:
     """
-    Initialize the Redis connection.
+    Create a Redis client based on the application settings.
+
+    Parameters
+    ----------
+    decode_responses : bool
+        Whether to decode replies as UTF-8 strings (default: True). Disable to read binary
+        payloads such as embedding vectors.
 
     Returns
     -------
-    redis.asyncio.Redis
-        The Redis connection instance.
+    courageous_comets.redis.cluster.RedisClient
+        A `redis.asyncio.RedisCluster` client if `REDIS_CLUSTER` is enabled, otherwise a
+        `redis.asyncio.Redis` client.
+    """
+    if settings.REDIS_CLUSTER:
+        return redis.RedisCluster(  # type: ignore (the cluster client does not use a single connection pool)
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=decode_responses,
+        )
+
+    return redis.Redis(
+        host=settings.REDIS_HOST,
+        port=settings.REDIS_PORT,
+        password=settings.REDIS_PASSWORD,
+        decode_responses=decode_responses,
+    )
+
+
+async def connect(instance: RedisClient) -> None:
+    """
+    Verify that the given Redis client can connect to Redis.
+
+    Parameters
+    ----------
+    instance : courageous_comets.redis.cluster.RedisClient
+        The Redis client to verify.
 
     Raises
     ------
@@ -37,32 +79,122 @@ async def init_redis() -> redis.Redis:
     courageous_comets.exceptions.DatabaseConnectionError
         If the connection to Redis cannot be established.
     """
-    logger.debug("Connecting to Redis...")
-
-    instance = redis.Redis(
-        host=settings.REDIS_HOST,
-        port=settings.REDIS_PORT,
-        password=settings.REDIS_PASSWORD,
-        decode_responses=True,
-    )
-
     try:
         await instance.ping()
     except redis.AuthenticationError as e:
         message = "Redis authentication failed. Check the REDIS_PASSWORD environment variable."
         raise exceptions.AuthenticationError(message) from e
-    except redis.RedisError as e:
+    except (redis.RedisError, RedisClusterException) as e:
         message = f"Could not connect to Redis at {settings.REDIS_HOST}:{settings.REDIS_PORT}"
         raise exceptions.DatabaseConnectionError(message) from e
 
+
+async def init_redis() -> RedisClient:
+    """
+    Initialize the Redis connection.
+
+    Returns
+    -------
+    courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+
+    Raises
+    ------
+    courageous_comets.exceptions.AuthenticationError
+        If the Redis password is incorrect.
+    courageous_comets.exceptions.DatabaseConnectionError
+        If the connection to Redis cannot be established.
+    """
+    logger.debug("Connecting to Redis...")
+
+    instance = create_client()
+    await connect(instance)
+
     logger.info(
         "Connected to Redis at %s:%s",
         settings.REDIS_HOST,
         settings.REDIS_PORT,
     )
 
-    await create_indexes(instance)
+    with PROFILER.phase("create_indexes"):
+        await create_indexes(instance)
 
     logger.info("Redis initialization complete")
 
     return instance
+
+
+async def init_binary_redis() -> RedisClient:
+    """
+    Initialize a binary-safe Redis connection.
+
+    Replies on this connection are not decoded, so binary payloads such as embedding vectors can
+    be read back as they were written. It uses its own connection pool next to the main one.
+
+    Returns
+    -------
+    courageous_comets.redis.cluster.RedisClient
+        The binary Redis connection instance.
+
+    Raises
+    ------
+    courageous_comets.exceptions.AuthenticationError
+        If the Redis password is incorrect.
+    courageous_comets.exceptions.DatabaseConnectionError
+        If the connection to Redis cannot be established.
+    """
+    logger.debug("Connecting to Redis in binary mode...")
+
+    instance = create_client(decode_responses=False)
+    await connect(instance)
+
+    logger.info("Connected to Redis in binary mode")
+
+    return instance
+
+
+async def init_replicas(primary: RedisClient) -> ReplicaPool | None:
+    """
+    Initialize the connections to the Redis read replicas.
+
+    Replicas are only used with a single Redis server. A Redis Cluster routes reads to its own
+    replicas.
+
+    Parameters
+    ----------
+    primary : courageous_comets.redis.RedisClient
+        The connection to the primary.
+
+    Returns
+    -------
+    courageous_comets.redis.replicas.ReplicaPool | None
+        The pool of read replicas, or `None` if no replicas are configured.
+    """
+    if not settings.REDIS_REPLICAS:
+        logger.debug("No Redis replicas configured")
+        return None
+
+    if settings.REDIS_CLUSTER:
+        logger.warning("Ignoring REDIS_REPLICAS because the application is connected to a cluster")
+        return None
+
+    replicas = [
+        redis.Redis(
+            host=host,
+            port=port,
+            password=settings.REDIS_PASSWORD,
+            decode_responses=True,
+        )
+        for host, port in settings.REDIS_REPLICAS
+    ]
+
+    pool = ReplicaPool(primary, replicas)
+    await pool.check_health()
+
+    logger.info(
+        "Connected to %s/%s Redis replicas",
+        len(pool.healthy),
+        len(pool.replicas),
+    )
+
+    return pool
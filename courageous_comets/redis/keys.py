@@ -33,12 +33,54 @@ def prefix_key(func: Prefixable[P]) -> Prefixable[P]:
     return prefixed_method
 
 
+def hash_tag(guild_id: int | str) -> str:
+    """
+    Wrap a guild ID in a Redis Cluster hash tag.
+
+    Redis Cluster only hashes the part of a key between the first pair of braces. Keys that share
+    a hash tag are therefore assigned to the same hash slot, which keeps all data of a guild on a
+    single shard.
+
+    Parameters
+    ----------
+    guild_id : int | str
+        The ID of the guild.
+
+    Returns
+    -------
+    str
+        The hash tag for the guild.
+    """
+    return f"{{{guild_id}}}"
+
+
+def guild_tag(guild_id: int | str) -> str:
+    """
+    Get the part of a key that identifies a guild.
+
+    On a Redis Cluster, this is the hash tag of the guild. Otherwise, it is the plain guild ID,
+    which keeps the key layout of deployments without a cluster unchanged.
+
+    Parameters
+    ----------
+    guild_id : int | str
+        The ID of the guild.
+
+    Returns
+    -------
+    str
+        The guild part of a key.
+    """
+    return hash_tag(guild_id) if settings.REDIS_CLUSTER else str(guild_id)
+
+
 class KeySchema:
     """
     A class to generate key names for Redis data structures.
 
     This class contains a reference to all possible key names used
-    by the application.
+    by the application. On a Redis Cluster, keys that belong to a guild contain
+    the hash tag of that guild, so they can be stored together on a shard.
     """
 
     @prefix_key
@@ -47,7 +89,15 @@ class KeySchema:
 
         Redis type: hash
         """
-        return f"messages:{guild_id}:{message_id}"
+        return f"messages:{guild_tag(guild_id)}:{message_id}"
+
+    @prefix_key
+    def guild_messages_pattern(self, guild_id: int) -> str:
+        """Pattern that matches the keys to all messages of a Discord guild.
+
+        Use with SCAN.
+        """
+        return f"messages:{guild_tag(guild_id)}:*"
 
     @prefix_key
     def guild_message_tokens(self, guild_id: int) -> str:
@@ -55,7 +105,33 @@ class KeySchema:
 
         Redis type: hash
         """
-        return f"messages:tokens:{guild_id}"
+        return f"messages:tokens:{guild_tag(guild_id)}"
+
+    @prefix_key
+    def guild_generation(self, guild_id: int) -> str:
+        """Key to the data generation of a Discord guild.
+
+        Incremented whenever data of the guild changes.
+
+        Redis type: string
+        """
+        return f"generation:{guild_tag(guild_id)}"
+
+    @prefix_key
+    def guild_search_cursor(self, *, guild_id: int, cursor_id: str) -> str:
+        """Key to stored search results for a Discord guild.
+
+        Redis type: list
+        """
+        return f"search:{guild_tag(guild_id)}:{cursor_id}"
+
+    @prefix_key
+    def chart(self, digest: str) -> str:
+        """Key to a rendered chart, by the digest of its content.
+
+        Redis type: string
+        """
+        return f"charts:{digest}"
 
 
 key_schema = KeySchema()
@@ -2,64 +2,115 @@ import datetime
 import itertools
 import json
 import logging
+import math
 from collections import Counter
+from collections.abc import AsyncGenerator
+from contextlib import aclosing
+from typing import Any
 
 import redis.commands.search.aggregation as aggregations
 from redis.asyncio import Redis
 from redis.commands.search import AsyncSearch, reducers
+from redis.commands.search.document import Document
+from redis.commands.search.query import Query
 from redisvl.index import AsyncSearchIndex
-from redisvl.query import FilterQuery, VectorQuery
+from redisvl.query import FilterQuery, RangeQuery, VectorQuery
 from redisvl.query.filter import FilterExpression, Num, Tag
-from redisvl.query.query import BaseQuery
+from redisvl.query.query import BaseQuery, BaseVectorQuery
 
 from courageous_comets import models, settings
 from courageous_comets.enums import Duration, StatisticScope
 from courageous_comets.redis import schema
+from courageous_comets.redis.cache import cached_query
+from courageous_comets.redis.cluster import RedisClient, fan_out, get_shard, get_shards
 from courageous_comets.redis.keys import key_schema
 
 logger = logging.getLogger(__name__)
 
 # List of courageous_comets.models.Message return fields used acrosss queries
 # that return a list of courageous_comets.models.Message
-RETURN_FIELDS = ["message_id", "user_id", "channel_id", "guild_id", "timestamp"]
+RETURN_FIELDS = ["message_id", "user_id", "channel_id", "guild_id", "timestamp", "snippet"]
 
+# Number of seconds an idle aggregation cursor is kept alive on Redis
+AGGREGATE_CURSOR_MAX_IDLE = 30
 
-def _get_raw_index(redis: Redis) -> AsyncSearch:
-    """Get the raw messages index on Redis."""
+# Number of KNN candidates to rank in a hybrid search, per requested result
+HYBRID_SEARCH_CANDIDATES_FACTOR = 5
+
+# Maximum number of messages to return from a range search
+RANGE_SEARCH_LIMIT = 100
+
+
+def _get_raw_index(redis: RedisClient, guild_id: str) -> AsyncSearch:
+    """Get the raw messages index on the Redis shard of the given guild."""
     index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
-    return redis.ft(index.schema.index.name)
+    return get_shard(redis, guild_id).ft(index.schema.index.name)
+
+
+async def _search_shard(shard: Redis, query: Query, params: dict[str, Any]) -> list[Document]:
+    """Run a query on a single Redis shard."""
+    index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
+    index.set_client(shard)
+
+    results = await index.search(query, params)
+
+    return results.docs if results.total else []
 
 
 async def _get_messages_from_query(
-    redis: Redis,
+    redis: RedisClient,
     query: BaseQuery,
+    *,
+    guild_id: str | None,
+    limit: int,
 ) -> list[models.Message]:
     """Get a list of messages from Redis query.
 
     Assumes the fields returned in the query correspond to the attributes
     of the courageous_comets.models.Message.
 
+    The query is sent to the shard that holds the data of the given guild. If no
+    guild is given, the query fans out to all shards and the results are merged.
+
+    Vector queries return the closest messages first. Each shard returns its own nearest
+    neighbours, so the results are merged by their distance. Other queries return the most recent
+    messages first.
+
     Parameters
     ----------
-    redis: redis.Redis
+    redis: courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     query: redisvl.query.query.BaseQuery
         The query to run on Redis.
+    guild_id: str | None
+        The ID of the guild the query is scoped to, if any.
+    limit: int
+        The maximum number of messages to return.
 
     Returns
     -------
     courageous_comets.models.Message
         The list of messages from the query.
     """
-    index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
-    index.set_client(redis)
-
-    results = await index.search(
-        query.query.sort_by("timestamp", asc=False),
-        query.params,
+    shards = [get_shard(redis, guild_id)] if guild_id else get_shards(redis)
+
+    if isinstance(query, BaseVectorQuery):
+        # Vector queries are sorted by distance by default
+        redis_query = query.query
+        sort_field, reverse = query.DISTANCE_ID, False
+    else:
+        redis_query = query.query.sort_by("timestamp", asc=False)
+        sort_field, reverse = "timestamp", True
+
+    docs = await fan_out(
+        shards,
+        lambda shard: _search_shard(shard, redis_query, query.params),
+        key=lambda doc: float(getattr(doc, sort_field)),
+        limit=limit,
+        reverse=reverse,
     )
 
-    return [models.Message.model_validate(doc) for doc in results.docs if results.total]
+    return [models.Message.model_validate(doc) for doc in docs]
 
 
 def build_search_scope(
@@ -99,15 +150,18 @@ def build_search_scope(
 
 
 async def save_message(
-    redis: Redis,
+    redis: RedisClient,
     message: models.MessageAnalysis,
 ) -> str:
     """Save a message on Redis.
 
+    Also increments the generation of the guild, which invalidates cached query results.
+
     Parameters
     ----------
-    redis : redis.Redis
-        The Redis connection instance.
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance. Pass the binary-safe connection, as for the other
+        embedding payloads, since the message includes its embedding.
     message : courageous_comets.models.MessageAnalysis
         The message to save.
 
@@ -129,18 +183,103 @@ async def save_message(
         "embedding": message.embedding,
         "tokens": json.dumps(message.tokens),
     }
+
+    if message.snippet is not None:
+        payload["snippet"] = message.snippet
+
     key = key_schema.guild_messages(
         guild_id=int(message.guild_id),
         message_id=int(message.message_id),
     )
-    await redis.hset(key, mapping=payload)  # type: ignore
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        pipeline.hset(key, mapping=payload)
+        # Invalidate cached query results for the guild
+        pipeline.incr(key_schema.guild_generation(int(message.guild_id)))
+        await pipeline.execute()
+
     return key
 
 
+async def delete_messages(
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    message_ids: list[str],
+) -> int:
+    """
+    Delete messages from Redis.
+
+    Also increments the generation of the guild, which invalidates cached query results.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild the messages were sent in.
+    message_ids : list[str]
+        The IDs of the messages to delete.
+
+    Returns
+    -------
+    int
+        The number of messages that were deleted.
+    """
+    if not message_ids:
+        return 0
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        for message_id in message_ids:
+            pipeline.delete(
+                key_schema.guild_messages(guild_id=int(guild_id), message_id=int(message_id)),
+            )
+        pipeline.incr(key_schema.guild_generation(int(guild_id)))
+        *deleted, _ = await pipeline.execute()
+
+    return sum(deleted)
+
+
+async def get_message_snippets(
+    keys: list[str],
+    *,
+    redis: RedisClient,
+) -> list[str | None]:
+    """
+    Get the stored snippets of multiple messages given their keys.
+
+    All lookups are sent in a single pipeline.
+
+    Parameters
+    ----------
+    keys : list[str]
+        The keys of the messages to fetch.
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+
+    Returns
+    -------
+    list[str | None]
+        The snippet of each message, in the same order as `keys`. None if the message or its
+        snippet is not found.
+    """
+    if not keys:
+        return []
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        for key in keys:
+            pipeline.hget(key, "snippet")
+        return await pipeline.execute()
+
+
+# Hash fields that make up the sentiment analysis of a message
+SENTIMENT_FIELDS = ["sentiment_neg", "sentiment_neu", "sentiment_pos", "sentiment_compound"]
+
+
 async def get_message_sentiment(
     key: str,
     *,
-    redis: Redis,
+    redis: RedisClient,
 ) -> models.SentimentResult | None:
     """
     Get the sentiment of message from the database given its key.
@@ -149,7 +288,7 @@ async def get_message_sentiment(
     ----------
     key: str
         The key of the message to fetch.
-    redis : redis.Redis
+    redis : courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
 
     Returns
@@ -157,27 +296,69 @@ async def get_message_sentiment(
     courageous_comets.models.SentimentResult | None
         The sentiment analysis result if found, else None.
     """
-    fields = ["sentiment_neg", "sentiment_neu", "sentiment_pos", "sentiment_compound"]
+    [result] = await get_messages_sentiment([key], redis=redis)
+    return result
 
-    if not redis.exists(key):
-        return None
 
-    data = await redis.hmget(key, fields)  # type: ignore
+async def get_messages_sentiment(
+    keys: list[str],
+    *,
+    redis: RedisClient,
+) -> list[models.SentimentResult | None]:
+    """
+    Get the sentiment of multiple messages from the database given their keys.
 
-    has_all_fields = len(data) == len(fields)
-    any_none = any(value is None for value in data)
+    All lookups are sent in a single pipeline, so the number of round trips does not grow with
+    the number of keys.
 
-    if not has_all_fields or any_none:
-        logger.warning("Missing sentiment analysis data for message %s.", key)
-        return None
+    Parameters
+    ----------
+    keys: list[str]
+        The keys of the messages to fetch.
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
 
-    return models.SentimentResult.model_validate(
-        {key: float(value) for key, value in zip(fields, data, strict=True)},
-    )
+    Returns
+    -------
+    list[courageous_comets.models.SentimentResult | None]
+        The sentiment analysis result of each message, in the same order as `keys`. None if the
+        message is not found or its sentiment analysis is incomplete.
+    """
+    if not keys:
+        return []
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        for key in keys:
+            pipeline.exists(key)
+            pipeline.hmget(key, SENTIMENT_FIELDS)
+        replies = await pipeline.execute()
+
+    results: list[models.SentimentResult | None] = []
+
+    for key, exists, data in zip(keys, replies[::2], replies[1::2], strict=True):
+        if not exists:
+            results.append(None)
+            continue
+
+        has_all_fields = len(data) == len(SENTIMENT_FIELDS)
+        any_none = any(value is None for value in data)
+
+        if not has_all_fields or any_none:
+            logger.warning("Missing sentiment analysis data for message %s.", key)
+            results.append(None)
+            continue
+
+        results.append(
+            models.SentimentResult.model_validate(
+                {field: float(value) for field, value in zip(SENTIMENT_FIELDS, data, strict=True)},
+            ),
+        )
+
+    return results
 
 
 async def get_recent_messages(
-    redis: Redis,
+    redis: RedisClient,
     *,
     guild_id: str,
     ids: list[str] | None = None,
@@ -189,7 +370,7 @@ async def get_recent_messages(
 
     Parameters
     ----------
-    redis : redis.Redis
+    redis : courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     guild_id: str
         The ID of the guild to make the search.
@@ -214,11 +395,11 @@ async def get_recent_messages(
         num_results=limit,
     )
 
-    return await _get_messages_from_query(redis, query)
+    return await _get_messages_from_query(redis, query, guild_id=guild_id, limit=limit)
 
 
 async def get_messages_by_semantics_similarity(  # noqa: PLR0913
-    redis: Redis,
+    redis: RedisClient,
     *,
     guild_id: str,
     embedding: bytes,
@@ -231,7 +412,7 @@ async def get_messages_by_semantics_similarity(  # noqa: PLR0913
 
     Parameters
     ----------
-    redis : redis.Redis
+    redis : courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     guild_id: str
         The ID of the guild to make the search.
@@ -248,7 +429,7 @@ async def get_messages_by_semantics_similarity(  # noqa: PLR0913
     Returns
     -------
     list[courageous_comets.models.Message]
-        The messages that are semantically similar
+        The messages that are semantically similar, closest first.
     """
     search_scope = build_search_scope(guild_id, ids, scope)
 
@@ -260,11 +441,66 @@ async def get_messages_by_semantics_similarity(  # noqa: PLR0913
         num_results=limit,
     )
 
-    return await _get_messages_from_query(redis, query)
+    return await _get_messages_from_query(redis, query, guild_id=guild_id, limit=limit)
+
+
+async def get_messages_within_distance(  # noqa: PLR0913
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    embedding: bytes,
+    distance: float,
+    ids: list[str] | None = None,
+    scope: StatisticScope = StatisticScope.CHANNEL,
+    limit: int = RANGE_SEARCH_LIMIT,
+) -> list[models.Message]:
+    """
+    Get the messages within a semantic distance of the provided embedding.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id: str
+        The ID of the guild to make the search.
+    embedding: bytes
+        The vector embedding of the query.
+    distance: float
+        The maximum cosine distance between the query and a message, from 0 to 2.
+    ids : list[str] | None
+        Optional list of IDs to search for.
+    scope : courageous_comets.enums.StatisticScope
+        The scope of additional IDs (default: courageous_comets.enums.StatisticScopeEnum.CHANNEL).
+        Ignored if it is set to courageous_comets.enums.StatisticScope.GUILD.
+    limit : int
+        The maximum number of messages to fetch
+        (default: courageous_comets.redis.messages.RANGE_SEARCH_LIMIT).
+
+    Returns
+    -------
+    list[courageous_comets.models.Message]
+        The messages within the distance, closest first.
+    """
+    search_scope = build_search_scope(guild_id, ids, scope)
+    index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
+    index.set_client(get_shard(redis, guild_id))
+
+    query = RangeQuery(
+        vector=embedding,
+        vector_field_name="embedding",
+        return_fields=RETURN_FIELDS,
+        filter_expression=search_scope,
+        distance_threshold=distance,
+        num_results=limit,
+    )
+
+    results = await index.search(query.query, query.params)
+
+    return [models.Message.model_validate(doc) for doc in results.docs if results.total]
 
 
 async def get_messages_by_sentiment_similarity(  # noqa: PLR0913
-    redis: Redis,
+    redis: RedisClient,
     *,
     guild_id: str,
     sentiment: float,
@@ -278,7 +514,7 @@ async def get_messages_by_sentiment_similarity(  # noqa: PLR0913
 
     Parameters
     ----------
-    redis : redis.Redis
+    redis : courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     guild_id: str
         The ID of the guild to make the search.
@@ -297,7 +533,7 @@ async def get_messages_by_sentiment_similarity(  # noqa: PLR0913
     Returns
     -------
     list[courageous_comets.models.Message]
-        The messages that are sentimentally similar.
+        The messages that are sentimentally similar, closest sentiment first.
     """
     search_scope = build_search_scope(guild_id, ids, scope)
 
@@ -307,17 +543,130 @@ async def get_messages_by_sentiment_similarity(  # noqa: PLR0913
 
     filter_expression = search_scope & low & high
 
-    query = FilterQuery(
-        return_fields=RETURN_FIELDS,
-        filter_expression=filter_expression,
-        num_results=limit,
+    # Rank the messages by the distance of their sentiment to the target, then by recency
+    query = (
+        aggregations.AggregateRequest(str(filter_expression))
+        .load(*(f"@{field}" for field in RETURN_FIELDS), "@sentiment_compound")  # type: ignore
+        .apply(sentiment_distance=f"abs(@sentiment_compound - ({sentiment}))")
+        .sort_by(
+            aggregations.Asc("@sentiment_distance"),  # type: ignore
+            aggregations.Desc("@timestamp"),  # type: ignore
+            max=limit,
+        )
     )
 
-    return await _get_messages_from_query(redis, query)
+    index = _get_raw_index(redis, guild_id)
+    results = await index.aggregate(query)  # type: ignore
+
+    # Deserialize all rows as dictionaries. Each row is a flat list of key-value pairs.
+    return [
+        models.Message.model_validate_strings(dict(itertools.batched(row, 2)))
+        for row in results.rows
+    ]
+
+
+async def get_messages_by_hybrid_similarity(  # noqa: PLR0913
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    embedding: bytes,
+    sentiment: float | None = None,
+    sentiment_radius: float = 0.5,
+    since: datetime.datetime | None = None,
+    ids: list[str] | None = None,
+    scope: StatisticScope = StatisticScope.CHANNEL,
+    limit: int = settings.QUERY_LIMIT,
+    weights: models.SearchWeights | None = None,
+) -> list[models.Message]:
+    """
+    Get the messages that best match a combination of semantics, sentiment and recency.
 
+    Runs a single aggregation on Redis. A KNN vector query selects the semantically closest
+    messages within the sentiment range and time window. Redis then ranks these candidates by
+    the weighted sum of their semantic similarity, sentiment proximity and recency.
 
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild to make the search.
+    embedding : bytes
+        The vector embedding of the query.
+    sentiment : float | None
+        The target sentiment compound score, if any.
+    sentiment_radius : float
+        The maximum distance to the target sentiment (default: 0.5). Ignored without a target
+        sentiment.
+    since : datetime.datetime | None
+        Only include messages sent after this moment, if given.
+    ids : list[str] | None
+        Optional list of IDs to search for.
+    scope : courageous_comets.enums.StatisticScope
+        The scope of additional IDs (default: courageous_comets.enums.StatisticScope.CHANNEL).
+        Ignored if it is set to courageous_comets.enums.StatisticScope.GUILD.
+    limit : int
+        The number of messages to fetch (default: courageous_comets.settings.QUERY_LIMIT).
+    weights : courageous_comets.models.SearchWeights | None
+        The weights of the ranking signals (default: courageous_comets.models.SearchWeights()).
+
+    Returns
+    -------
+    list[courageous_comets.models.Message]
+        The best matching messages, best match first.
+    """
+    weights = weights or models.SearchWeights()
+    filter_expression = build_search_scope(guild_id, ids, scope)
+
+    if sentiment is not None:
+        filter_expression = (
+            filter_expression
+            & (Num("sentiment_compound") >= sentiment - sentiment_radius)  # type: ignore
+            & (Num("sentiment_compound") <= sentiment + sentiment_radius)  # type: ignore
+        )
+
+    if since is not None:
+        filter_expression = filter_expression & (Num("timestamp") >= since.timestamp())  # type: ignore
+
+    # Each signal is scaled to a score between 0 and 1. Cosine distance ranges from 0 to 2 and
+    # the sentiment compound score ranges from -1 to 1.
+    now = datetime.datetime.now(datetime.UTC).timestamp()
+    decay = math.log(2) / weights.recency_half_life
+    scores = [
+        f"{weights.semantics} * (1 - @vector_distance / 2)",
+        f"{weights.recency} * exp(-{decay:.12f} * ({now} - @timestamp))",
+    ]
+
+    if sentiment is not None:
+        scores.append(f"{weights.sentiment} * (1 - abs(@sentiment_compound - ({sentiment})) / 2)")
+
+    # Rank more candidates than requested, so that the other signals can promote messages that
+    # are not among the semantically closest
+    candidates = limit * HYBRID_SEARCH_CANDIDATES_FACTOR
+
+    query = (
+        aggregations.AggregateRequest(
+            f"({filter_expression})=>[KNN {candidates} @embedding $vector AS vector_distance]",
+        )
+        .load(*(f"@{field}" for field in RETURN_FIELDS), "@sentiment_compound")  # type: ignore
+        .apply(score=" + ".join(scores))
+        .sort_by(aggregations.Desc("@score"), max=limit)  # type: ignore
+        .dialect(2)
+    )
+
+    index = _get_raw_index(redis, guild_id)
+    results = await index.aggregate(query, {"vector": embedding})  # type: ignore
+
+    # Deserialize all rows as dictionaries. Each row is a flat list of key-value pairs.
+    return [
+        models.Message.model_validate_strings(dict(itertools.batched(row, 2)))
+        for row in results.rows
+    ]
+
+
+@cached_query
 async def get_tokens_count(
-    redis: Redis,
+    redis: RedisClient,
     *,
     guild_id: str,
     ids: list[str] | None = None,
@@ -329,7 +678,7 @@ async def get_tokens_count(
 
     Parameters
     ----------
-    redis: redis.Redis
+    redis: courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     guild_id: str
         The ID of the guild to make the search
@@ -348,7 +697,7 @@ async def get_tokens_count(
     """
     search_scope = build_search_scope(guild_id, ids, scope)
     index = AsyncSearchIndex.from_dict(schema.MESSAGE_SCHEMA)
-    index.set_client(redis)
+    index.set_client(get_shard(redis, guild_id))
 
     query = FilterQuery(
         return_fields=["tokens"],
@@ -370,6 +719,122 @@ async def get_tokens_count(
     return counter
 
 
+async def stream_tokens(
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    ids: list[str] | None = None,
+    scope: StatisticScope = StatisticScope.CHANNEL,
+    chunk_size: int = settings.AGGREGATE_CHUNK_SIZE,
+) -> AsyncGenerator[list[dict[str, int]], None]:
+    """
+    Stream the token counts of all matching messages in chunks.
+
+    Uses an aggregation cursor so that only one chunk of messages is held in memory at a time.
+    The cursor is deleted on Redis when the stream is closed early, e.g. if the calling task is
+    cancelled. Use `contextlib.aclosing` to make sure this happens promptly.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild to make the search.
+    ids : list[str], optional
+        Optional list of IDs to search for. Defaults to None.
+    scope : courageous_comets.enums.StatisticScope
+        The scope of additional IDs (default: courageous_comets.enums.StatisticScope.CHANNEL).
+        Ignored if it is equal to courageous_comets.enums.StatisticScope.GUILD.
+    chunk_size : int
+        The number of messages to read per round trip
+        (default: courageous_comets.settings.AGGREGATE_CHUNK_SIZE).
+
+    Yields
+    ------
+    list[dict[str, int]]
+        The token counts of each message in the next chunk.
+    """
+    search_scope = build_search_scope(guild_id, ids, scope)
+    index = _get_raw_index(redis, guild_id)
+
+    query = (
+        aggregations.AggregateRequest(str(search_scope))
+        .load("@tokens")  # type: ignore
+        .cursor(count=chunk_size, max_idle=AGGREGATE_CURSOR_MAX_IDLE)
+    )
+
+    results = await index.aggregate(query)  # type: ignore
+    cursor = results.cursor
+
+    try:
+        while True:
+            # Each row is a flat list of key-value pairs
+            rows = [dict(itertools.batched(row, 2)) for row in results.rows]
+            yield [json.loads(row["tokens"]) for row in rows if "tokens" in row]
+
+            # A cursor ID of 0 means all results have been read
+            if not cursor.cid:
+                break
+
+            results = await index.aggregate(cursor)
+    finally:
+        if cursor.cid:
+            # Free the cursor on Redis instead of waiting for it to expire
+            await index.execute_command("FT.CURSOR", "DEL", index.index_name, cursor.cid)
+
+
+@cached_query
+async def get_tokens_count_exact(
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    ids: list[str] | None = None,
+    scope: StatisticScope = StatisticScope.CHANNEL,
+    chunk_size: int = settings.AGGREGATE_CHUNK_SIZE,
+) -> Counter[str]:
+    """
+    Get the count of tokens across all matching messages.
+
+    Unlike `get_tokens_count`, this function is not limited to the most recent messages. Token
+    counts are read in chunks and merged as they arrive.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild to make the search.
+    ids : list[str], optional
+        Optional list of IDs to search for. Defaults to None.
+    scope : courageous_comets.enums.StatisticScope
+        The scope of additional IDs (default: courageous_comets.enums.StatisticScope.CHANNEL).
+        Ignored if it is equal to courageous_comets.enums.StatisticScope.GUILD.
+    chunk_size : int
+        The number of messages to read per round trip
+        (default: courageous_comets.settings.AGGREGATE_CHUNK_SIZE).
+
+    Returns
+    -------
+    collections.Counter
+        Mapping of each token to its count.
+    """
+    counter = Counter()
+    stream = stream_tokens(
+        redis,
+        guild_id=guild_id,
+        ids=ids,
+        scope=scope,
+        chunk_size=chunk_size,
+    )
+
+    async with aclosing(stream) as chunks:
+        async for chunk in chunks:
+            for tokens in chunk:
+                counter.update(tokens)
+
+    return counter
+
+
 def _calculate_duration_range(duration: Duration) -> tuple[float, float]:
     """Calculate the lower and upper bounds of a duration.
 
@@ -398,8 +863,9 @@ def _calculate_duration_range(duration: Duration) -> tuple[float, float]:
     return (lower.timestamp(), upper.timestamp())
 
 
+@cached_query
 async def get_messages_frequency(  # noqa: PLR0913
-    redis: Redis,
+    redis: RedisClient,
     *,
     guild_id: str,
     ids: list[str] | None = None,
@@ -412,7 +878,7 @@ async def get_messages_frequency(  # noqa: PLR0913
 
     Parameters
     ----------
-    redis : Redis
+    redis : courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     guild_id : str
         The ID of the guild to make the search.
@@ -438,7 +904,7 @@ async def get_messages_frequency(  # noqa: PLR0913
         & (Num("timestamp") >= lower_timestamp)  # type: ignore
         & (Num("timestamp") <= upper_timestamp)  # type: ignore
     )
-    index = _get_raw_index(redis)
+    index = _get_raw_index(redis, guild_id)
 
     # Define a reducer to count distinct message IDs and alias the result as "num_messages"
     reducer = reducers.count_distinct("@message_id").alias("num_messages")
@@ -472,8 +938,9 @@ async def get_messages_frequency(  # noqa: PLR0913
     ]
 
 
+@cached_query
 async def get_average_sentiment(
-    redis: Redis,
+    redis: RedisClient,
     *,
     guild_id: str,
     ids: list[str] | None = None,
@@ -485,7 +952,7 @@ async def get_average_sentiment(
 
     Parameters
     ----------
-    redis : Redis
+    redis : courageous_comets.redis.cluster.RedisClient
         The Redis connection instance.
     guild_id : str
         The ID of the guild to make the search.
@@ -498,7 +965,7 @@ async def get_average_sentiment(
         The number of messages to aggregate over (default: settings.QUERY_LIMIT).
     """
     search_scope = build_search_scope(guild_id, ids, scope)
-    index = _get_raw_index(redis)
+    index = _get_raw_index(redis, guild_id)
 
     # Define reducers to calculate the average scores for each sentiment type
     avg_sentiment = reducers.avg("@sentiment_compound").alias("sentiment_compound")
@@ -0,0 +1,156 @@
+import asyncio
+import itertools
+import logging
+from collections.abc import Awaitable, Callable
+
+from redis.asyncio import Redis, RedisError
+from redis.exceptions import ConnectionError as RedisConnectionError
+from redis.exceptions import TimeoutError as RedisTimeoutError
+
+from courageous_comets.redis.cluster import RedisClient
+
+logger = logging.getLogger(__name__)
+
+# Maximum number of seconds to wait for a replica to respond to a health check
+HEALTH_CHECK_TIMEOUT = 2
+
+
+class ReplicaPool:
+    """
+    Route read-only queries to healthy Redis read replicas.
+
+    Replicas are health checked periodically. A replica is considered healthy if it responds in
+    time and its link to the primary is up. Reads are spread over the healthy replicas in turn.
+    If no replica is healthy, reads fail over to the primary. A replica that cannot be reached
+    during a read is taken out of rotation right away, until it passes a health check again.
+    Writes should always go to the primary.
+
+    Attributes
+    ----------
+    primary : courageous_comets.redis.RedisClient
+        The connection to the primary.
+    replicas : list[redis.asyncio.Redis]
+        The connections to the read replicas.
+    """
+
+    def __init__(self, primary: RedisClient, replicas: list[Redis]) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self._healthy = list(replicas)
+        self._turn = itertools.count()
+
+    @property
+    def healthy(self) -> list[Redis]:
+        """The replicas that passed the last health check."""
+        return list(self._healthy)
+
+    def reader(self) -> RedisClient:
+        """
+        Get a connection for a read-only query.
+
+        Returns
+        -------
+        courageous_comets.redis.RedisClient
+            The next healthy replica, or the primary if no replica is healthy.
+        """
+        replica = self._next_replica()
+        return self.primary if replica is None else replica
+
+    async def read[T](self, query: Callable[[RedisClient], Awaitable[T]]) -> T:
+        """
+        Run a read-only query on the next healthy replica.
+
+        If the replica cannot be reached, it is marked as unhealthy and the query is run again on
+        the primary.
+
+        Parameters
+        ----------
+        query : Callable[[courageous_comets.redis.RedisClient], Awaitable[T]]
+            The query to run, given the connection to run it on.
+
+        Returns
+        -------
+        T
+            The result of the query.
+        """
+        replica = self._next_replica()
+
+        if replica is None:
+            return await query(self.primary)
+
+        try:
+            return await query(replica)
+        except (RedisConnectionError, RedisTimeoutError):
+            self._mark_unhealthy(replica)
+            return await query(self.primary)
+
+    async def check_health(self) -> None:
+        """Check the health of all replicas and update the set of healthy replicas."""
+        results = await asyncio.gather(*(self._is_healthy(replica) for replica in self.replicas))
+        healthy = [replica for replica, ok in zip(self.replicas, results, strict=True) if ok]
+
+        for replica in self.replicas:
+            was_healthy = replica in self._healthy
+            is_healthy = replica in healthy
+
+            if was_healthy and not is_healthy:
+                logger.warning("Redis replica %s is unhealthy", _describe(replica))
+            elif is_healthy and not was_healthy:
+                logger.info("Redis replica %s is healthy", _describe(replica))
+
+        if self.replicas and not healthy:
+            logger.warning("No healthy Redis replicas. Failing over reads to the primary")
+
+        self._healthy = healthy
+
+    async def monitor(self, interval: float) -> None:
+        """
+        Check the health of the replicas every `interval` seconds until cancelled.
+
+        Parameters
+        ----------
+        interval : float
+            The number of seconds between health checks.
+        """
+        while True:
+            await asyncio.sleep(interval)
+            await self.check_health()
+
+    async def aclose(self) -> None:
+        """Close the connections to all replicas."""
+        for replica in self.replicas:
+            await replica.aclose()
+
+    def _next_replica(self) -> Redis | None:
+        if not self._healthy:
+            return None
+
+        return self._healthy[next(self._turn) % len(self._healthy)]
+
+    def _mark_unhealthy(self, replica: Redis) -> None:
+        if replica not in self._healthy:
+            return
+
+        logger.warning(
+            "Redis replica %s failed a read. Retrying on the primary",
+            _describe(replica),
+            exc_info=True,
+        )
+        self._healthy = [healthy for healthy in self._healthy if healthy is not replica]
+
+    @staticmethod
+    async def _is_healthy(replica: Redis) -> bool:
+        try:
+            async with asyncio.timeout(HEALTH_CHECK_TIMEOUT):
+                replication = await replica.info("replication")
+        except (RedisError, TimeoutError):
+            return False
+
+        # A replica that lost its link to the primary serves stale data
+        return replication.get("master_link_status", "up") == "up"
+
+
+def _describe(replica: Redis) -> str:
+    """Describe a replica connection by its host and port."""
+    kwargs = replica.connection_pool.connection_kwargs
+    return f"{kwargs.get("host")}:{kwargs.get("port")}"
@@ -1,5 +1,8 @@
 from courageous_comets import settings
 
+# Number of dimensions of the message embeddings
+EMBEDDING_DIMS = 384
+
 MESSAGE_SCHEMA = {
     "index": {
         "name": "message_idx",
@@ -19,7 +22,7 @@ MESSAGE_SCHEMA = {
             "name": "embedding",
             "type": "vector",
             "attrs": {
-                "dims": 384,
+                "dims": EMBEDDING_DIMS,
                 "distance_metric": "cosine",
                 "algorithm": "hnsw",
                 "datatype": "float32",
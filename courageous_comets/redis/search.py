@@ -0,0 +1,110 @@
+import logging
+import math
+import secrets
+
+from courageous_comets import models, settings
+from courageous_comets.redis.cluster import RedisClient
+from courageous_comets.redis.keys import key_schema
+
+logger = logging.getLogger(__name__)
+
+
+async def save_search_results(
+    redis: RedisClient,
+    messages: list[models.Message],
+    *,
+    guild_id: str,
+    page_size: int = settings.SEARCH_PAGE_SIZE,
+) -> models.SearchPage:
+    """
+    Store search results on Redis so they can be paged through without searching again.
+
+    The results are kept for `courageous_comets.settings.SEARCH_CURSOR_TTL` seconds after the
+    last time a page was read.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    messages : list[courageous_comets.models.Message]
+        The search results, in order.
+    guild_id : str
+        The ID of the guild the search was made in.
+    page_size : int
+        The number of messages per page (default: courageous_comets.settings.SEARCH_PAGE_SIZE).
+
+    Returns
+    -------
+    courageous_comets.models.SearchPage
+        The first page of the search results.
+    """
+    cursor_id = secrets.token_hex(8)
+
+    if messages:
+        key = key_schema.guild_search_cursor(guild_id=int(guild_id), cursor_id=cursor_id)
+
+        async with redis.pipeline(transaction=False) as pipeline:
+            pipeline.rpush(key, *(message.model_dump_json() for message in messages))
+            pipeline.expire(key, settings.SEARCH_CURSOR_TTL)
+            await pipeline.execute()
+
+        logger.debug("Saved %s search results as %s", len(messages), cursor_id)
+
+    return models.SearchPage(
+        cursor_id=cursor_id,
+        page=0,
+        page_count=max(math.ceil(len(messages) / page_size), 1),
+        messages=messages[:page_size],
+    )
+
+
+async def get_search_page(
+    redis: RedisClient,
+    *,
+    guild_id: str,
+    cursor_id: str,
+    page: int,
+    page_size: int = settings.SEARCH_PAGE_SIZE,
+) -> models.SearchPage | None:
+    """
+    Get a page of stored search results.
+
+    Reading a page resets the expiry of the search results.
+
+    Parameters
+    ----------
+    redis : courageous_comets.redis.cluster.RedisClient
+        The Redis connection instance.
+    guild_id : str
+        The ID of the guild the search was made in.
+    cursor_id : str
+        The ID of the stored search results.
+    page : int
+        The zero-based index of the page.
+    page_size : int
+        The number of messages per page (default: courageous_comets.settings.SEARCH_PAGE_SIZE).
+
+    Returns
+    -------
+    courageous_comets.models.SearchPage | None
+        The page of search results, or None if the search results have expired.
+    """
+    key = key_schema.guild_search_cursor(guild_id=int(guild_id), cursor_id=cursor_id)
+    start = page * page_size
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        pipeline.lrange(key, start, start + page_size - 1)
+        pipeline.llen(key)
+        pipeline.expire(key, settings.SEARCH_CURSOR_TTL)
+        items, total, _ = await pipeline.execute()
+
+    if not total:
+        logger.debug("Search results %s have expired", cursor_id)
+        return None
+
+    return models.SearchPage(
+        cursor_id=cursor_id,
+        page=page,
+        page_count=math.ceil(total / page_size),
+        messages=[models.Message.model_validate_json(item) for item in items],
+    )
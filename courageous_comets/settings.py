@@ -97,6 +97,117 @@ def read_int(key: str, default: int) -> int:
     return result
 
 
+def read_bool(key: str, *, default: bool) -> bool:
+    """
+    Read a boolean value from the environment.
+
+    Accepts `true`, `1` and `yes` as truthy values and `false`, `0` and `no` as falsy values. The
+    comparison is case-insensitive.
+
+    Parameters
+    ----------
+    key : str
+        The environment variable key.
+    default : bool
+        The default value to use if the environment variable is not set.
+
+    Returns
+    -------
+    bool
+        The boolean value.
+
+    Raises
+    ------
+    courageous_comets.exceptions.ConfigurationValueError
+        If the value is not a valid boolean.
+    """
+    value = os.getenv(key)
+
+    if value is None:
+        return default
+
+    match value.strip().lower():
+        case "true" | "1" | "yes":
+            return True
+        case "false" | "0" | "no":
+            return False
+        case _:
+            raise ConfigurationValueError(
+                key=key,
+                value=value,
+                reason="Value must be a boolean (true/false)",
+            )
+
+
+def read_choice(key: str, *, default: str, choices: tuple[str, ...]) -> str:
+    """
+    Read one of a fixed set of values from the environment.
+
+    The comparison is case-insensitive.
+
+    Parameters
+    ----------
+    key : str
+        The environment variable key.
+    default : str
+        The default value to use if the environment variable is not set.
+    choices : tuple[str, ...]
+        The allowed values, in lowercase.
+
+    Returns
+    -------
+    str
+        The value, in lowercase.
+
+    Raises
+    ------
+    courageous_comets.exceptions.ConfigurationValueError
+        If the value is not one of `choices`.
+    """
+    value = os.getenv(key, default)
+    result = value.strip().lower()
+
+    if result not in choices:
+        raise ConfigurationValueError(
+            key=key,
+            value=value,
+            reason=f"Value must be one of {", ".join(choices)}",
+        )
+
+    return result
+
+
+def read_ids(key: str) -> list[int]:
+    """
+    Read a comma-separated list of Discord IDs from the environment.
+
+    Parameters
+    ----------
+    key : str
+        The environment variable key.
+
+    Returns
+    -------
+    list[int]
+        The IDs. Empty if the environment variable is not set.
+
+    Raises
+    ------
+    courageous_comets.exceptions.ConfigurationValueError
+        If a value is not a valid ID.
+    """
+    value = os.getenv(key, "")
+
+    try:
+        return [int(item) for item in filter(None, map(str.strip, value.split(",")))]
+    except ValueError as e:
+        raise ConfigurationValueError(
+            key=key,
+            value=value,
+            reason="Value must be a comma-separated list of IDs",
+        ) from e
+
+
 def read_redis_port() -> int:
     """
     Read the Redis port from the environment.
@@ -123,6 +234,40 @@ def read_redis_port() -> int:
     return result
 
 
+def read_redis_replicas() -> list[tuple[str, int]]:
+    """
+    Read the Redis read replica endpoints from the environment.
+
+    Endpoints are given as a comma-separated list of `host:port` pairs.
+
+    Returns
+    -------
+    list[tuple[str, int]]
+        The host and port of each replica. Empty if no replicas are configured.
+
+    Raises
+    ------
+    courageous_comets.exceptions.ConfigurationValueError
+        If an endpoint is not a valid `host:port` pair.
+    """
+    value = os.getenv("REDIS_REPLICAS", "")
+    result: list[tuple[str, int]] = []
+
+    for endpoint in filter(None, map(str.strip, value.split(","))):
+        host, _, port = endpoint.rpartition(":")
+
+        if not host or not port.isdigit() or not (0 <= int(port) <= 65535):  # noqa: PLR2004
+            raise ConfigurationValueError(
+                key="REDIS_REPLICAS",
+                value=value,
+                reason=f"Endpoint '{endpoint}' must be a host and a valid port (host:port)",
+            )
+
+        result.append((host, int(port)))
+
+    return result
+
+
 def setup_logging() -> None:
     """Set up logging for the application."""
     coloredlogs.install(
@@ -166,9 +311,47 @@ try:
     REDIS_HOST = os.getenv("REDIS_HOST", "localhost")
     REDIS_PORT = read_redis_port()
     REDIS_PASSWORD = os.getenv("REDIS_PASSWORD")
+    # Connect to a Redis Cluster instead of a single Redis node
+    REDIS_CLUSTER = read_bool("REDIS_CLUSTER", default=False)
+    # Read replicas for search and aggregation queries
+    REDIS_REPLICAS = read_redis_replicas()
+    REDIS_REPLICA_HEALTH_CHECK_INTERVAL = read_int("REDIS_REPLICA_HEALTH_CHECK_INTERVAL", 5)
     REDIS_KEYS_PREFIX = os.getenv("REDIS_KEYS_PREFIX", "courageous_comets")
     # Maximum number of items to return from a query
     QUERY_LIMIT = read_int("QUERY_LIMIT", 10)
+    # Number of messages to read per round trip when aggregating over all messages
+    AGGREGATE_CHUNK_SIZE = read_int("AGGREGATE_CHUNK_SIZE", 1000)
+    # Maximum number of seconds to spend on an aggregation over all messages
+    AGGREGATE_TIMEOUT = read_int("AGGREGATE_TIMEOUT", 10)
+    # Maximum number of query results to cache and the number of seconds to cache them
+    QUERY_CACHE_SIZE = read_int("QUERY_CACHE_SIZE", 256)
+    QUERY_CACHE_TTL = read_int("QUERY_CACHE_TTL", 30)
+    # Maximum number of Discord messages to cache, and the number of seconds to cache messages
+    # and messages that were not found
+    MESSAGE_CACHE_SIZE = read_int("MESSAGE_CACHE_SIZE", 4096)
+    MESSAGE_CACHE_TTL = read_int("MESSAGE_CACHE_TTL", 600)
+    MESSAGE_NEGATIVE_CACHE_TTL = read_int("MESSAGE_NEGATIVE_CACHE_TTL", 60)
+    # Number of search results per page and the number of seconds to keep the results
+    SEARCH_PAGE_SIZE = read_int("SEARCH_PAGE_SIZE", 5)
+    SEARCH_CURSOR_TTL = read_int("SEARCH_CURSOR_TTL", 300)
+    # Number of characters of each message to store for displaying search results
+    SNIPPET_LENGTH = read_int("SNIPPET_LENGTH", 200)
+    # Maximum number of charts to render at once, each in a worker thread
+    CHART_RENDER_CONCURRENCY = read_int("CHART_RENDER_CONCURRENCY", 2)
+    # Library used to draw charts
+    CHART_RENDERER = read_choice(
+        "CHART_RENDERER",
+        default="matplotlib",
+        choices=("matplotlib", "pillow"),
+    )
+    # Maximum number of bytes of rendered charts to keep on disk, and the number of seconds to
+    # share rendered charts on Redis (0 to disable)
+    CHART_CACHE_SIZE = read_int("CHART_CACHE_SIZE", 64 * 1024 * 1024)
+    CHART_CACHE_REDIS_TTL = read_int("CHART_CACHE_REDIS_TTL", 0)
+    # Guilds whose searches are served from an in-memory index
+    LOCAL_SEARCH_GUILDS = read_ids("LOCAL_SEARCH_GUILDS")
+    # Directory for the snapshots of the in-memory search indexes
+    SNAPSHOT_DIR = Path(os.getenv("SNAPSHOT_DIR", "snapshots"))
     # Huggingface environment variable for caching downloaded models.
     # https://huggingface.co/docs/huggingface_hub/v0.24.0/package_reference/environment_variables#hf_home
     HF_HOME = os.getenv(
@@ -176,6 +359,13 @@ try:
         "hf_data",
     )
     HF_DOWNLOAD_CONCURRENCY = read_int("HF_DOWNLOAD_CONCURRENCY", 3)
+    # Maximum number of messages to encode at once, each in a worker thread
+    VECTORIZER_CONCURRENCY = read_int("VECTORIZER_CONCURRENCY", 2)
+    # Number of threads torch uses within a single operation and across operations (0 for automatic)
+    TORCH_NUM_THREADS = read_int("TORCH_NUM_THREADS", 0)
+    TORCH_INTEROP_THREADS = read_int("TORCH_INTEROP_THREADS", 1)
+    # Benchmark the number of threads within an operation at startup and use the fastest
+    VECTORIZER_AUTOTUNE = read_bool("VECTORIZER_AUTOTUNE", default=False)
 except ConfigurationValueError as e:
     logging.critical(
         "Cannot start the application due to configuration errors",
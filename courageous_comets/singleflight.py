@@ -0,0 +1,112 @@
+import asyncio
+import functools
+import logging
+from collections import Counter
+from collections.abc import Awaitable, Callable, Coroutine, Hashable
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class SingleFlight[T]:
+    """
+    Coalesce concurrent calls with the same key into a single call.
+
+    The first caller for a key starts the call. Callers that arrive while the call is in flight
+    wait for the same result instead of starting their own. Once the call completes, the next
+    caller for the key starts a new call, so results are never older than the call itself.
+
+    When every caller of a call is cancelled, for example by a timeout, the call is cancelled too,
+    so abandoned work does not keep running in the background.
+    """
+
+    def __init__(self) -> None:
+        self._calls: dict[Hashable, asyncio.Task[T]] = {}
+        self._waiters: Counter[asyncio.Task[T]] = Counter()
+
+    def __len__(self) -> int:
+        """Return the number of calls in flight."""
+        return len(self._calls)
+
+    async def do(self, key: Hashable, func: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """
+        Call `func`, or wait for the call in flight for `key`.
+
+        The call runs in its own task. If a caller is cancelled, the call continues for the
+        other callers. If the last caller is cancelled, the call is cancelled as well, and the
+        caller waits until the call has stopped.
+
+        Parameters
+        ----------
+        key : collections.abc.Hashable
+            The key that identifies the call.
+        func : Callable[[], Coroutine[Any, Any, T]]
+            The function to call if no call for `key` is in flight.
+
+        Returns
+        -------
+        T
+            The result of the call.
+        """
+        task = self._calls.get(key)
+
+        if task is None:
+            task = asyncio.create_task(func())
+            self._calls[key] = task
+            task.add_done_callback(functools.partial(self._forget, key))
+        else:
+            logger.debug("Joining call in flight for %s", key)
+
+        self._waiters[task] += 1
+
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if self._waiters[task] == 1 and not task.done():
+                logger.debug("Cancelling call for %s without callers", key)
+                self._forget(key, task)
+                task.cancel()
+                # Let the call clean up, e.g. free a Redis cursor, before the caller moves on
+                await asyncio.wait([task])
+            raise
+        finally:
+            self._waiters[task] -= 1
+
+            if not self._waiters[task]:
+                del self._waiters[task]
+
+    def _forget(self, key: Hashable, task: asyncio.Task[T]) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+
+
+def coalesce[**P, T](
+    key: Callable[..., Hashable],
+) -> Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]:
+    """
+    Coalesce concurrent calls of the decorated function with the same key.
+
+    Parameters
+    ----------
+    key : Callable[..., collections.abc.Hashable]
+        Computes the key of a call from the arguments of the decorated function.
+
+    Returns
+    -------
+    Callable[[Callable[P, Awaitable[T]]], Callable[P, Awaitable[T]]]
+        The decorator.
+    """
+
+    def decorator(func: Callable[P, Awaitable[T]]) -> Callable[P, Awaitable[T]]:
+        flight = SingleFlight[T]()
+
+        @functools.wraps(func)
+        async def wrapper(*args: P.args, **kwargs: P.kwargs) -> T:
+            async def call() -> T:
+                return await func(*args, **kwargs)
+
+            return await flight.do(key(*args, **kwargs), call)
+
+        return wrapper
+
+    return decorator
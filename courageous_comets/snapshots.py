@@ -0,0 +1,212 @@
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from types import TracebackType
+from typing import Self
+
+import numpy as np
+import numpy.typing as npt
+
+from courageous_comets.npy import NpyAppender
+
+logger = logging.getLogger(__name__)
+
+# File names of the parts of a snapshot
+EMBEDDINGS_FILE = "embeddings.npy"
+METADATA_FILE = "metadata.npy"
+MANIFEST_FILE = "manifest.json"
+
+# Row layout of the metadata array. One row per message, in the same order as the embeddings.
+METADATA_DTYPE = np.dtype(
+    [
+        ("message_id", "<u8"),
+        ("channel_id", "<u8"),
+        ("user_id", "<u8"),
+        ("timestamp", "<f8"),
+        ("sentiment", "<f4"),
+    ],
+)
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    """
+    The embeddings and metadata of the messages of a guild, mapped into memory.
+
+    The arrays are read-only views of the snapshot files. Pages are loaded by the operating
+    system on first access and are shared by all processes that map the same files.
+
+    Attributes
+    ----------
+    embeddings : numpy.ndarray
+        The float32 embedding vectors, one row per message.
+    metadata : numpy.ndarray
+        The metadata of each message, with dtype `METADATA_DTYPE`.
+    generation : int
+        The generation of the guild when the snapshot was written.
+    """
+
+    embeddings: npt.NDArray[np.float32]
+    metadata: npt.NDArray[np.void]
+    generation: int
+
+    def __len__(self) -> int:
+        """Return the number of messages in the snapshot."""
+        return len(self.metadata)
+
+
+class SnapshotWriter:
+    """
+    Write a snapshot of the messages of a guild incrementally.
+
+    Rows are streamed to temporary files as they are appended, so only the current chunk is held
+    in memory. On close, the temporary files replace the previous snapshot. Processes that mapped
+    the previous snapshot keep reading it until they load the new one.
+
+    Use as a context manager. If the block raises, the previous snapshot is kept.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The directory of the snapshot. Created if it does not exist.
+    generation : int
+        The generation of the guild the snapshot is taken from.
+    dims : int
+        The number of dimensions of the embedding vectors.
+    """
+
+    def __init__(self, directory: Path, *, generation: int, dims: int) -> None:
+        self.directory = directory
+        self.generation = generation
+        self.dims = dims
+        self._embeddings: NpyAppender | None = None
+        self._metadata: NpyAppender | None = None
+
+    def __enter__(self) -> Self:
+        """Open the temporary snapshot files."""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._embeddings = NpyAppender(
+            _temporary(self.directory / EMBEDDINGS_FILE),
+            np.dtype("<f4"),
+            (self.dims,),
+        )
+        self._metadata = NpyAppender(_temporary(self.directory / METADATA_FILE), METADATA_DTYPE)
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        """Replace the previous snapshot, or discard the new one if an error occurred."""
+        if self._embeddings is None or self._metadata is None:
+            return
+
+        if exc_type is not None:
+            self._embeddings.abort()
+            self._metadata.abort()
+            return
+
+        self._embeddings.close()
+        self._metadata.close()
+
+        # The manifest is replaced last, so that a snapshot is never read half written
+        manifest = self.directory / MANIFEST_FILE
+        _temporary(manifest).write_text(
+            json.dumps({"generation": self.generation, "count": self._metadata.rows}),
+        )
+        manifest.unlink(missing_ok=True)
+        self._embeddings.path.replace(self.directory / EMBEDDINGS_FILE)
+        self._metadata.path.replace(self.directory / METADATA_FILE)
+        _temporary(manifest).replace(manifest)
+
+        logger.debug("Wrote a snapshot of %s messages to %s", self._metadata.rows, self.directory)
+
+    @property
+    def count(self) -> int:
+        """The number of messages written so far."""
+        return self._metadata.rows if self._metadata is not None else 0
+
+    def append(
+        self,
+        embeddings: npt.NDArray[np.float32],
+        metadata: npt.NDArray[np.void],
+    ) -> None:
+        """
+        Append a chunk of messages to the snapshot.
+
+        Parameters
+        ----------
+        embeddings : numpy.ndarray
+            The float32 embedding vectors of the messages, one row per message.
+        metadata : numpy.ndarray
+            The metadata of the messages, with dtype `METADATA_DTYPE`.
+
+        Raises
+        ------
+        ValueError
+            If the chunks differ in length or do not have the expected shape.
+        RuntimeError
+            If the writer is not open.
+        """
+        if self._embeddings is None or self._metadata is None:
+            message = "The snapshot writer is not open"
+            raise RuntimeError(message)
+
+        if len(embeddings) != len(metadata):
+            message = f"Got {len(embeddings)} embeddings but {len(metadata)} metadata rows"
+            raise ValueError(message)
+
+        self._embeddings.append(embeddings)
+        self._metadata.append(metadata)
+
+
+def load_snapshot(directory: Path, *, dims: int) -> Snapshot | None:
+    """
+    Map the snapshot in the given directory into memory.
+
+    Parameters
+    ----------
+    directory : pathlib.Path
+        The directory of the snapshot.
+    dims : int
+        The expected number of dimensions of the embedding vectors.
+
+    Returns
+    -------
+    courageous_comets.snapshots.Snapshot | None
+        The snapshot, or None if there is no complete snapshot in the directory or it does not
+        match the expected layout.
+    """
+    try:
+        manifest = json.loads((directory / MANIFEST_FILE).read_text())
+        embeddings = np.load(directory / EMBEDDINGS_FILE, mmap_mode="r")
+        metadata = np.load(directory / METADATA_FILE, mmap_mode="r")
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        logger.warning("Ignoring unreadable snapshot in %s", directory, exc_info=True)
+        return None
+
+    if (
+        embeddings.dtype != np.float32
+        or embeddings.shape[1:] != (dims,)
+        or metadata.dtype != METADATA_DTYPE
+        or len(embeddings) != len(metadata)
+        or len(metadata) != manifest.get("count")
+    ):
+        logger.warning("Ignoring snapshot in %s with an unexpected layout", directory)
+        return None
+
+    return Snapshot(
+        embeddings=embeddings,
+        metadata=metadata,
+        generation=int(manifest.get("generation", -1)),
+    )
+
+
+def _temporary(path: Path) -> Path:
+    """Get the path to write to before replacing `path`."""
+    return path.with_name(f"{path.name}.tmp")
@@ -0,0 +1,227 @@
+"""Timing of the startup phases of the application."""
+
+import contextlib
+import importlib.abc
+import importlib.machinery
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import types
+from collections.abc import Iterable, Iterator, Sequence
+from dataclasses import asdict, dataclass
+
+logger = logging.getLogger(__name__)
+
+# Modules whose import time is reported. Each module includes the time of its own imports.
+TRACKED_IMPORTS = (
+    "discord",
+    "matplotlib",
+    "nltk",
+    "torch",
+    "transformers",
+    "courageous_comets.settings",
+)
+
+
+@dataclass(frozen=True)
+class Phase:
+    """
+    A timed phase of the startup.
+
+    Attributes
+    ----------
+    name : str
+        The name of the phase.
+    start : float
+        The number of seconds from the start of the profiler to the start of the phase.
+    duration : float
+        The number of seconds the phase took. Zero for events, such as connecting to Discord.
+    thread : str
+        The name of the thread the phase ran in.
+    """
+
+    name: str
+    start: float
+    duration: float
+    thread: str
+
+
+class StartupProfiler:
+    """
+    Record how long each phase of the startup takes.
+
+    Phases can overlap, for example when the model loads in the background, and can be nested,
+    for example index creation within the Redis initialization. Recording is thread-safe.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to record phases. If disabled, the profiler does nothing.
+    """
+
+    def __init__(self, *, enabled: bool) -> None:
+        self.enabled = enabled
+        self.origin = time.perf_counter()
+        self.phases: list[Phase] = []
+        self.reported = False
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        """
+        Time the code in the context as a phase of the startup.
+
+        Parameters
+        ----------
+        name : str
+            The name of the phase.
+        """
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+
+        try:
+            yield
+        finally:
+            self._record(name, start, time.perf_counter() - start)
+
+    def mark(self, name: str) -> None:
+        """
+        Record an event of the startup, such as connecting to Discord.
+
+        Parameters
+        ----------
+        name : str
+            The name of the event.
+        """
+        if self.enabled:
+            self._record(name, time.perf_counter(), 0.0)
+
+    def track_imports(self, modules: Iterable[str]) -> None:
+        """
+        Time the first import of the given modules as phases named `import <module>`.
+
+        Only modules that were not imported yet are timed.
+
+        Parameters
+        ----------
+        modules : Iterable[str]
+            The full names of the modules to time.
+        """
+        if self.enabled:
+            sys.meta_path.insert(0, _ImportTimer(self, set(modules) - set(sys.modules)))
+
+    def report(self) -> dict[str, object]:
+        """
+        Get the recorded phases as a structured report.
+
+        Returns
+        -------
+        dict[str, object]
+            The number of seconds since the start of the profiler as `total`, and the phases in the
+            order they started as `phases`.
+        """
+        with self._lock:
+            phases = sorted(self.phases, key=lambda phase: phase.start)
+
+        return {
+            "total": round(time.perf_counter() - self.origin, 3),
+            "phases": [
+                {
+                    **asdict(phase),
+                    "start": round(phase.start, 3),
+                    "duration": round(phase.duration, 3),
+                }
+                for phase in phases
+            ],
+        }
+
+    def log_report(self) -> None:
+        """Log the report as a single line of JSON, once."""
+        if not self.enabled or self.reported:
+            return
+
+        self.reported = True
+        logger.info("Startup profile: %s", json.dumps(self.report()))
+
+    def _record(self, name: str, start: float, duration: float) -> None:
+        phase = Phase(
+            name=name,
+            start=start - self.origin,
+            duration=duration,
+            thread=threading.current_thread().name,
+        )
+
+        with self._lock:
+            self.phases.append(phase)
+
+
+class _ImportTimer(importlib.abc.MetaPathFinder):
+    """Find modules with the other finders, and time the execution of the tracked modules."""
+
+    def __init__(self, profiler: StartupProfiler, modules: set[str]) -> None:
+        self.profiler = profiler
+        self.modules = modules
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,
+        target: types.ModuleType | None = None,
+    ) -> importlib.machinery.ModuleSpec | None:
+        if fullname not in self.modules:
+            return None
+
+        # Only the first import of a module is timed
+        self.modules.discard(fullname)
+
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+
+            spec = finder.find_spec(fullname, path, target)
+
+            if spec is not None:
+                if spec.loader is not None:
+                    spec.loader = _TimedLoader(self.profiler, f"import {fullname}", spec.loader)
+                return spec
+
+        return None
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Time the execution of a module, then hand the module back to its own loader."""
+
+    def __init__(self, profiler: StartupProfiler, phase: str, loader: importlib.abc.Loader) -> None:
+        self.profiler = profiler
+        self.phase = phase
+        self.loader = loader
+
+    def create_module(self, spec: importlib.machinery.ModuleSpec) -> types.ModuleType | None:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: types.ModuleType) -> None:
+        # Restore the original loader, which may provide resources or source code of the module
+        module.__loader__ = self.loader
+
+        if module.__spec__ is not None:
+            module.__spec__.loader = self.loader
+
+        with self.profiler.phase(self.phase):
+            self.loader.exec_module(module)
+
+
+def _requested() -> bool:
+    """Check whether profiling was requested with `--profile-startup` or `PROFILE_STARTUP`."""
+    # Read directly, since the arguments and settings are parsed after the imports to profile
+    flag = os.getenv("PROFILE_STARTUP", "").strip().lower() in ("true", "1", "yes")
+    return flag or "--profile-startup" in sys.argv
+
+
+PROFILER = StartupProfiler(enabled=_requested())
+PROFILER.track_imports(TRACKED_IMPORTS)
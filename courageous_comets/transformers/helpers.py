@@ -5,6 +5,7 @@ from pathlib import Path
 from transformers import AutoModel, AutoTokenizer
 
 from courageous_comets import settings
+from courageous_comets.manifest import verify_manifest, write_manifest
 
 logger = logging.getLogger(__name__)
 
@@ -41,6 +42,10 @@ async def init_transformers(resources: list[str]) -> None:
     """
     Ensure all required transformers are downloaded.
 
+    If the manifest of the Huggingface data directory shows the transformers are present and
+    intact, nothing is downloaded. After a download, the manifest is updated so the transformers
+    can be loaded without the network.
+
     Parameters
     ----------
     resources : list[str]
@@ -50,13 +55,20 @@ async def init_transformers(resources: list[str]) -> None:
         logger.debug("No transformers to download")
         return
 
+    directory = Path(settings.HF_HOME)
+
+    if await asyncio.to_thread(verify_manifest, directory, resources):
+        logger.debug("Transformers found in %s", directory)
+        return
+
     # Create the Huggingface data directory if it does not exist to avoid a race condition when
     # running multiple download tasks concurrently
-    Path(settings.HF_HOME).mkdir(parents=True, exist_ok=True)
+    directory.mkdir(parents=True, exist_ok=True)
 
     semaphore = asyncio.Semaphore(settings.HF_DOWNLOAD_CONCURRENCY)
     download_tasks = [download_transformer(resource, semaphore) for resource in resources]
 
     await asyncio.gather(*download_tasks)
+    await asyncio.to_thread(write_manifest, directory, resources)
 
     logger.debug("Transformers downloaded")
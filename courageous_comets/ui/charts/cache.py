@@ -0,0 +1,256 @@
+import asyncio
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from collections.abc import Callable
+from functools import partial
+from pathlib import Path
+
+from redis.exceptions import RedisError
+
+from courageous_comets import settings
+from courageous_comets.redis import RedisClient
+from courageous_comets.redis.keys import key_schema
+from courageous_comets.singleflight import SingleFlight
+from courageous_comets.ui.charts import CACHE_ROOT, rendering
+
+logger = logging.getLogger(__name__)
+
+# Subdirectories of earlier versions of the cache, which are deleted when the cache is first used
+LEGACY_DIRECTORIES = ("sentiment_bars",)
+
+
+def chart_key(draw: Callable[..., bytes], *args: object) -> str:
+    """
+    Compute the key of a chart from the function that draws it and its input data.
+
+    Parameters
+    ----------
+    draw : Callable[..., bytes]
+        The function that draws the chart.
+    *args : object
+        The input data of the chart. Must have a deterministic `repr`.
+
+    Returns
+    -------
+    str
+        The hex digest of the chart.
+    """
+    content = repr((draw.__module__, draw.__qualname__, args))
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+class ChartCache:
+    """
+    A cache of rendered charts, addressed by their content.
+
+    Charts are stored as PNG files in a directory, up to a total size. When the directory is
+    full, the least recently used charts are deleted first. If a Redis connection is set, charts
+    are also stored on Redis, so they are shared by all processes of the application.
+
+    Since the key of a chart covers all of its input data, changed data never gets a stale chart.
+    Files are read and written in worker threads, so the event loop never waits for the disk. Like
+    Redis errors, disk errors are logged and treated as cache misses, so they never fail a command.
+
+    Parameters
+    ----------
+    directory : Path
+        The directory to store the charts in.
+    max_bytes : int
+        The maximum total size of the charts in the directory.
+    redis_ttl : int
+        The number of seconds to keep charts on Redis.
+    redis : courageous_comets.redis.RedisClient | None
+        A binary Redis connection to share charts with other processes, if any. Can be set later
+        through the `redis` attribute.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        *,
+        max_bytes: int,
+        redis_ttl: int,
+        redis: RedisClient | None = None,
+    ) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.redis_ttl = redis_ttl
+        self.redis = redis
+        # Sizes of the charts in the directory, least recently used first
+        self._entries: OrderedDict[str, int] | None = None
+        self._size = 0
+        self._loading = asyncio.Lock()
+        self._renders = SingleFlight[bytes]()
+
+    async def render(self, draw: Callable[..., bytes], *args: object) -> bytes:
+        """
+        Get a chart from the cache, or draw it in the chart worker pool.
+
+        Concurrent requests for the same chart are drawn once.
+
+        Parameters
+        ----------
+        draw : Callable[..., bytes]
+            Draws the chart from `args` and returns the PNG image.
+        *args : object
+            The input data of the chart. Must have a deterministic `repr`.
+
+        Returns
+        -------
+        bytes
+            The rendered image.
+        """
+        key = chart_key(draw, *args)
+        return await self._renders.do(key, partial(self._get_or_render, key, draw, *args))
+
+    async def _get_or_render(self, key: str, draw: Callable[..., bytes], *args: object) -> bytes:
+        if (image := await self._read(key)) is not None:
+            return image
+
+        if (image := await self._read_shared(key)) is not None:
+            await self._write(key, image)
+            return image
+
+        logger.debug("Rendering chart %s", key)
+        image = await rendering.render(draw, *args)
+        await self._write(key, image)
+        await self._write_shared(key, image)
+
+        return image
+
+    async def _read(self, key: str) -> bytes | None:
+        entries = await self._load_entries()
+
+        try:
+            image = await asyncio.to_thread(_read_and_touch, self._path(key))
+        except FileNotFoundError:
+            if key in entries:
+                self._size -= entries.pop(key)
+            return None
+        except OSError:
+            logger.warning("Could not read chart %s from disk", key, exc_info=True)
+            return None
+
+        if key not in entries:
+            # Stored by another process
+            entries[key] = len(image)
+            self._size += len(image)
+
+        entries.move_to_end(key)
+        return image
+
+    async def _write(self, key: str, image: bytes) -> None:
+        entries = await self._load_entries()
+
+        try:
+            await asyncio.to_thread(_write_atomic, self._path(key), image)
+        except OSError:
+            logger.warning("Could not write chart %s to disk", key, exc_info=True)
+            return
+
+        self._size += len(image) - entries.pop(key, 0)
+        entries[key] = len(image)
+        evicted: list[Path] = []
+
+        while self._size > self.max_bytes and len(entries) > 1:
+            oldest, size = entries.popitem(last=False)
+            evicted.append(self._path(oldest))
+            self._size -= size
+            logger.debug("Evicted chart %s", oldest)
+
+        if evicted:
+            await asyncio.to_thread(_unlink_all, evicted)
+
+    async def _load_entries(self) -> OrderedDict[str, int]:
+        """Index the charts already in the directory, by time of last use."""
+        async with self._loading:
+            if self._entries is None:
+                try:
+                    self._entries = await asyncio.to_thread(_scan, self.directory)
+                except OSError:
+                    logger.warning(
+                        "Could not index the charts in %s",
+                        self.directory,
+                        exc_info=True,
+                    )
+                    self._entries = OrderedDict()
+
+                self._size = sum(self._entries.values())
+
+        return self._entries
+
+    async def _read_shared(self, key: str) -> bytes | None:
+        if self.redis is None:
+            return None
+
+        try:
+            return await self.redis.get(key_schema.chart(key))
+        except RedisError:
+            logger.warning("Could not read chart %s from Redis", key, exc_info=True)
+            return None
+
+    async def _write_shared(self, key: str, image: bytes) -> None:
+        if self.redis is None:
+            return
+
+        try:
+            await self.redis.set(key_schema.chart(key), image, ex=self.redis_ttl)
+        except RedisError:
+            logger.warning("Could not write chart %s to Redis", key, exc_info=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.png"
+
+
+def _scan(directory: Path) -> OrderedDict[str, int]:
+    """Get the sizes of the charts in a directory, least recently used first."""
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for name in LEGACY_DIRECTORIES:
+        if (directory / name).is_dir():
+            logger.info("Deleting the charts cached by an earlier version in %s", directory / name)
+            shutil.rmtree(directory / name, ignore_errors=True)
+
+    files = sorted(
+        ((path, path.stat()) for path in directory.glob("*.png")),
+        key=lambda item: item[1].st_mtime,
+    )
+    return OrderedDict((path.stem, stat.st_size) for path, stat in files)
+
+
+def _read_and_touch(path: Path) -> bytes:
+    """Read a chart and mark it as recently used, so the order survives restarts."""
+    image = path.read_bytes()
+    os.utime(path)
+    return image
+
+
+def _write_atomic(path: Path, image: bytes) -> None:
+    """Write a chart, so other processes never read a partial file."""
+    # Every write gets its own temporary file, so concurrent writers never mix their contents
+    file = tempfile.NamedTemporaryFile(dir=path.parent, suffix=".tmp", delete=False)
+    temp = Path(file.name)
+
+    try:
+        with file:
+            file.write(image)
+        temp.replace(path)
+    except OSError:
+        temp.unlink(missing_ok=True)
+        raise
+
+
+def _unlink_all(paths: list[Path]) -> None:
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+CHART_CACHE = ChartCache(
+    CACHE_ROOT,
+    max_bytes=settings.CHART_CACHE_SIZE,
+    redis_ttl=settings.CHART_CACHE_REDIS_TTL,
+)
@@ -1,20 +1,20 @@
 import io
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING
 
 import discord
-import matplotlib.pyplot as plt
-from matplotlib.dates import (
-    AutoDateLocator,
-    ConciseDateFormatter,
-    DayLocator,
-    HourLocator,
-    MinuteLocator,
-)
-
-from courageous_comets import models
+
+from courageous_comets import models, settings
 from courageous_comets.enums import Duration
+from courageous_comets.ui.charts import raster, rendering
+from courageous_comets.ui.charts.cache import CHART_CACHE
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
 
-def render(
+async def render(
     frequencies: list[models.MessageFrequency],
     duration: Duration,
 ) -> discord.File:
@@ -37,7 +37,37 @@ def render(
     ----
     Assumes list of frequencies is not empty.
     """
-    _, ax = plt.subplots()
+    image = await CHART_CACHE.render(RENDERERS[settings.CHART_RENDERER], frequencies, duration)
+    return discord.File(io.BytesIO(image), filename="message_frequency.png")
+
+
+def _draw(frequencies: list[models.MessageFrequency], duration: Duration) -> bytes:
+    return rendering.render_png(partial(_plot, frequencies, duration))
+
+
+def _draw_raster(frequencies: list[models.MessageFrequency], _: Duration) -> bytes:
+    return raster.line_chart(
+        [frequency.timestamp for frequency in frequencies],
+        [frequency.num_messages for frequency in frequencies],
+        title="Message Frequency",
+        ylabel="Number of messages.",
+    )
+
+
+def _plot(
+    frequencies: list[models.MessageFrequency],
+    duration: Duration,
+    figure: "Figure",
+) -> None:
+    from matplotlib.dates import (
+        AutoDateLocator,
+        ConciseDateFormatter,
+        DayLocator,
+        HourLocator,
+        MinuteLocator,
+    )
+
+    ax = figure.subplots()
 
     # If the there's only one point, use a bar plot, otherwise a line plot
     if len(frequencies) > 1:
@@ -66,8 +96,9 @@ def render(
     ax.set_ylabel("Number of messages.")
     ax.set_title("Message Frequency")
 
-    file_ = io.BytesIO()
-    plt.savefig(file_)
-    file_.seek(0)
 
-    return discord.File(file_, filename="message_frequency.png")
+# Draws the chart with each of the supported libraries. See `settings.CHART_RENDERER`.
+RENDERERS: dict[str, Callable[[list[models.MessageFrequency], Duration], bytes]] = {
+    "matplotlib": _draw,
+    "pillow": _draw_raster,
+}
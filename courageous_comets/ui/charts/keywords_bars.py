@@ -1,11 +1,20 @@
 import io
 from collections import Counter
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING
 
 import discord
-import matplotlib.pyplot as plt
 
+from courageous_comets import settings
+from courageous_comets.ui.charts import raster, rendering
+from courageous_comets.ui.charts.cache import CHART_CACHE
 
-def render(counter: Counter[str]) -> discord.File:
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+async def render(counter: Counter[str]) -> discord.File:
     """
     Render a bar chart of the top given keywords.
 
@@ -14,18 +23,42 @@ def render(counter: Counter[str]) -> discord.File:
     counter: Counter[str]
         The keywords and their counts.
     """
-    keywords, counts = zip(*counter.most_common(10), strict=True)
+    image = await CHART_CACHE.render(RENDERERS[settings.CHART_RENDERER], counter.most_common(10))
+    return discord.File(io.BytesIO(image), "top_keywords.png")
+
+
+def _draw(top_keywords: list[tuple[str, int]]) -> bytes:
+    return rendering.render_png(partial(_plot, top_keywords))
+
 
-    _, ax = plt.subplots()
+def _draw_raster(top_keywords: list[tuple[str, int]]) -> bytes:
+    keywords, counts = zip(*top_keywords, strict=True)
+    return raster.bar_chart(
+        keywords,
+        counts,
+        title="Top keywords",
+        ylabel="Count",
+        rotate_labels=True,
+    )
+
+
+def _plot(top_keywords: list[tuple[str, int]], figure: "Figure") -> None:
+    keywords, counts = zip(*top_keywords, strict=True)
+
+    ax = figure.subplots()
     ax.bar(keywords, counts)
     ax.set_ylabel("Count")
     ax.set_title("Top keywords")
 
     # Rotate the x-axis labels 45 degrees to keep them readable
-    plt.xticks(rotation=45, ha="right")
+    ax.tick_params(axis="x", labelrotation=45)
+
+    for label in ax.get_xticklabels():
+        label.set_horizontalalignment("right")
 
-    file_ = io.BytesIO()
-    plt.savefig(file_)
-    file_.seek(0)
 
-    return discord.File(file_, "top_keywords.png")
+# Draws the chart with each of the supported libraries. See `settings.CHART_RENDERER`.
+RENDERERS: dict[str, Callable[[list[tuple[str, int]]], bytes]] = {
+    "matplotlib": _draw,
+    "pillow": _draw_raster,
+}
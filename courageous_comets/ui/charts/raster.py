@@ -0,0 +1,248 @@
+import datetime
+import io
+import math
+from collections.abc import Callable, Sequence
+
+from PIL import Image, ImageDraw, ImageFont
+
+# Size of the images in pixels, the same as the default size of matplotlib figures
+WIDTH = 640
+HEIGHT = 480
+
+# Space around the plot area for the title, labels and ticks
+MARGIN_LEFT = 80
+MARGIN_RIGHT = 40
+MARGIN_TOP = 50
+MARGIN_BOTTOM = 90
+
+# Colors of the default matplotlib style, so both renderers draw similar charts
+BACKGROUND = "white"
+FOREGROUND = "black"
+GRID = "#e5e5e5"
+DEFAULT_COLOR = "#1f77b4"
+
+FONT = ImageFont.load_default(size=12)
+TITLE_FONT = ImageFont.load_default(size=14)
+
+# Approximate number of ticks on the value axis
+TICK_COUNT = 6
+
+# Number of labelled points on the time axis
+TIME_LABEL_COUNT = 5
+
+
+def bar_chart(  # noqa: PLR0913
+    labels: Sequence[str],
+    values: Sequence[float],
+    *,
+    title: str,
+    ylabel: str,
+    colors: Sequence[str] | None = None,
+    rotate_labels: bool = False,
+) -> bytes:
+    """
+    Draw a bar chart as a PNG image.
+
+    Parameters
+    ----------
+    labels : Sequence[str]
+        The label of each bar.
+    values : Sequence[float]
+        The height of each bar. Must not be negative.
+    title : str
+        The title of the chart.
+    ylabel : str
+        The label of the value axis.
+    colors : Sequence[str] | None
+        The color of each bar. Uses the default color if not given.
+    rotate_labels : bool
+        Whether to rotate the labels 45 degrees to keep long labels readable.
+
+    Returns
+    -------
+    bytes
+        The image.
+    """
+    image = Image.new("RGB", (WIDTH, HEIGHT), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    scale = _draw_value_axis(image, values, title=title, ylabel=ylabel)
+    slot = (WIDTH - MARGIN_LEFT - MARGIN_RIGHT) / len(values)
+
+    for i, (label, value) in enumerate(zip(labels, values, strict=True)):
+        left = MARGIN_LEFT + slot * (i + 0.1)
+        right = MARGIN_LEFT + slot * (i + 0.9)
+        draw.rectangle(
+            (left, scale(value), right, scale(0)),
+            fill=colors[i] if colors else DEFAULT_COLOR,
+        )
+
+        x, y = (left + right) / 2, HEIGHT - MARGIN_BOTTOM + 6
+
+        if rotate_labels:
+            _paste_text(image, label, angle=45, top_right=(x, y))
+        else:
+            draw.text((x, y), label, font=FONT, fill=FOREGROUND, anchor="ma")
+
+    _draw_frame(draw)
+    return _png(image)
+
+
+def line_chart(
+    timestamps: Sequence[datetime.datetime],
+    values: Sequence[float],
+    *,
+    title: str,
+    ylabel: str,
+) -> bytes:
+    """
+    Draw a line chart of values over time as a PNG image.
+
+    A single value is drawn as a bar.
+
+    Parameters
+    ----------
+    timestamps : Sequence[datetime.datetime]
+        The time of each value, in ascending order.
+    values : Sequence[float]
+        The values. Must not be negative.
+    title : str
+        The title of the chart.
+    ylabel : str
+        The label of the value axis.
+
+    Returns
+    -------
+    bytes
+        The image.
+    """
+    start, end = timestamps[0], timestamps[-1]
+    # Show the date for long periods, and the time of day otherwise
+    time_format = "%Y-%m-%d" if end - start > datetime.timedelta(days=2) else "%m-%d %H:%M"
+
+    if len(values) == 1:
+        return bar_chart([start.strftime(time_format)], values, title=title, ylabel=ylabel)
+
+    image = Image.new("RGB", (WIDTH, HEIGHT), BACKGROUND)
+    draw = ImageDraw.Draw(image)
+    scale = _draw_value_axis(image, values, title=title, ylabel=ylabel)
+    width = WIDTH - MARGIN_LEFT - MARGIN_RIGHT
+    span = (end - start).total_seconds()
+
+    def position(timestamp: datetime.datetime) -> float:
+        return MARGIN_LEFT + (timestamp - start).total_seconds() / span * width
+
+    for i in range(TIME_LABEL_COUNT):
+        timestamp = start + (end - start) * i / (TIME_LABEL_COUNT - 1)
+        x = position(timestamp)
+        draw.line((x, HEIGHT - MARGIN_BOTTOM, x, HEIGHT - MARGIN_BOTTOM + 4), fill=FOREGROUND)
+        draw.text(
+            (x, HEIGHT - MARGIN_BOTTOM + 6),
+            timestamp.strftime(time_format),
+            font=FONT,
+            fill=FOREGROUND,
+            anchor="ma",
+        )
+
+    draw.line(
+        [
+            (position(timestamp), scale(value))
+            for timestamp, value in zip(timestamps, values, strict=True)
+        ],
+        fill=DEFAULT_COLOR,
+        width=2,
+        joint="curve",
+    )
+
+    _draw_frame(draw)
+    return _png(image)
+
+
+def ticks(maximum: float) -> list[float]:
+    """
+    Compute the ticks of a value axis from zero to at least `maximum`, at a round interval.
+
+    Parameters
+    ----------
+    maximum : float
+        The largest value on the axis.
+
+    Returns
+    -------
+    list[float]
+        The ticks, in ascending order.
+    """
+    if maximum <= 0:
+        return [0.0, 1.0]
+
+    interval = maximum / (TICK_COUNT - 1)
+    magnitude = 10 ** math.floor(math.log10(interval))
+    step = next(
+        factor * magnitude for factor in (1, 2, 2.5, 5, 10) if factor * magnitude >= interval
+    )
+    count = math.ceil(maximum / step - 1e-9)
+
+    return [round(step * i, 10) for i in range(count + 1)]
+
+
+def _draw_value_axis(
+    image: Image.Image,
+    values: Sequence[float],
+    *,
+    title: str,
+    ylabel: str,
+) -> Callable[[float], float]:
+    """Draw the title, value axis and grid, and return the position of a value on the axis."""
+    draw = ImageDraw.Draw(image)
+    steps = ticks(max(values, default=0))
+    height = HEIGHT - MARGIN_TOP - MARGIN_BOTTOM
+
+    def scale(value: float) -> float:
+        return HEIGHT - MARGIN_BOTTOM - value / steps[-1] * height
+
+    for tick in steps:
+        y = scale(tick)
+        draw.line((MARGIN_LEFT, y, WIDTH - MARGIN_RIGHT, y), fill=GRID)
+        draw.line((MARGIN_LEFT - 4, y, MARGIN_LEFT, y), fill=FOREGROUND)
+        draw.text((MARGIN_LEFT - 6, y), f"{tick:g}", font=FONT, fill=FOREGROUND, anchor="rm")
+
+    draw.text((WIDTH / 2, MARGIN_TOP / 2), title, font=TITLE_FONT, fill=FOREGROUND, anchor="mm")
+    _paste_text(image, ylabel, angle=90, center=(20, MARGIN_TOP + height / 2))
+
+    return scale
+
+
+def _draw_frame(draw: ImageDraw.ImageDraw) -> None:
+    draw.rectangle(
+        (MARGIN_LEFT, MARGIN_TOP, WIDTH - MARGIN_RIGHT, HEIGHT - MARGIN_BOTTOM),
+        outline=FOREGROUND,
+    )
+
+
+def _paste_text(
+    image: Image.Image,
+    text: str,
+    *,
+    angle: float,
+    center: tuple[float, float] | None = None,
+    top_right: tuple[float, float] | None = None,
+) -> None:
+    """Draw rotated text with its center or its top right corner at the given position."""
+    left, top, right, bottom = FONT.getbbox(text)
+    label = Image.new("RGBA", (int(right - left) + 2, int(bottom - top) + 2))
+    ImageDraw.Draw(label).text((1 - left, 1 - top), text, font=FONT, fill=FOREGROUND)
+    label = label.rotate(angle, expand=True, resample=Image.Resampling.BICUBIC)
+
+    if center is not None:
+        x, y = center[0] - label.width / 2, center[1] - label.height / 2
+    elif top_right is not None:
+        x, y = top_right[0] - label.width, top_right[1]
+    else:
+        x, y = 0, 0
+
+    image.paste(label, (round(x), round(y)), label)
+
+
+def _png(image: Image.Image) -> bytes:
+    buffer = io.BytesIO()
+    image.save(buffer, format="PNG")
+    return buffer.getvalue()
@@ -0,0 +1,82 @@
+import asyncio
+import io
+import threading
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+from courageous_comets import settings
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+# Renders charts off the event loop. Each worker thread draws on a figure of its own.
+EXECUTOR = ThreadPoolExecutor(
+    max_workers=settings.CHART_RENDER_CONCURRENCY,
+    thread_name_prefix="charts",
+)
+
+_local = threading.local()
+
+
+def render_png(plot: Callable[["Figure"], None]) -> bytes:
+    """
+    Draw a chart with matplotlib on the figure of the current thread and render it as a PNG image.
+
+    The figure is created once per thread on the Agg backend, without going through `pyplot`,
+    and cleared after every chart so it holds no references to the plotted data. Matplotlib is
+    imported on first use, so it is not loaded if all charts are drawn with Pillow.
+
+    Parameters
+    ----------
+    plot : Callable[[matplotlib.figure.Figure], None]
+        Draws the chart on an empty figure.
+
+    Returns
+    -------
+    bytes
+        The rendered image.
+    """
+    figure: Figure | None = getattr(_local, "figure", None)
+
+    if figure is None:
+        figure = _new_figure()
+        _local.figure = figure
+
+    try:
+        plot(figure)
+        buffer = io.BytesIO()
+        figure.savefig(buffer, format="png")
+        return buffer.getvalue()
+    finally:
+        figure.clear()
+
+
+def _new_figure() -> "Figure":
+    import matplotlib.figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+    result = matplotlib.figure.Figure()
+    FigureCanvasAgg(result)
+    return result
+
+
+async def render(draw: Callable[..., bytes], *args: object) -> bytes:
+    """
+    Draw a chart in the chart worker pool.
+
+    Parameters
+    ----------
+    draw : Callable[..., bytes]
+        Draws the chart from `args` and returns the image.
+    *args : object
+        The input data of the chart.
+
+    Returns
+    -------
+    bytes
+        The rendered image.
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(EXECUTOR, partial(draw, *args))
@@ -1,25 +1,30 @@
 import io
-from pathlib import Path
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING
 
 import discord
-import matplotlib.pyplot as plt
 
-from courageous_comets import models
-from courageous_comets.ui.charts import CACHE_ROOT
+from courageous_comets import models, settings
+from courageous_comets.ui.charts import raster, rendering
+from courageous_comets.ui.charts.cache import CHART_CACHE
 
-CACHE_DIR = CACHE_ROOT / "sentiment_bars"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
 
+LABELS = ["Negative", "Neutral", "Positive"]
+COLORS = ["red", "blue", "green"]
 
-def for_message(
+
+async def for_message(
     message_id: str | int,
     data: models.SentimentResult,
 ) -> discord.File:
     """
     Plot the sentiment analysis of a message.
 
-    Creates a bar chart of the sentiment analysis of a message and saves it to a file.
-    If the file already exists, it will be returned instead of being recreated.
+    Creates a bar chart of the sentiment analysis of a message. Charts are cached by their data,
+    so the chart is only rendered again when the sentiment of the message changes.
 
     Parameters
     ----------
@@ -31,27 +36,17 @@ def for_message(
     Returns
     -------
     discord.File
-        The file containing the saved image.
-
-    Notes
-    -----
-    Charts are cached in the `CACHE_DIR` directory using the message id as the filename.
+        The file containing the image.
     """
-    chart_path = CACHE_DIR / f"{message_id}.png"
-
-    if chart_path.exists():
-        return discord.File(chart_path, filename=f"{message_id}.png")
-
-    _plot(data, chart_path)
+    image = await _render(data)
+    return discord.File(io.BytesIO(image), filename=f"{message_id}.png")
 
-    return discord.File(chart_path, filename=f"{message_id}.png")
 
-
-def for_user(data: models.SentimentResult) -> discord.File:
+async def for_user(data: models.SentimentResult) -> discord.File:
     """
     Plot the sentiment analysis of a user.
 
-    Creates a bar chart of the sentiment analysis of a user and saves it to a temporary file.
+    Creates a bar chart of the sentiment analysis of a user.
 
     Parameters
     ----------
@@ -61,35 +56,39 @@ def for_user(data: models.SentimentResult) -> discord.File:
     Returns
     -------
     discord.File
-        The file containing the saved image.
+        The file containing the image.
     """
-    file_ = io.BytesIO()
-    _plot(data, file_)
-    file_.seek(0)
-
-    return discord.File(file_, filename="user_sentiment.png")
-
-
-def _plot(data: models.SentimentResult, target: Path | io.BytesIO) -> None:
-    _, ax = plt.subplots()
-    ax.bar(
-        [
-            "Negative",
-            "Neutral",
-            "Positive",
-        ],
-        [
-            data.neg,
-            data.neu,
-            data.pos,
-        ],
-        color=[
-            "red",
-            "blue",
-            "green",
-        ],
+    image = await _render(data)
+    return discord.File(io.BytesIO(image), filename="user_sentiment.png")
+
+
+async def _render(data: models.SentimentResult) -> bytes:
+    return await CHART_CACHE.render(RENDERERS[settings.CHART_RENDERER], data)
+
+
+def _draw(data: models.SentimentResult) -> bytes:
+    return rendering.render_png(partial(_plot, data))
+
+
+def _draw_raster(data: models.SentimentResult) -> bytes:
+    return raster.bar_chart(
+        LABELS,
+        [data.neg, data.neu, data.pos],
+        title="Sentiment Analysis",
+        ylabel="Sentiment Score",
+        colors=COLORS,
     )
+
+
+def _plot(data: models.SentimentResult, figure: "Figure") -> None:
+    ax = figure.subplots()
+    ax.bar(LABELS, [data.neg, data.neu, data.pos], color=COLORS)
     ax.set_ylabel("Sentiment Score")
     ax.set_title("Sentiment Analysis")
 
-    plt.savefig(target)
+
+# Draws the chart with each of the supported libraries. See `settings.CHART_RENDERER`.
+RENDERERS: dict[str, Callable[[models.SentimentResult], bytes]] = {
+    "matplotlib": _draw,
+    "pillow": _draw_raster,
+}
@@ -1,5 +1,7 @@
 import discord
 
+from courageous_comets import models
+
 TEMPLATE = """
 {channel} {author} {timestamp}:
 {content}
@@ -13,20 +15,30 @@ def _shorten(string: str, *, limit: int = 200) -> str:
     return string
 
 
-def render(message: discord.Message) -> str:
+def render(message: discord.Message | models.Message) -> str:
     """
     Format a message into a string.
 
     Parameters
     ----------
-    message : discord.Message
-        The message to format.
+    message : discord.Message | courageous_comets.models.Message
+        The message to format. A stored message is rendered from its snippet.
 
     Returns
     -------
     str
         The formatted string.
     """
+    if isinstance(message, models.Message):
+        return TEMPLATE.format_map(
+            {
+                "channel": f"<#{message.channel_id}>",
+                "author": f"<@{message.user_id}>",
+                "timestamp": discord.utils.format_dt(message.timestamp, style="R"),
+                "content": _shorten(message.snippet or ""),
+            },
+        )
+
     channel = (
         f"{message.channel.mention}"
         if isinstance(message.channel, discord.abc.GuildChannel)
@@ -1,15 +1,16 @@
 import discord
 
+from courageous_comets import models
 from courageous_comets.ui.components import message
 
 
-def render(messages: list[discord.Message]) -> str:
+def render(messages: list[discord.Message | models.Message]) -> str:
     """
     Format a list of messages into a string.
 
     Parameters
     ----------
-    messages : list[discord.Message]
+    messages : list[discord.Message | courageous_comets.models.Message]
         The messages to format.
 
     Returns
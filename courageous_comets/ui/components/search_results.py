@@ -1,5 +1,6 @@
 import discord
 
+from courageous_comets import models
 from courageous_comets.ui.components import message_list
 
 TEMPLATE = """
@@ -11,7 +12,7 @@ You searched for: `{query}`
 """
 
 
-def render(query: str, messages: list[discord.Message]) -> str:
+def render(query: str, messages: list[discord.Message | models.Message]) -> str:
     """
     Render a list of messages into search results.
 
@@ -19,7 +20,7 @@ def render(query: str, messages: list[discord.Message]) -> str:
     ----------
     query : str
         The query used to find the messages.
-    messages : list[discord.Message]
+    messages : list[discord.Message | courageous_comets.models.Message]
         The messages to render.
 
     Returns
@@ -1,10 +1,11 @@
 import discord
 
+from courageous_comets import models
 from courageous_comets.ui.components import search_results
 from courageous_comets.ui.embeds import format_embed
 
 
-def render(query: str, messages: list[discord.Message]) -> discord.Embed:
+def render(query: str, messages: list[discord.Message | models.Message]) -> discord.Embed:
     """
     Render a list of messages into an embed.
 
@@ -12,7 +13,7 @@ def render(query: str, messages: list[discord.Message]) -> discord.Embed:
     ----------
     query : str
         The query used to find the messages.
-    messages : list[discord.Message]
+    messages : list[discord.Message | courageous_comets.models.Message]
         The messages to render.
 
     Returns
@@ -0,0 +1,125 @@
+import logging
+
+import discord
+
+from courageous_comets import models, settings
+from courageous_comets.client import CourageousCometsBot
+from courageous_comets.discord.messages import resolve_messages
+from courageous_comets.redis import RedisClient
+from courageous_comets.redis.search import get_search_page
+from courageous_comets.ui.embeds import search_results
+
+logger = logging.getLogger(__name__)
+
+
+class SearchResultsView(discord.ui.View):
+    """
+    A view for paging through search results.
+
+    Pages are read from the search results stored on Redis, so changing pages does not run the
+    search again.
+
+    Attributes
+    ----------
+    redis : courageous_comets.redis.RedisClient
+        The Redis connection that holds the search results.
+    guild_id : str
+        The ID of the guild the search was made in.
+    query : str
+        The query used to find the messages.
+    page : courageous_comets.models.SearchPage
+        The page that is currently shown.
+    """
+
+    def __init__(
+        self,
+        redis: RedisClient,
+        *,
+        guild_id: str,
+        query: str,
+        page: models.SearchPage,
+    ) -> None:
+        super().__init__(timeout=settings.SEARCH_CURSOR_TTL)
+        self.redis = redis
+        self.guild_id = guild_id
+        self.query = query
+        self.page = page
+        self._update_buttons()
+
+    async def render(self, client: discord.Client) -> discord.Embed:
+        """
+        Render the current page of search results.
+
+        Messages that no longer exist on Discord are removed from the index, if the client is the
+        bot.
+
+        Parameters
+        ----------
+        client : discord.Client
+            The discord client to use to fetch the messages.
+
+        Returns
+        -------
+        discord.Embed
+            The rendered embed.
+        """
+        on_not_found = client.prune_messages if isinstance(client, CourageousCometsBot) else None
+        messages = await resolve_messages(
+            client,
+            self.page.messages,
+            redis=self.redis,
+            on_not_found=on_not_found,
+        )
+        embed = search_results.render(self.query, messages)
+
+        if self.page.page_count > 1:
+            embed.add_field(name="Page", value=f"{self.page.page + 1}/{self.page.page_count}")
+
+        return embed
+
+    @discord.ui.button(label="Previous", emoji="⬅️", style=discord.ButtonStyle.secondary)
+    async def previous_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        """Show the previous page of search results."""
+        await self._show_page(interaction, self.page.page - 1)
+
+    @discord.ui.button(label="Next", emoji="➡️", style=discord.ButtonStyle.secondary)
+    async def next_page(
+        self,
+        interaction: discord.Interaction,
+        _: discord.ui.Button,
+    ) -> None:
+        """Show the next page of search results."""
+        await self._show_page(interaction, self.page.page + 1)
+
+    async def _show_page(self, interaction: discord.Interaction, page: int) -> None:
+        result = await get_search_page(
+            self.redis,
+            guild_id=self.guild_id,
+            cursor_id=self.page.cursor_id,
+            page=page,
+        )
+
+        if result is None:
+            logger.debug("Search results %s expired for %s.", self.page.cursor_id, interaction.id)
+            self.stop()
+            await interaction.response.edit_message(
+                content="These search results have expired. Please search again.",
+                embed=None,
+                view=None,
+            )
+            return
+
+        self.page = result
+        self._update_buttons()
+
+        await interaction.response.defer()
+        embed = await self.render(interaction.client)
+        await interaction.edit_original_response(embed=embed, view=self)
+
+    def _update_buttons(self) -> None:
+        self.previous_page.disabled = self.page.page <= 0
+        self.next_page.disabled = self.page.page >= self.page.page_count - 1
@@ -1,4 +1,11 @@
 import asyncio
+import logging
+import os
+import threading
+import time
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
 
 import numpy as np
 import torch
@@ -7,6 +14,92 @@ from torch import Tensor
 from transformers import AutoModel, AutoTokenizer
 
 from courageous_comets import settings
+from courageous_comets.manifest import verify_manifest, write_manifest
+
+logger = logging.getLogger(__name__)
+
+
+def intra_op_threads() -> int:
+    """
+    Get the number of intra-op threads to use for torch.
+
+    Returns
+    -------
+    int
+        `TORCH_NUM_THREADS` if set, otherwise the number of cores divided over the workers of the
+        vectorizer.
+    """
+    if settings.TORCH_NUM_THREADS > 0:
+        return settings.TORCH_NUM_THREADS
+
+    return max(1, (os.cpu_count() or 1) // settings.VECTORIZER_CONCURRENCY)
+
+
+def create_executor(num_threads: int) -> ThreadPoolExecutor:
+    """
+    Create a pool of workers to encode messages with.
+
+    Torch keeps the number of intra-op threads of a thread from its first operation, so every
+    worker sets it before it encodes its first message.
+
+    Parameters
+    ----------
+    num_threads : int
+        The number of intra-op threads of each worker.
+
+    Returns
+    -------
+    concurrent.futures.ThreadPoolExecutor
+        The pool of workers.
+    """
+    return ThreadPoolExecutor(
+        max_workers=settings.VECTORIZER_CONCURRENCY,
+        thread_name_prefix="vectorizer",
+        initializer=torch.set_num_threads,
+        initargs=(num_threads,),
+    )
+
+
+def run_on_each_worker(executor: ThreadPoolExecutor, function: Callable[[], object]) -> None:
+    """
+    Run a function once on every worker of the vectorizer.
+
+    Parameters
+    ----------
+    executor : concurrent.futures.ThreadPoolExecutor
+        The pool of workers, as created by `create_executor`.
+    function : Callable[[], object]
+        The function to run.
+    """
+    workers = settings.VECTORIZER_CONCURRENCY
+    # Keep every worker busy until all have started, so that no worker runs the function twice
+    barrier = threading.Barrier(workers)
+
+    def run(_: int) -> None:
+        barrier.wait()
+        function()
+
+    list(executor.map(run, range(workers)))
+
+
+# Encodes messages off the event loop. Each encode is split over the intra-op threads of torch, so
+# the number of workers times the number of intra-op threads should not exceed the number of cores.
+EXECUTOR = create_executor(intra_op_threads())
+
+# Text to build representative messages from for warmup and autotuning
+SAMPLE_TEXT = (
+    "just finished setting up the new server and everything seems to work great so far, "
+    "let me know if you run into any issues with the bot or the channels "
+)
+
+# Lengths in characters of the warmup messages, from a short reply to a truncated long message
+WARMUP_LENGTHS = (16, 64, settings.PREPROCESSING_MESSAGE_TRUNCATE_LENGTH)
+
+# Number of times to encode each warmup message
+WARMUP_ROUNDS = 3
+
+# Number of messages to encode per configuration when autotuning
+AUTOTUNE_MESSAGES = 32
 
 
 class Vectorizer:
@@ -23,18 +116,25 @@ class Vectorizer:
         The Hugging Face sentence tokenizer
     model: transformers.AutoModel
         The sentence transformer
+
+    Parameters
+    ----------
+    local_files_only : bool
+        Whether to load the model from `HF_HOME` only, without checking for updates online.
     """
 
     TRANSFORMER_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
 
-    def __init__(self) -> None:
+    def __init__(self, *, local_files_only: bool = False) -> None:
         self.tokenizer = AutoTokenizer.from_pretrained(
             Vectorizer.TRANSFORMER_MODEL_NAME,
             cache_dir=settings.HF_HOME,
+            local_files_only=local_files_only,
         )
         self.model = AutoModel.from_pretrained(
             Vectorizer.TRANSFORMER_MODEL_NAME,
             cache_dir=settings.HF_HOME,
+            local_files_only=local_files_only,
         )
 
     def encode(self, message: str) -> bytes:
@@ -102,4 +202,132 @@ class Vectorizer:
 
     async def aencode(self, message: str) -> bytes:
         """Create a vector embedding of message asynchronously."""
-        return await asyncio.to_thread(self.encode, message)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(EXECUTOR, self.encode, message)
+
+    def warmup(self) -> None:
+        """
+        Encode messages of representative lengths on every worker.
+
+        The first encodes for each input shape are several times slower than later ones, since
+        torch allocates buffers and selects kernels on first use in every thread. Warming up moves
+        this cost to startup, before the model is used for real messages.
+        """
+        start = time.perf_counter()
+        run_on_each_worker(EXECUTOR, self._warmup_worker)
+        logger.debug("Warmed up the vectorizer in %.2fs", time.perf_counter() - start)
+
+    def _warmup_worker(self) -> None:
+        for length in WARMUP_LENGTHS:
+            for _ in range(WARMUP_ROUNDS):
+                self.encode(_sample(length))
+
+    def autotune(self, candidates: Iterable[int]) -> int:
+        """
+        Use the number of intra-op threads that encodes messages the fastest on this host.
+
+        Every candidate encodes a batch of representative messages on a new pool of workers, like
+        the bot does under load. The workers of the vectorizer are then replaced by workers with
+        the fastest number of threads.
+
+        Parameters
+        ----------
+        candidates : Iterable[int]
+            The numbers of intra-op threads to try.
+
+        Returns
+        -------
+        int
+            The number of intra-op threads that was selected.
+        """
+        global EXECUTOR  # noqa: PLW0603
+
+        messages = [
+            _sample(WARMUP_LENGTHS[i % len(WARMUP_LENGTHS)]) for i in range(AUTOTUNE_MESSAGES)
+        ]
+        timings: dict[int, float] = {}
+
+        for num_threads in candidates:
+            with create_executor(num_threads) as executor:
+                # Warm up the thread pools of torch for this configuration
+                run_on_each_worker(executor, lambda: self.encode(messages[0]))
+
+                start = time.perf_counter()
+                list(executor.map(self.encode, messages))
+                timings[num_threads] = time.perf_counter() - start
+
+            logger.debug(
+                "Encoded %s messages with %s intra-op threads in %.3fs",
+                len(messages),
+                num_threads,
+                timings[num_threads],
+            )
+
+        result = min(timings, key=timings.__getitem__)
+        EXECUTOR.shutdown(wait=False)
+        EXECUTOR = create_executor(result)
+
+        logger.info("Autotuned the vectorizer to %s intra-op threads", result)
+        return result
+
+
+def _sample(length: int) -> str:
+    """Create a representative message of the given number of characters."""
+    repeats = length // len(SAMPLE_TEXT) + 1
+    return (SAMPLE_TEXT * repeats)[:length]
+
+
+def configure_threads() -> None:
+    """
+    Set the number of threads torch uses within and across operations.
+
+    Must be called before the model is used, since torch fixes the number of inter-op threads on
+    first use.
+    """
+    torch.set_num_threads(intra_op_threads())
+
+    if settings.TORCH_INTEROP_THREADS > 0:
+        try:
+            torch.set_num_interop_threads(settings.TORCH_INTEROP_THREADS)
+        except RuntimeError:
+            logger.warning("Could not set the number of inter-op threads, since torch is in use")
+
+    logger.debug(
+        "Torch uses %s intra-op and %s inter-op threads",
+        torch.get_num_threads(),
+        torch.get_num_interop_threads(),
+    )
+
+
+def load_vectorizer() -> Vectorizer:
+    """
+    Load the vectorizer and prepare it for use.
+
+    Configures the threads of torch, then loads the model from the local files if they match the
+    manifest of `HF_HOME` and downloads it otherwise. Finally, autotunes the number of intra-op
+    threads if `VECTORIZER_AUTOTUNE` is set, and warms up the model. This blocks for several
+    seconds, so call it in a worker thread.
+
+    Returns
+    -------
+    Vectorizer
+        The vectorizer, ready to encode messages.
+    """
+    configure_threads()
+
+    # Skip the online checks of the model if it was downloaded before, for example at image build
+    directory = Path(settings.HF_HOME)
+    local = verify_manifest(directory, [Vectorizer.TRANSFORMER_MODEL_NAME])
+    vectorizer = Vectorizer(local_files_only=local)
+
+    if not local:
+        write_manifest(directory, [Vectorizer.TRANSFORMER_MODEL_NAME])
+
+    if settings.VECTORIZER_AUTOTUNE:
+        cores = os.cpu_count() or 1
+        candidates = {2**i for i in range(cores.bit_length()) if 2**i <= cores}
+        vectorizer.autotune(sorted(candidates | {intra_op_threads()}))
+
+    vectorizer.warmup()
+
+    return vectorizer
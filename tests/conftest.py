@@ -5,6 +5,7 @@ import yaml
 
 from courageous_comets import settings
 from courageous_comets.nltk import init_nltk
+from courageous_comets.redis.cache import QUERY_CACHE
 from courageous_comets.redis.schema import MESSAGE_SCHEMA
 from courageous_comets.transformers import init_transformers
 from courageous_comets.vectorizer import Vectorizer
@@ -50,6 +51,12 @@ def _patch_redis_keys_prefix(monkeypatch: pytest.MonkeyPatch) -> None:
     )
 
 
+@pytest.fixture(autouse=True)
+def _clear_query_cache() -> None:
+    """Clear cached query results, since the data they are based on is reset between tests."""
+    QUERY_CACHE.clear()
+
+
 @pytest.fixture(scope="session")
 def vectorizer() -> Vectorizer:
     """Set up the vectorizer for encoding messages."""
@@ -0,0 +1,34 @@
+from pytest_mock import MockerFixture
+from redis.asyncio import Redis
+
+from courageous_comets.redis.cache import cached_query
+
+
+async def test__cached_query_reuses_result_within_generation(mocker: MockerFixture) -> None:
+    """
+    Test whether a query is only executed again after the generation of the guild changes.
+
+    Asserts
+    -------
+    - Repeated calls with the same arguments execute the query once.
+    - Calls with different arguments execute the query again.
+    - A new generation of the guild executes the query again.
+    """
+    redis = mocker.AsyncMock(spec=Redis)
+    redis.get = mocker.AsyncMock(return_value="1")
+    query = mocker.AsyncMock(return_value=["result"])
+
+    @cached_query
+    async def get_something(redis: Redis, *, guild_id: str, ids: list[str] | None = None) -> list:
+        return await query(redis, guild_id=guild_id, ids=ids)
+
+    assert await get_something(redis, guild_id="1", ids=["2"]) == ["result"]
+    assert await get_something(redis, guild_id="1", ids=["2"]) == ["result"]
+    assert query.await_count == 1
+
+    await get_something(redis, guild_id="1", ids=["3"])
+    assert query.await_count == 2
+
+    redis.get.return_value = "2"
+    await get_something(redis, guild_id="1", ids=["2"])
+    assert query.await_count == 3
@@ -0,0 +1,99 @@
+import pytest
+
+from courageous_comets.caching import CacheStats, InstrumentedTTLCache, TwoTierCache
+
+
+def test__stats_count_hits_and_misses() -> None:
+    """
+    Test whether lookups are counted as hits or misses.
+
+    Asserts
+    -------
+    - A lookup of a cached value is a hit.
+    - A lookup of a missing value is a miss.
+    """
+    cache = InstrumentedTTLCache[str, int](maxsize=2, ttl=60)
+    cache["a"] = 1
+
+    assert cache["a"] == 1
+    assert cache.get("b") is None
+
+    assert cache.stats == CacheStats(hits=1, misses=1, evictions=0, size=1)
+
+
+def test__stats_count_evictions() -> None:
+    """
+    Test whether the least recently used value is evicted when the cache is full.
+
+    Asserts
+    -------
+    - The least recently used value is evicted.
+    - The eviction is not counted as a lookup.
+    """
+    cache = InstrumentedTTLCache[str, int](maxsize=2, ttl=60)
+    cache["a"] = 1
+    cache["b"] = 2
+    cache["c"] = 3
+
+    assert "a" not in cache
+    assert cache.stats == CacheStats(hits=0, misses=0, evictions=1, size=2)
+
+
+def test__hit_rate_without_lookups() -> None:
+    """
+    Test whether the hit rate of an unused cache is zero.
+
+    Asserts
+    -------
+    - The hit rate is 0.
+    """
+    assert CacheStats(hits=0, misses=0, evictions=0, size=0).hit_rate == 0
+
+
+def test__two_tier_cache_keeps_empty_results_apart() -> None:
+    """
+    Test whether empty results are stored in the negative tier.
+
+    Asserts
+    -------
+    - An empty result is found in the negative tier only.
+    - Storing a value for the key removes the empty result.
+    - Lookups of either tier count as hits in the combined stats.
+    """
+    cache = TwoTierCache[str, int](maxsize=2, ttl=60, negative_ttl=1)
+    cache["a"] = None
+
+    assert cache["a"] is None
+    assert "a" in cache.negative
+    assert "a" not in cache.positive
+
+    cache["a"] = 1
+
+    assert cache["a"] == 1
+    assert "a" not in cache.negative
+    assert cache.stats == CacheStats(hits=2, misses=0, evictions=0, size=1)
+
+
+def test__two_tier_cache_discard_removes_both_tiers() -> None:
+    """
+    Test whether discarding a key invalidates it in both tiers.
+
+    Asserts
+    -------
+    - The key is no longer in the cache.
+    - A lookup of the key is a miss.
+    """
+    cache = TwoTierCache[str, int](maxsize=2, ttl=60, negative_ttl=1)
+    cache["a"] = 1
+    cache["b"] = None
+
+    cache.discard("a")
+    cache.discard("b")
+
+    assert "a" not in cache
+    assert "b" not in cache
+
+    with pytest.raises(KeyError):
+        cache["a"]
+
+    assert cache.stats == CacheStats(hits=0, misses=1, evictions=0, size=0)
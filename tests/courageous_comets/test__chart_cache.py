@@ -0,0 +1,131 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from pytest_mock import MockerFixture
+
+from courageous_comets.ui.charts import cache as cache_module
+from courageous_comets.ui.charts import raster
+from courageous_comets.ui.charts.cache import ChartCache, chart_key
+
+
+def _draw(values: list[int]) -> bytes:
+    return raster.bar_chart([str(value) for value in values], values, title="Test", ylabel="Value")
+
+
+async def test__charts_are_addressed_by_content(tmp_path: Path) -> None:
+    """
+    Test whether charts are cached by their input data.
+
+    Asserts
+    -------
+    - The same data gives the cached chart.
+    - Different data gives a new chart.
+    """
+    cache = ChartCache(tmp_path, max_bytes=1024 * 1024, redis_ttl=0)
+
+    image = await cache.render(_draw, [1, 2])
+
+    assert (tmp_path / f"{chart_key(_draw, [1, 2])}.png").read_bytes() == image
+    assert await cache.render(_draw, [1, 2]) == image
+    assert await cache.render(_draw, [2, 1]) != image
+    assert len(list(tmp_path.glob("*.png"))) == 2
+
+
+async def test__least_recently_used_charts_are_evicted(tmp_path: Path) -> None:
+    """
+    Test whether the least recently used chart is deleted when the cache is full.
+
+    Asserts
+    -------
+    - The chart that was used least recently is deleted.
+    - The charts that were used recently are kept.
+    """
+    first = await ChartCache(tmp_path, max_bytes=1024 * 1024, redis_ttl=0).render(_draw, [1])
+    cache = ChartCache(tmp_path, max_bytes=len(first) * 2 + 1024, redis_ttl=0)
+
+    await cache.render(_draw, [2])
+    await cache.render(_draw, [1])
+    await cache.render(_draw, [3])
+
+    assert (tmp_path / f"{chart_key(_draw, [1])}.png").exists()
+    assert not (tmp_path / f"{chart_key(_draw, [2])}.png").exists()
+    assert (tmp_path / f"{chart_key(_draw, [3])}.png").exists()
+
+
+async def test__legacy_charts_are_deleted(tmp_path: Path) -> None:
+    """
+    Test whether charts cached by an earlier version of the cache are deleted on first use.
+
+    Asserts
+    -------
+    - The directory of the earlier version is deleted.
+    - Charts in the current layout are kept.
+    """
+    legacy = tmp_path / "sentiment_bars"
+    legacy.mkdir()
+    (legacy / "1.png").write_bytes(b"")
+    cache = ChartCache(tmp_path, max_bytes=1024 * 1024, redis_ttl=0)
+
+    image = await cache.render(_draw, [1])
+
+    assert not legacy.exists()
+    assert (tmp_path / f"{chart_key(_draw, [1])}.png").read_bytes() == image
+
+
+async def test__files_are_accessed_in_worker_threads(
+    tmp_path: Path,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether the cache reads and writes its files outside of the event loop.
+
+    Asserts
+    -------
+    - The directory is scanned, and charts are written and read, in worker threads.
+    """
+    to_thread = mocker.spy(asyncio, "to_thread")
+    cache = ChartCache(tmp_path, max_bytes=1024 * 1024, redis_ttl=0)
+
+    await cache.render(_draw, [1])
+    await cache.render(_draw, [1])
+
+    functions = [call.args[0] for call in to_thread.call_args_list]
+    assert {cache_module._scan, cache_module._write_atomic} <= set(functions)  # noqa: SLF001
+    assert cache_module._read_and_touch in functions  # noqa: SLF001
+
+
+async def test__disk_errors_do_not_fail_the_render(tmp_path: Path, mocker: MockerFixture) -> None:
+    """
+    Test whether a chart is still returned if it cannot be written to the disk.
+
+    Asserts
+    -------
+    - The rendered chart is returned.
+    - No chart or temporary file is left in the directory.
+    """
+    mocker.patch.object(Path, "replace", side_effect=OSError(28, "No space left on device"))
+    cache = ChartCache(tmp_path, max_bytes=1024 * 1024, redis_ttl=0)
+
+    image = await cache.render(_draw, [1])
+
+    assert image.startswith(b"\x89PNG")
+    assert list(tmp_path.iterdir()) == []
+
+
+def test__concurrent_writes_use_their_own_temporary_file(tmp_path: Path) -> None:
+    """
+    Test whether every write of a chart goes through a temporary file of its own.
+
+    Asserts
+    -------
+    - Concurrent writes of the same chart all succeed.
+    - No temporary files are left in the directory.
+    """
+    path = tmp_path / "chart.png"
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: cache_module._write_atomic(path, b"image"), range(64)))  # noqa: SLF001
+
+    assert path.read_bytes() == b"image"
+    assert list(tmp_path.iterdir()) == [path]
@@ -1,3 +1,4 @@
+import asyncio
 from typing import Self
 
 import discord
@@ -59,6 +60,58 @@ async def test__on_ready_logs_message(bot: CourageousCometsBot, mocker: MockerFi
     logger_info.assert_called_with("Logged in as %s", mocker.ANY)
 
 
+async def test__wait_for_vectorizer_waits_until_it_is_loaded(
+    bot: CourageousCometsBot,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether work that needs the vectorizer waits until it is loaded.
+
+    Asserts
+    -------
+    - The vectorizer is not available before it is loaded.
+    - Waiting for the vectorizer returns it once it is loaded.
+    """
+    vectorizer = mocker.Mock()
+    mocker.patch("courageous_comets.vectorizer.load_vectorizer", return_value=vectorizer)
+
+    waiter = asyncio.create_task(bot.wait_for_vectorizer())
+    await asyncio.sleep(0)
+
+    assert bot.vectorizer is None
+    assert not waiter.done()
+
+    await bot._load_vectorizer()  # noqa: SLF001
+
+    assert await waiter is vectorizer
+
+
+@pytest.mark.parametrize(
+    "error",
+    [OSError("No model"), RuntimeError("Out of memory"), ValueError("Invalid config")],
+)
+async def test__vectorizer_load_failure_closes_the_bot(
+    bot: CourageousCometsBot,
+    mocker: MockerFixture,
+    error: Exception,
+) -> None:
+    """
+    Test whether the bot shuts down if the vectorizer cannot be loaded, whatever the error.
+
+    Asserts
+    -------
+    - The bot is closed.
+    - The vectorizer is not marked as ready.
+    """
+    mocker.patch("courageous_comets.vectorizer.load_vectorizer", side_effect=error)
+    close = mocker.patch.object(bot, "close")
+
+    await bot._load_vectorizer()  # noqa: SLF001
+
+    close.assert_awaited_once()
+    assert not bot.vectorizer_ready.is_set()
+
+
 async def test__load_cogs_loads_all_cogs(bot: CourageousCometsBot, mocker: MockerFixture) -> None:
     """
     Test whether the load_cogs function loads all cogs from the config file.
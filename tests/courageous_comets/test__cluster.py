@@ -0,0 +1,93 @@
+import pytest
+from pytest_mock import MockerFixture
+from redis.asyncio import Redis
+from redis.commands.search.document import Document
+from redisvl.query import VectorQuery
+
+from courageous_comets.redis import messages
+from courageous_comets.redis.cluster import fan_out, get_shard, get_shards
+
+
+@pytest.fixture()
+def redis(mocker: MockerFixture) -> Redis:
+    """Create a mock standalone Redis instance for testing."""
+    return mocker.MagicMock(spec=Redis)
+
+
+def test__get_shard_returns_standalone_instance(redis: Redis) -> None:
+    """
+    Test whether a standalone Redis instance is used as the shard for any guild.
+
+    Asserts
+    -------
+    - The given Redis instance is returned.
+    """
+    assert get_shard(redis, "1") is redis
+
+
+def test__get_shards_returns_standalone_instance(redis: Redis) -> None:
+    """
+    Test whether a standalone Redis instance is the only shard.
+
+    Asserts
+    -------
+    - Only the given Redis instance is returned.
+    """
+    assert get_shards(redis) == [redis]
+
+
+async def test__fan_out_merges_top_results(mocker: MockerFixture) -> None:
+    """
+    Test whether the results of multiple shards are merged in order and limited.
+
+    Asserts
+    -------
+    - The merged results are ordered and contain at most `limit` items.
+    """
+    shards = [mocker.MagicMock(spec=Redis), mocker.MagicMock(spec=Redis)]
+    results = {id(shards[0]): [9, 5, 1], id(shards[1]): [8, 7, 2]}
+
+    async def query(shard: Redis) -> list[int]:
+        return results[id(shard)]
+
+    merged = await fan_out(shards, query, key=lambda value: value, limit=4, reverse=True)
+
+    assert merged == [9, 8, 7, 5]
+
+
+async def test__vector_results_are_merged_by_distance(mocker: MockerFixture) -> None:
+    """
+    Test whether the nearest neighbours of multiple shards are merged by their distance.
+
+    Asserts
+    -------
+    - The closest messages of all shards are returned, closest first, even if they are older.
+    """
+    shards = [mocker.MagicMock(spec=Redis), mocker.MagicMock(spec=Redis)]
+    mocker.patch.object(messages, "get_shards", return_value=shards)
+
+    def document(message_id: int, timestamp: int, distance: float) -> Document:
+        return Document(
+            f"message:{message_id}",
+            message_id=str(message_id),
+            user_id="1",
+            channel_id="1",
+            guild_id="1",
+            timestamp=str(timestamp),
+            vector_distance=str(distance),
+        )
+
+    results = {
+        id(shards[0]): [document(1, 100, 0.1), document(2, 400, 0.5)],
+        id(shards[1]): [document(3, 200, 0.2), document(4, 300, 0.3)],
+    }
+
+    async def search_shard(shard: Redis, *_: object) -> list[Document]:
+        return results[id(shard)]
+
+    mocker.patch.object(messages, "_search_shard", side_effect=search_shard)
+    query = VectorQuery(vector=[0.0], vector_field_name="embedding", num_results=3)
+
+    found = await messages._get_messages_from_query(shards[0], query, guild_id=None, limit=3)  # noqa: SLF001
+
+    assert [message.message_id for message in found] == ["1", "3", "4"]
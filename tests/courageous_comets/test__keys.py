@@ -0,0 +1,59 @@
+import pytest
+
+from courageous_comets import settings
+from courageous_comets.redis.keys import hash_tag, key_schema
+
+
+def test__hash_tag_wraps_guild_id_in_braces() -> None:
+    """
+    Test whether the hash tag of a guild wraps the guild ID in braces.
+
+    Asserts
+    -------
+    - The guild ID is wrapped in braces.
+    """
+    assert hash_tag(1) == "{1}"
+
+
+def test__guild_messages_key_contains_guild_hash_tag(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test whether message keys contain the hash tag of their guild on a Redis Cluster.
+
+    Asserts
+    -------
+    - The key is prefixed and the guild ID is wrapped in a hash tag.
+    """
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", True)
+    key = key_schema.guild_messages(guild_id=1, message_id=2)
+    assert key == f"{settings.REDIS_KEYS_PREFIX}:messages:{{1}}:2"
+
+
+def test__guild_message_tokens_key_contains_guild_hash_tag(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test whether message token keys contain the hash tag of their guild on a Redis Cluster.
+
+    Asserts
+    -------
+    - The key is prefixed and the guild ID is wrapped in a hash tag.
+    """
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", True)
+    key = key_schema.guild_message_tokens(1)
+    assert key == f"{settings.REDIS_KEYS_PREFIX}:messages:tokens:{{1}}"
+
+
+def test__keys_keep_plain_guild_id_without_cluster(monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test whether keys keep the original layout when not connected to a Redis Cluster.
+
+    Asserts
+    -------
+    - The guild ID is not wrapped in a hash tag, so existing data is still found.
+    """
+    monkeypatch.setattr(settings, "REDIS_CLUSTER", False)
+
+    assert key_schema.guild_messages(guild_id=1, message_id=2) == (
+        f"{settings.REDIS_KEYS_PREFIX}:messages:1:2"
+    )
+    assert key_schema.guild_message_tokens(1) == f"{settings.REDIS_KEYS_PREFIX}:messages:tokens:1"
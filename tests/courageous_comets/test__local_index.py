@@ -0,0 +1,257 @@
+import asyncio
+import datetime
+from collections.abc import AsyncGenerator
+from pathlib import Path
+
+import numpy as np
+import pytest
+from pytest_mock import MockerFixture
+
+from courageous_comets import local_index, models
+from courageous_comets.enums import StatisticScope
+from courageous_comets.local_index import DIMS, GuildVectorIndex, LocalSearch
+from courageous_comets.snapshots import load_snapshot
+
+
+@pytest.fixture()
+def vectors() -> np.ndarray:
+    """Create normalized random embedding vectors for testing."""
+    rng = np.random.default_rng(42)
+    result = rng.normal(size=(20, DIMS)).astype(np.float32)
+    return result / np.linalg.norm(result, axis=1, keepdims=True)
+
+
+@pytest.fixture()
+def index(vectors: np.ndarray) -> GuildVectorIndex:
+    """Create an index of messages spread over two channels and two users for testing."""
+    result = GuildVectorIndex("1", capacity=4)
+    now = datetime.datetime.now(datetime.UTC).timestamp()
+
+    for i, vector in enumerate(vectors):
+        result.add(
+            message_id=i,
+            channel_id=i % 2,
+            user_id=i % 2 + 10,
+            timestamp=now - i * 60,
+            sentiment=-1 + i / 10,
+            embedding=vector.tobytes(),
+        )
+
+    return result
+
+
+def _ids(messages: list[models.Message]) -> list[int]:
+    return [int(message.message_id) for message in messages]
+
+
+def test__search_returns_exact_nearest_neighbors(
+    index: GuildVectorIndex,
+    vectors: np.ndarray,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test whether the search returns the same results as a brute force search across blocks.
+
+    Asserts
+    -------
+    - The index grew beyond its initial capacity.
+    - The results are ordered by cosine similarity, best match first.
+    """
+    monkeypatch.setattr(local_index, "BLOCK_SIZE", 3)
+    expected = np.argsort(-(vectors @ vectors[5]))[:4].tolist()
+
+    assert len(index) == len(vectors)
+    assert _ids(index.search(vectors[5].tobytes(), limit=4)) == expected
+
+
+def test__search_applies_filters(index: GuildVectorIndex, vectors: np.ndarray) -> None:
+    """
+    Test whether the search only returns messages that pass the filters.
+
+    Asserts
+    -------
+    - Only messages from the given channel are returned.
+    - Only messages within the sentiment radius are returned.
+    """
+    in_channel = index.search(vectors[5].tobytes(), ids=["0"], scope=StatisticScope.CHANNEL)
+    assert in_channel
+    assert {message.channel_id for message in in_channel} == {"0"}
+
+    in_range = index.search(vectors[5].tobytes(), sentiment=0.5, sentiment_radius=0.05, limit=20)
+    assert _ids(in_range) == [15]
+
+
+def test__remove_keeps_other_messages_searchable(
+    index: GuildVectorIndex,
+    vectors: np.ndarray,
+) -> None:
+    """
+    Test whether removing a message leaves the other messages intact.
+
+    Asserts
+    -------
+    - The removed message is no longer returned.
+    - The message that moved into its place is still found.
+    """
+    assert index.remove(3)
+    assert not index.remove(3)
+
+    assert 3 not in _ids(index.search(vectors[3].tobytes(), limit=20))
+    assert _ids(index.search(vectors[19].tobytes(), limit=1)) == [19]
+
+
+def test__hybrid_search_prefers_recent_messages(vectors: np.ndarray) -> None:
+    """
+    Test whether recency breaks a tie between equally similar messages.
+
+    Asserts
+    -------
+    - The most recent of two identical messages ranks first.
+    """
+    index = GuildVectorIndex("1")
+    now = datetime.datetime.now(datetime.UTC).timestamp()
+
+    for message_id, age in [(1, 3600 * 24 * 30), (2, 60)]:
+        index.add(
+            message_id=message_id,
+            channel_id=1,
+            user_id=1,
+            timestamp=now - age,
+            sentiment=0,
+            embedding=vectors[0].tobytes(),
+        )
+
+    results = index.search(vectors[0].tobytes(), weights=models.SearchWeights())
+
+    assert _ids(results) == [2, 1]
+
+
+def test__copy_is_not_changed_with_the_index(index: GuildVectorIndex, vectors: np.ndarray) -> None:
+    """
+    Test whether a copy of an index keeps its messages when the index changes.
+
+    Asserts
+    -------
+    - The copy returns the same results as the index before it changed.
+    """
+    expected = _ids(index.search(vectors[5].tobytes()))
+    copy = index.copy()
+
+    index.remove(int(index.search(vectors[5].tobytes(), limit=1)[0].message_id))
+    index.add(
+        message_id=100,
+        channel_id=0,
+        user_id=10,
+        timestamp=0,
+        sentiment=0,
+        embedding=vectors[5].tobytes(),
+    )
+
+    assert len(copy) == len(index)
+    assert _ids(copy.search(vectors[5].tobytes())) == expected
+
+
+def test__restored_snapshot_matches_original_index(
+    index: GuildVectorIndex,
+    vectors: np.ndarray,
+    tmp_path: Path,
+) -> None:
+    """
+    Test whether an index restored from a snapshot returns the same results as the original.
+
+    Asserts
+    -------
+    - The restored index returns the same results as the original index.
+    - Messages added before restoring are kept, and the index accepts changes after restoring.
+    """
+    index.write_snapshot(tmp_path, generation=1)
+    snapshot = load_snapshot(tmp_path, dims=DIMS)
+    assert snapshot is not None
+
+    restored = GuildVectorIndex("1")
+    restored.add(
+        message_id=100,
+        channel_id=0,
+        user_id=10,
+        timestamp=0,
+        sentiment=0,
+        embedding=vectors[7].tobytes(),
+    )
+    restored.restore(snapshot)
+
+    assert len(restored) == len(index) + 1
+    assert _ids(restored.search(vectors[5].tobytes(), ids=["1"])) == _ids(
+        index.search(vectors[5].tobytes(), ids=["1"]),
+    )
+    assert restored.remove(7)
+    assert _ids(restored.search(vectors[7].tobytes(), limit=1)) == [100]
+
+
+async def test__index_is_not_searched_until_loaded(
+    vectors: np.ndarray,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether a local index is only returned for searches once it is fully loaded.
+
+    Asserts
+    -------
+    - No index is returned while the messages of the guild are loading.
+    - The index is returned with all messages once loaded.
+    """
+    release = asyncio.Event()
+
+    async def scan_guild_messages(*_: object, **__: object) -> AsyncGenerator[list, None]:
+        yield [[b"1", b"0", b"10", b"0", b"0", vectors[0].tobytes()]]
+        await release.wait()
+        yield [[b"2", b"0", b"10", b"0", b"0", vectors[1].tobytes()]]
+
+    mocker.patch.object(local_index, "get_generation", return_value=1)
+    mocker.patch.object(local_index, "scan_guild_messages", side_effect=scan_guild_messages)
+
+    search = LocalSearch([1])
+    loader = asyncio.create_task(search.load(mocker.AsyncMock()))
+    await asyncio.sleep(0)
+
+    assert search.get("1") is None
+
+    release.set()
+    await loader
+
+    loaded = search.get("1")
+    assert loaded is not None
+    assert len(loaded) == 2
+
+
+async def test__save_skips_indexes_that_are_loading(
+    vectors: np.ndarray,
+    tmp_path: Path,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether saving skips indexes whose load was interrupted.
+
+    Asserts
+    -------
+    - No snapshot is written of a partly loaded index.
+    - A snapshot is written once the index is loaded.
+    """
+    mocker.patch.object(local_index, "get_generation", return_value=1)
+
+    search = LocalSearch([1], snapshot_dir=tmp_path)
+    index = search._indexes["1"]  # noqa: SLF001
+    index.add(
+        message_id=1,
+        channel_id=0,
+        user_id=10,
+        timestamp=0,
+        sentiment=0,
+        embedding=vectors[0].tobytes(),
+    )
+
+    await search.save(mocker.AsyncMock())
+    assert load_snapshot(tmp_path / "1", dims=DIMS) is None
+
+    index.loaded = True
+    await search.save(mocker.AsyncMock())
+    assert load_snapshot(tmp_path / "1", dims=DIMS) is not None
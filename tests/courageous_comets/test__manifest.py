@@ -0,0 +1,127 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from courageous_comets.manifest import MANIFEST_FILE, read_manifest, verify_manifest, write_manifest
+
+
+@pytest.fixture()
+def directory(tmp_path: Path) -> Path:
+    """Create a data directory with a downloaded resource."""
+    (tmp_path / "corpora").mkdir()
+    (tmp_path / "corpora" / "stopwords.txt").write_text("a\nan\nthe\n")
+    (tmp_path / "corpora" / "download.lock").write_text("")
+    return tmp_path
+
+
+def test__written_manifest_is_verified(directory: Path) -> None:
+    """
+    Test whether a directory is verified after its manifest is written.
+
+    Asserts
+    -------
+    - The manifest lists the resource and its files, except locks.
+    - The directory is verified.
+    """
+    write_manifest(directory, ["stopwords"])
+
+    manifest = read_manifest(directory)
+
+    assert manifest is not None
+    assert manifest.resources == ["stopwords"]
+    assert list(manifest.files) == ["corpora/stopwords.txt"]
+    assert verify_manifest(directory, ["stopwords"])
+
+
+def test__missing_resource_is_not_verified(directory: Path) -> None:
+    """
+    Test whether a directory is not verified if a resource is not in its manifest.
+
+    Asserts
+    -------
+    - A directory without a manifest is not verified.
+    - A resource that was not recorded is not verified.
+    """
+    assert not verify_manifest(directory, ["stopwords"])
+
+    write_manifest(directory, ["stopwords"])
+
+    assert not verify_manifest(directory, ["stopwords", "wordnet"])
+
+
+def test__missing_file_is_not_verified(directory: Path) -> None:
+    """
+    Test whether a directory is not verified if a file of its manifest was deleted.
+
+    Asserts
+    -------
+    - The directory is not verified.
+    """
+    write_manifest(directory, ["stopwords"])
+    (directory / "corpora" / "stopwords.txt").unlink()
+
+    assert not verify_manifest(directory, ["stopwords"])
+
+
+@pytest.mark.parametrize("content", ["a\nan\nthe\nof\n", "a\nan\nthf\n"])
+def test__modified_file_is_not_verified(directory: Path, content: str) -> None:
+    """
+    Test whether a directory is not verified if a file of its manifest was modified.
+
+    Asserts
+    -------
+    - The directory is not verified, whether or not the size of the file changed.
+    """
+    write_manifest(directory, ["stopwords"])
+    path = directory / "corpora" / "stopwords.txt"
+    stat = path.stat()
+    path.write_text(content)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert not verify_manifest(directory, ["stopwords"])
+
+
+def test__touched_file_is_verified(directory: Path) -> None:
+    """
+    Test whether a directory is verified if a file was touched without changing its content.
+
+    Asserts
+    -------
+    - The directory is verified by the checksum of the file.
+    """
+    write_manifest(directory, ["stopwords"])
+    path = directory / "corpora" / "stopwords.txt"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+
+    assert verify_manifest(directory, ["stopwords"])
+
+
+def test__previous_resources_are_kept(directory: Path) -> None:
+    """
+    Test whether writing a manifest keeps the resources recorded earlier.
+
+    Asserts
+    -------
+    - Both resources are verified.
+    """
+    write_manifest(directory, ["stopwords"])
+    write_manifest(directory, ["wordnet"])
+
+    assert verify_manifest(directory, ["stopwords", "wordnet"])
+
+
+def test__invalid_manifest_is_ignored(directory: Path) -> None:
+    """
+    Test whether an invalid manifest is treated as missing.
+
+    Asserts
+    -------
+    - No manifest is read.
+    - The directory is not verified.
+    """
+    (directory / MANIFEST_FILE).write_text("{")
+
+    assert read_manifest(directory) is None
+    assert not verify_manifest(directory, ["stopwords"])
@@ -0,0 +1,186 @@
+import asyncio
+import datetime
+from collections.abc import AsyncIterator, Iterable
+from unittest.mock import MagicMock
+
+import discord
+import pytest
+from pytest_mock import MockerFixture
+
+from courageous_comets import models
+from courageous_comets.discord.messages import MESSAGE_CACHE, most_recent_first, resolve_messages
+
+NOW = datetime.datetime(2024, 7, 1, tzinfo=datetime.UTC)
+
+
+@pytest.fixture(autouse=True)
+def _clear_message_cache() -> None:
+    """Clear the messages fetched by other tests."""
+    MESSAGE_CACHE.clear()
+
+
+def _message_id(minutes: int) -> int:
+    return discord.utils.time_snowflake(NOW + datetime.timedelta(minutes=minutes))
+
+
+def _hit(message_id: int, channel_id: int = 1) -> models.Message:
+    return models.Message(
+        message_id=str(message_id),
+        channel_id=str(channel_id),
+        guild_id="1",
+        timestamp=discord.utils.snowflake_time(message_id),
+        user_id="1",
+    )
+
+
+def _channel(mocker: MockerFixture, minutes: Iterable[int]) -> MagicMock:
+    result = mocker.MagicMock(spec=discord.TextChannel)
+    result.id = 1
+    messages = {}
+
+    for minute in minutes:
+        message = mocker.MagicMock(spec=discord.Message)
+        message.id = _message_id(minute)
+        message.clean_content = f"Message {minute}"
+        messages[message.id] = message
+
+    async def history(*, limit: int, after: discord.Object) -> AsyncIterator[discord.Message]:
+        for message_id in sorted(key for key in messages if key > after.id)[:limit]:
+            yield messages[message_id]
+
+    result.history = mocker.MagicMock(side_effect=history)
+    result.fetch_message = mocker.AsyncMock(side_effect=lambda message_id: messages[message_id])
+    return result
+
+
+@pytest.fixture()
+def channel(mocker: MockerFixture) -> MagicMock:
+    """Create a mock channel that holds a message every minute for a day."""
+    return _channel(mocker, range(24 * 60))
+
+
+async def test__resolve_messages_fetches_close_messages_in_bulk(
+    channel: MagicMock,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether messages sent close together are fetched with a single history request.
+
+    Asserts
+    -------
+    - All messages are resolved, in the original order.
+    - The close messages are fetched with one history request.
+    - The distant message is fetched on its own.
+    - Resolving the same messages again is served from the cache.
+    """
+    client = mocker.MagicMock(spec=discord.Client)
+    client.get_channel.return_value = channel
+    hits = [_hit(_message_id(minutes)) for minutes in [10, 0, 600, 5]]
+
+    resolved = await resolve_messages(client, hits)
+
+    assert resolved == [channel.fetch_message.side_effect(int(hit.message_id)) for hit in hits]
+    channel.history.assert_called_once()
+    channel.fetch_message.assert_awaited_once_with(_message_id(600))
+
+    await resolve_messages(client, hits)
+
+    channel.history.assert_called_once()
+    channel.fetch_message.assert_awaited_once()
+
+
+@pytest.mark.parametrize(
+    ("minutes", "hits", "requests", "fetched"),
+    [
+        # A quiet channel, with hits far apart in time but close together in the channel
+        (range(0, 24 * 60, 60), [0, 120, 300, 600], 1, []),
+        # A busy channel, with more messages between the hits than fit in one request
+        (range(24 * 60), [0, 50, 150, 180, 400], 2, [400]),
+    ],
+)
+async def test__resolve_messages_pages_through_the_history(
+    mocker: MockerFixture,
+    minutes: range,
+    hits: list[int],
+    requests: int,
+    fetched: list[int],
+) -> None:
+    """
+    Test whether the history is read in pages that start at the next missing message.
+
+    Asserts
+    -------
+    - All messages are resolved.
+    - Messages on the same page share a history request, however far apart they were sent.
+    - Only a last message without a close neighbour is fetched on its own.
+    """
+    channel = _channel(mocker, minutes)
+    client = mocker.MagicMock(spec=discord.Client)
+    client.get_channel.return_value = channel
+
+    messages = [_message_id(minute) for minute in hits]
+    resolved = await resolve_messages(client, [_hit(message_id) for message_id in messages])
+
+    assert resolved == [channel.fetch_message.side_effect(message_id) for message_id in messages]
+    assert channel.history.call_count == requests
+    assert [call.args[0] for call in channel.fetch_message.await_args_list] == [
+        _message_id(minute) for minute in fetched
+    ]
+
+
+async def test__resolve_messages_returns_once_the_limit_is_reached(mocker: MockerFixture) -> None:
+    """
+    Test whether resolving stops waiting for slow channels once enough messages are found.
+
+    Asserts
+    -------
+    - The message of the fast channel is returned without waiting for the slow channel.
+    - The message that no longer exists is passed to `on_not_found`.
+    """
+    deleted_id, found_id, slow_id = _message_id(0), _message_id(60), _message_id(120)
+
+    found = mocker.MagicMock(spec=discord.Message)
+    found.id = found_id
+    found.clean_content = "Found"
+
+    async def fetch_fast(message_id: int) -> discord.Message:
+        if message_id == deleted_id:
+            raise discord.NotFound(mocker.MagicMock(status=404), "Unknown Message")
+        return found
+
+    async def fetch_slow(_: int) -> discord.Message:
+        await asyncio.Event().wait()
+        raise AssertionError
+
+    channels = {
+        channel_id: mocker.MagicMock(spec=discord.TextChannel, id=channel_id)
+        for channel_id in (1, 2)
+    }
+    channels[1].fetch_message = mocker.AsyncMock(side_effect=fetch_fast)
+    channels[2].fetch_message = mocker.AsyncMock(side_effect=fetch_slow)
+
+    client = mocker.MagicMock(spec=discord.Client)
+    client.get_channel.side_effect = channels.get
+    on_not_found = mocker.AsyncMock()
+    hits = [_hit(slow_id, channel_id=2), _hit(deleted_id), _hit(found_id)]
+
+    async with asyncio.timeout(1):
+        resolved = await resolve_messages(client, hits, limit=1, on_not_found=on_not_found)
+
+    assert resolved == [found]
+    on_not_found.assert_awaited_once_with([hits[1]])
+
+
+def test__most_recent_first_sorts_resolved_messages(mocker: MockerFixture) -> None:
+    """
+    Test whether resolved messages are sorted for display by the time they were sent.
+
+    Asserts
+    -------
+    - Stored messages and messages fetched from Discord are sorted together, most recent first.
+    """
+    fetched = mocker.MagicMock(spec=discord.Message)
+    fetched.created_at = NOW + datetime.timedelta(minutes=2)
+    old, new = _hit(_message_id(1)), _hit(_message_id(3))
+
+    assert most_recent_first([old, fetched, new]) == [new, fetched, old]
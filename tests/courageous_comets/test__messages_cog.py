@@ -0,0 +1,185 @@
+import discord
+import pytest
+from pytest_mock import MockerFixture, MockType
+
+from courageous_comets.cogs import messages
+from courageous_comets.cogs.messages import Messages
+
+
+@pytest.fixture()
+def bot(mocker: MockerFixture) -> MockType:
+    """Create a mock bot that is connected to Redis and has loaded the vectorizer."""
+    bot = mocker.MagicMock()
+    bot.wait_for_vectorizer = mocker.AsyncMock()
+    bot.forget_messages = mocker.AsyncMock(return_value=1)
+    return bot
+
+
+@pytest.fixture()
+def process_message(mocker: MockerFixture) -> MockType:
+    """Patch the processing of messages."""
+    return mocker.patch.object(messages, "process_message", return_value="key")
+
+
+@pytest.fixture()
+def invalidate_message(mocker: MockerFixture) -> MockType:
+    """Patch the invalidation of the message cache."""
+    return mocker.patch.object(messages, "invalidate_message")
+
+
+def _message(mocker: MockerFixture, content: str) -> MockType:
+    message = mocker.Mock(spec=discord.Message)
+    message.id = 2
+    message.content = message.clean_content = content
+    message.author.bot = False
+    message.mentions = []
+    return message
+
+
+@pytest.mark.parametrize(("after", "processed"), [("edited", True), ("original", False)])
+async def test__edited_message_is_processed_again(
+    bot: MockType,
+    process_message: MockType,
+    mocker: MockerFixture,
+    after: str,
+    *,
+    processed: bool,
+) -> None:
+    """
+    Test whether a cached message is processed again if its content was edited.
+
+    Asserts
+    -------
+    - The message is processed again if its content changed, and not otherwise.
+    """
+    before = _message(mocker, "original")
+    edited = _message(mocker, after)
+
+    await Messages(bot).on_message_edit(before, edited)
+
+    assert process_message.called is processed
+
+
+async def test__uncached_edited_message_is_fetched_and_processed(
+    bot: MockType,
+    process_message: MockType,
+    invalidate_message: MockType,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether an edited message that is not cached is fetched and processed again.
+
+    Asserts
+    -------
+    - The message is removed from the message cache.
+    - The message is fetched from Discord and processed.
+    - The message is saved through the binary-safe connection.
+    """
+    mocker.patch.object(messages, "SCHEDULER")
+    edited = _message(mocker, "edited")
+    channel = mocker.Mock(spec=discord.TextChannel)
+    channel.id = 1
+    channel.fetch_message = mocker.AsyncMock(return_value=edited)
+    bot.get_channel.return_value = channel
+
+    payload = mocker.Mock(spec=discord.RawMessageUpdateEvent)
+    payload.channel_id, payload.message_id = 1, 2
+    payload.cached_message = None
+    payload.data = {"content": "edited"}
+
+    await Messages(bot).on_raw_message_edit(payload)
+
+    invalidate_message.assert_called_once_with(1, 2)
+    channel.fetch_message.assert_awaited_once_with(2)
+    process_message.assert_awaited_once()
+    assert process_message.call_args.args == (edited,)
+    assert process_message.call_args.kwargs["redis"] is bot.redis_binary
+
+
+async def test__cached_edited_message_is_only_invalidated(
+    bot: MockType,
+    process_message: MockType,
+    invalidate_message: MockType,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether the raw edit event leaves cached messages to `on_message_edit`.
+
+    Asserts
+    -------
+    - The message is removed from the message cache.
+    - The message is not fetched or processed.
+    """
+    payload = mocker.Mock(spec=discord.RawMessageUpdateEvent)
+    payload.channel_id, payload.message_id = 1, 2
+    payload.cached_message = _message(mocker, "original")
+    payload.data = {"content": "edited"}
+
+    await Messages(bot).on_raw_message_edit(payload)
+
+    invalidate_message.assert_called_once_with(1, 2)
+    bot.get_channel.assert_not_called()
+    process_message.assert_not_called()
+
+
+async def test__deleted_message_is_forgotten(
+    bot: MockType,
+    invalidate_message: MockType,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether a deleted message is deleted from Redis and the message cache.
+
+    Asserts
+    -------
+    - The message is removed from the message cache.
+    - The message is deleted from Redis and the in-memory search indexes.
+    """
+    payload = mocker.Mock(spec=discord.RawMessageDeleteEvent)
+    payload.guild_id, payload.channel_id, payload.message_id = 3, 1, 2
+
+    await Messages(bot).on_raw_message_delete(payload)
+
+    invalidate_message.assert_called_once_with(1, 2)
+    bot.forget_messages.assert_awaited_once_with("3", ["2"])
+
+
+async def test__bulk_deleted_messages_are_forgotten(
+    bot: MockType,
+    invalidate_message: MockType,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether messages deleted in bulk are deleted from Redis and the message cache.
+
+    Asserts
+    -------
+    - Each message is removed from the message cache.
+    - The messages are deleted from Redis at once.
+    """
+    payload = mocker.Mock(spec=discord.RawBulkMessageDeleteEvent)
+    payload.guild_id, payload.channel_id, payload.message_ids = 3, 1, {2}
+
+    await Messages(bot).on_raw_bulk_message_delete(payload)
+
+    invalidate_message.assert_called_once_with(1, 2)
+    bot.forget_messages.assert_awaited_once_with("3", ["2"])
+
+
+async def test__deleted_message_outside_guild_is_ignored(
+    bot: MockType,
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether deleted messages outside of a guild are ignored.
+
+    Asserts
+    -------
+    - No messages are deleted from Redis.
+    """
+    payload = mocker.Mock(spec=discord.RawMessageDeleteEvent)
+    payload.guild_id, payload.channel_id, payload.message_id = None, 1, 2
+
+    await Messages(bot).on_raw_message_delete(payload)
+
+    bot.forget_messages.assert_not_called()
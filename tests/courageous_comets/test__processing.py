@@ -0,0 +1,59 @@
+import asyncio
+import datetime
+
+import discord
+from pytest_mock import MockerFixture, MockType
+
+from courageous_comets import models, processing
+from courageous_comets.processing import process_message
+
+
+def _message(mocker: MockerFixture, content: str) -> MockType:
+    message = mocker.Mock(spec=discord.Message)
+    message.id = 2
+    message.author.id = 3
+    message.channel.id = 4
+    message.guild.id = 1
+    message.created_at = datetime.datetime(2024, 7, 1, tzinfo=datetime.UTC)
+    message.content = message.clean_content = content
+    return message
+
+
+async def test__edit_during_processing_is_processed_again(mocker: MockerFixture) -> None:
+    """
+    Test whether an edit made while the original message is processed does not join its run.
+
+    Asserts
+    -------
+    - Concurrent calls with the same content share a run.
+    - The edited content is processed and saved in a run of its own.
+    """
+    mocker.patch.object(
+        processing,
+        "calculate_sentiment",
+        return_value=models.SentimentResult(neg=0, neu=1, pos=0, compound=0),
+    )
+    mocker.patch.object(processing, "tokenize_sentence", return_value=[])
+    save_message = mocker.patch.object(processing.messages, "save_message", return_value="key")
+    release = asyncio.Event()
+
+    async def aencode(_: str) -> bytes:
+        await release.wait()
+        return b""
+
+    vectorizer = mocker.Mock()
+    vectorizer.aencode = mocker.AsyncMock(side_effect=aencode)
+    redis = mocker.Mock()
+
+    original = _message(mocker, "hello world")
+    calls = [
+        asyncio.ensure_future(process_message(message, redis=redis, vectorizer=vectorizer))
+        for message in (original, original, _message(mocker, "goodbye world"))
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*calls)
+
+    assert vectorizer.aencode.await_count == 2
+    snippets = [call.args[1].snippet for call in save_message.call_args_list]
+    assert sorted(snippets) == ["goodbye world", "hello world"]
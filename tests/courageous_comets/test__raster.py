@@ -0,0 +1,115 @@
+import datetime
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageChops
+
+from courageous_comets.ui.charts import raster
+
+# Reference images of the charts, as rendered when the renderer was last changed on purpose
+GOLDEN_DIR = Path(__file__).parent / "charts"
+
+# Minimum difference in any channel for a pixel to count as changed. Smaller differences come
+# from anti-aliasing, for example by another version of FreeType.
+PIXEL_THRESHOLD = 64
+
+# Maximum number of changed pixels. Changing a single character of a label changes more.
+TOLERANCE = 100
+
+
+def _changed_pixels(image: bytes, golden: str) -> int:
+    actual = Image.open(io.BytesIO(image)).convert("RGB")
+    expected = Image.open(GOLDEN_DIR / golden).convert("RGB")
+
+    assert actual.size == expected.size
+
+    red, green, blue = ImageChops.difference(actual, expected).split()
+    difference = ImageChops.lighter(ImageChops.lighter(red, green), blue)
+    changed = difference.point([255 if value >= PIXEL_THRESHOLD else 0 for value in range(256)])
+
+    return changed.histogram()[255]
+
+
+def test__bar_chart_matches_golden_image() -> None:
+    """
+    Test whether a bar chart looks the same as the reference image.
+
+    Asserts
+    -------
+    - No more pixels than the tolerance differ noticeably from the reference image.
+    """
+    image = raster.bar_chart(
+        ["Negative", "Neutral", "Positive"],
+        [0.1, 0.6, 0.3],
+        title="Sentiment Analysis",
+        ylabel="Sentiment Score",
+        colors=["red", "blue", "green"],
+    )
+
+    assert _changed_pixels(image, "sentiment_bars.png") <= TOLERANCE
+
+
+def test__bar_chart_with_rotated_labels_matches_golden_image() -> None:
+    """
+    Test whether a bar chart with rotated labels looks the same as the reference image.
+
+    Asserts
+    -------
+    - No more pixels than the tolerance differ noticeably from the reference image.
+    """
+    keywords = ["hello", "world", "keyword", "discord", "python", "charts", "comets"]
+    counts = [40, 33, 20, 18, 12, 9, 7]
+
+    image = raster.bar_chart(
+        [*keywords, "courageous", "bars", "ten"],
+        [*counts, 5, 3, 1],
+        title="Top keywords",
+        ylabel="Count",
+        rotate_labels=True,
+    )
+
+    assert _changed_pixels(image, "keywords_bars.png") <= TOLERANCE
+
+
+def test__line_chart_matches_golden_image() -> None:
+    """
+    Test whether a line chart looks the same as the reference image.
+
+    Asserts
+    -------
+    - No more pixels than the tolerance differ noticeably from the reference image.
+    """
+    start = datetime.datetime(2024, 7, 1, tzinfo=datetime.UTC)
+    timestamps = [start + datetime.timedelta(hours=hour) for hour in range(24)]
+    values = [(12 - hour) * 2 + 12 if hour < 12 else (hour - 12) * 4 + 12 for hour in range(24)]
+
+    image = raster.line_chart(
+        timestamps,
+        values,
+        title="Message Frequency",
+        ylabel="Number of messages.",
+    )
+
+    assert _changed_pixels(image, "frequency_line.png") <= TOLERANCE
+
+
+@pytest.mark.parametrize(
+    ("maximum", "expected"),
+    [
+        (0, [0.0, 1.0]),
+        (1, [0, 0.2, 0.4, 0.6, 0.8, 1.0]),
+        (0.6, [0, 0.2, 0.4, 0.6]),
+        (40, [0, 10, 20, 30, 40]),
+        (56, [0, 20, 40, 60]),
+    ],
+)
+def test__ticks_are_round(maximum: float, expected: list[float]) -> None:
+    """
+    Test whether the ticks of a value axis are at a round interval and cover the maximum.
+
+    Asserts
+    -------
+    - The ticks start at zero, at a round interval, up to the first tick at or above `maximum`.
+    """
+    assert raster.ticks(maximum) == pytest.approx(expected)
@@ -0,0 +1,29 @@
+from matplotlib.figure import Figure
+
+from courageous_comets.ui.charts import rendering
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+def _plot(figure: Figure) -> None:
+    ax = figure.subplots()
+    ax.bar(["a", "b"], [1, 2])
+
+
+async def test__render_reuses_the_figure_of_the_worker() -> None:
+    """
+    Test whether charts are rendered as PNG images on a reused figure.
+
+    Asserts
+    -------
+    - The rendered chart is a PNG image.
+    - Rendering the same chart again gives the same image.
+    - The figure is cleared after rendering.
+    """
+    image = rendering.render_png(_plot)
+
+    assert image.startswith(PNG_SIGNATURE)
+    assert rendering.render_png(_plot) == image
+    assert not rendering._local.figure.axes  # noqa: SLF001
+
+    assert await rendering.render(rendering.render_png, _plot) == image
@@ -0,0 +1,97 @@
+import pytest
+from pytest_mock import MockerFixture
+from redis.asyncio import ConnectionError, Redis
+
+from courageous_comets.redis.replicas import ReplicaPool
+
+
+@pytest.fixture()
+def primary(mocker: MockerFixture) -> Redis:
+    """Create a mock primary Redis instance for testing."""
+    return mocker.AsyncMock(spec=Redis)
+
+
+@pytest.fixture()
+def replicas(mocker: MockerFixture) -> list[Redis]:
+    """Create healthy mock Redis replicas for testing."""
+    result = [mocker.AsyncMock(spec=Redis), mocker.AsyncMock(spec=Redis)]
+
+    for replica in result:
+        replica.info = mocker.AsyncMock(return_value={"master_link_status": "up"})
+        replica.connection_pool = mocker.Mock(connection_kwargs={"host": "replica", "port": 6379})
+
+    return result
+
+
+def test__reader_alternates_between_healthy_replicas(primary: Redis, replicas: list[Redis]) -> None:
+    """
+    Test whether reads are spread over the healthy replicas.
+
+    Asserts
+    -------
+    - Each replica is used in turn.
+    """
+    pool = ReplicaPool(primary, replicas)
+    assert [pool.reader() for _ in range(4)] == [*replicas, *replicas]
+
+
+async def test__reader_skips_unreachable_replica(
+    primary: Redis,
+    replicas: list[Redis],
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether a replica that fails its health check no longer serves reads.
+
+    Asserts
+    -------
+    - Only the healthy replica is used.
+    """
+    replicas[0].info = mocker.AsyncMock(side_effect=ConnectionError())
+    pool = ReplicaPool(primary, replicas)
+
+    await pool.check_health()
+
+    assert {pool.reader() for _ in range(4)} == {replicas[1]}
+
+
+async def test__reader_fails_over_to_primary(
+    primary: Redis,
+    replicas: list[Redis],
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether reads fail over to the primary if no replica is healthy.
+
+    Asserts
+    -------
+    - The primary is used when all replicas lost their link to the primary.
+    """
+    for replica in replicas:
+        replica.info = mocker.AsyncMock(return_value={"master_link_status": "down"})
+
+    pool = ReplicaPool(primary, replicas)
+    await pool.check_health()
+
+    assert pool.reader() is primary
+
+
+async def test__failed_read_is_retried_on_primary(
+    primary: Redis,
+    replicas: list[Redis],
+    mocker: MockerFixture,
+) -> None:
+    """
+    Test whether a read that fails on an unreachable replica runs again on the primary.
+
+    Asserts
+    -------
+    - The result of the query on the primary is returned.
+    - The replica no longer serves reads, without waiting for a health check.
+    """
+    replicas[0].get = mocker.AsyncMock(side_effect=ConnectionError())
+    primary.get = mocker.AsyncMock(return_value="primary")
+    pool = ReplicaPool(primary, replicas)
+
+    assert await pool.read(lambda redis: redis.get("key")) == "primary"
+    assert {pool.reader() for _ in range(4)} == {replicas[1]}
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from courageous_comets.discord.scheduler import Priority, Scheduler, TokenBucket, route
+
+
+@pytest.mark.parametrize(
+    ("method", "path", "expected"),
+    [
+        ("get", "/api/v10/channels/1/messages/2", "GET /channels/1/messages/{id}"),
+        ("GET", "/channels/1/messages", "GET /channels/1/messages"),
+        ("GET", "/users/3", "GET /users/{id}"),
+    ],
+)
+def test__route_keeps_major_parameters(method: str, path: str, expected: str) -> None:
+    """Test that only the IDs of major parameters are part of the route."""
+    assert route(method, path) == expected
+
+
+async def test__scheduler_grants_slots_by_priority() -> None:
+    """Test that a free slot goes to the most urgent request, in order of arrival."""
+    scheduler = Scheduler(1)
+    order: list[str] = []
+
+    async def request(name: str, priority: Priority) -> None:
+        async with scheduler.request("GET", "/channels/1/messages", priority=priority):
+            order.append(name)
+
+    async with scheduler.request("GET", "/channels/1/messages"):
+        tasks = [
+            asyncio.create_task(request("backfill", Priority.BACKFILL)),
+            asyncio.create_task(request("resolution", Priority.RESOLUTION)),
+            asyncio.create_task(request("first", Priority.INTERACTIVE)),
+            asyncio.create_task(request("second", Priority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+
+        assert scheduler.stats[Priority.INTERACTIVE].waiting == 2
+
+    await asyncio.gather(*tasks)
+
+    assert order == ["first", "second", "resolution", "backfill"]
+    assert scheduler.stats[Priority.INTERACTIVE].requests == 3
+    assert scheduler.stats[Priority.INTERACTIVE].waiting == 0
+
+
+async def test__scheduler_waits_for_the_bucket_to_reset() -> None:
+    """Test that requests wait when the rate limit of their route is reached."""
+    scheduler = Scheduler(3)
+    headers = {
+        "X-RateLimit-Limit": "5",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "0.2",
+    }
+    scheduler.update("GET", "/api/v10/channels/1/messages/2", headers)
+
+    async with asyncio.timeout(0.1):
+        async with scheduler.request("GET", "/channels/2/messages/3"):
+            pass
+
+    with pytest.raises(TimeoutError):
+        async with asyncio.timeout(0.1), scheduler.request("GET", "/channels/1/messages/4"):
+            pass
+
+    async with asyncio.timeout(0.5), scheduler.request("GET", "/channels/1/messages/4"):
+        pass
+
+
+async def test__rate_limited_requests_do_not_hold_slots() -> None:
+    """Test that requests waiting for their route to reset leave the slots to other routes."""
+    scheduler = Scheduler(1)
+    headers = {
+        "X-RateLimit-Limit": "5",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "0.5",
+    }
+    scheduler.update("GET", "/api/v10/channels/1/messages", headers)
+
+    async def backfill() -> None:
+        async with scheduler.request("GET", "/channels/1/messages", priority=Priority.BACKFILL):
+            pass
+
+    waiting = asyncio.create_task(backfill())
+    await asyncio.sleep(0.05)
+
+    async with asyncio.timeout(0.1), scheduler.request("GET", "/channels/2/messages/3"):
+        pass
+
+    assert not waiting.done()
+    await waiting
+
+
+async def test__cancelled_requests_give_back_their_tokens() -> None:
+    """Test that requests cancelled before a response arrived do not use up the rate limit."""
+    scheduler = Scheduler(3)
+    headers = {
+        "X-RateLimit-Limit": "2",
+        "X-RateLimit-Remaining": "0",
+        "X-RateLimit-Reset-After": "0.05",
+    }
+    scheduler.update("GET", "/api/v10/channels/1/messages", headers)
+    await asyncio.sleep(0.1)
+
+    async def request() -> None:
+        async with scheduler.request("GET", "/channels/1/messages"):
+            await asyncio.sleep(10)
+
+    tasks = [asyncio.create_task(request()) for _ in range(2)]
+    await asyncio.sleep(0.01)
+
+    for task in tasks:
+        task.cancel()
+
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    async with asyncio.timeout(0.01), scheduler.request("GET", "/channels/1/messages"):
+        pass
+
+
+async def test__bucket_resets_without_responses() -> None:
+    """Test that a bucket resets after its last known window if no response updates it."""
+    bucket = TokenBucket()
+    bucket.update(limit=1, remaining=0, reset_after=0.05)
+    await asyncio.sleep(0.1)
+
+    # Take the only token of the next window, which is never reported by a response
+    await bucket.acquire()
+
+    async with asyncio.timeout(0.5):
+        await bucket.acquire()
@@ -0,0 +1,24 @@
+from pytest_mock import MockerFixture
+
+from courageous_comets import models
+from courageous_comets.client import CourageousCometsBot
+from courageous_comets.ui.views import search_results
+from courageous_comets.ui.views.search_results import SearchResultsView
+
+
+async def test__render_prunes_messages_that_no_longer_exist(mocker: MockerFixture) -> None:
+    """
+    Test whether rendering a page of search results prunes messages deleted on Discord.
+
+    Asserts
+    -------
+    - The messages of the page are resolved with the bot's pruning as `on_not_found`.
+    """
+    resolve_messages = mocker.patch.object(search_results, "resolve_messages", return_value=[])
+    page = models.SearchPage(cursor_id="1", page=0, page_count=1, messages=[])
+    view = SearchResultsView(mocker.AsyncMock(), guild_id="1", query="query", page=page)
+    bot = CourageousCometsBot()
+
+    await view.render(bot)
+
+    assert resolve_messages.call_args.kwargs["on_not_found"] == bot.prune_messages
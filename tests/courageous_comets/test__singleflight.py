@@ -0,0 +1,120 @@
+import asyncio
+
+import pytest
+
+from courageous_comets.singleflight import SingleFlight, coalesce
+
+
+async def test__concurrent_calls_share_one_call() -> None:
+    """
+    Test whether concurrent calls with the same key are executed once.
+
+    Asserts
+    -------
+    - All callers receive the result of the same call.
+    - No calls remain in flight afterwards.
+    """
+    flight = SingleFlight[int]()
+    calls = 0
+    release = asyncio.Event()
+
+    async def call() -> int:
+        nonlocal calls
+        calls += 1
+        await release.wait()
+        return calls
+
+    waiters = [asyncio.create_task(flight.do("key", call)) for _ in range(5)]
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await asyncio.gather(*waiters) == [1] * 5
+    assert calls == 1
+    assert len(flight) == 0
+
+
+async def test__sequential_calls_are_not_shared() -> None:
+    """
+    Test whether a call after a completed call is executed again.
+
+    Asserts
+    -------
+    - Each sequential call gets a fresh result.
+    """
+    results = iter(["first", "second"])
+
+    @coalesce(key=lambda name: name)
+    async def get(name: str) -> str:
+        return f"{name}-{next(results)}"
+
+    assert await get("a") == "a-first"
+    assert await get("a") == "a-second"
+
+
+async def test__cancelled_caller_does_not_cancel_call() -> None:
+    """
+    Test whether cancelling one caller leaves the call running for the others.
+
+    Asserts
+    -------
+    - The cancelled caller raises CancelledError.
+    - The remaining caller receives the result.
+    """
+    flight = SingleFlight[str]()
+    release = asyncio.Event()
+
+    async def call() -> str:
+        await release.wait()
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", call))
+    second = asyncio.create_task(flight.do("key", call))
+    await asyncio.sleep(0)
+
+    first.cancel()
+    release.set()
+
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    assert await second == "done"
+
+
+async def test__cancelling_last_caller_cancels_call() -> None:
+    """
+    Test whether the call is cancelled once all of its callers are cancelled.
+
+    Asserts
+    -------
+    - The call keeps running while a caller is waiting.
+    - The call is cancelled after the last caller is cancelled.
+    - No calls remain in flight afterwards.
+    """
+    flight = SingleFlight[str]()
+    started = asyncio.Event()
+    cancelled = asyncio.Event()
+
+    async def call() -> str:
+        started.set()
+
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+        return "done"
+
+    first = asyncio.create_task(flight.do("key", call))
+    second = asyncio.create_task(flight.do("key", call))
+    await started.wait()
+
+    first.cancel()
+    await asyncio.gather(first, return_exceptions=True)
+    assert not cancelled.is_set()
+
+    second.cancel()
+    await asyncio.gather(second, return_exceptions=True)
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+    assert len(flight) == 0
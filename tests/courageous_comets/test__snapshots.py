@@ -0,0 +1,84 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from courageous_comets.snapshots import METADATA_DTYPE, SnapshotWriter, load_snapshot
+
+DIMS = 4
+
+
+def _metadata(start: int, stop: int) -> np.ndarray:
+    result = np.zeros(stop - start, dtype=METADATA_DTYPE)
+    result["message_id"] = np.arange(start, stop)
+    result["timestamp"] = np.arange(start, stop) * 60.0
+    return result
+
+
+def test__snapshot_is_written_in_chunks_and_memory_mapped(tmp_path: Path) -> None:
+    """
+    Test whether a snapshot written in chunks can be loaded as memory-mapped arrays.
+
+    Asserts
+    -------
+    - All chunks are part of the snapshot, in order.
+    - The arrays are read-only memory maps.
+    - The generation is stored with the snapshot.
+    """
+    embeddings = np.arange(5 * DIMS, dtype=np.float32).reshape(5, DIMS)
+
+    with SnapshotWriter(tmp_path, generation=7, dims=DIMS) as writer:
+        writer.append(embeddings[:3], _metadata(0, 3))
+        writer.append(embeddings[3:], _metadata(3, 5))
+
+    snapshot = load_snapshot(tmp_path, dims=DIMS)
+
+    assert snapshot is not None
+    assert snapshot.generation == 7
+    assert isinstance(snapshot.embeddings, np.memmap)
+    assert not snapshot.embeddings.flags.writeable
+    np.testing.assert_array_equal(snapshot.embeddings, embeddings)
+    np.testing.assert_array_equal(snapshot.metadata["message_id"], np.arange(5))
+
+
+def test__failed_write_keeps_previous_snapshot(tmp_path: Path) -> None:
+    """
+    Test whether an error while writing a snapshot keeps the previous snapshot.
+
+    Asserts
+    -------
+    - The previous snapshot is still loaded.
+    - No temporary files are left behind.
+    """
+    with SnapshotWriter(tmp_path, generation=1, dims=DIMS) as writer:
+        writer.append(np.ones((2, DIMS), dtype=np.float32), _metadata(0, 2))
+
+    def write_invalid_snapshot() -> None:
+        with SnapshotWriter(tmp_path, generation=2, dims=DIMS) as writer:
+            writer.append(np.ones((1, DIMS), dtype=np.float32), _metadata(0, 1))
+            writer.append(np.ones((1, DIMS + 1), dtype=np.float32), _metadata(1, 2))
+
+    with pytest.raises(ValueError, match="Expected rows of shape"):
+        write_invalid_snapshot()
+
+    snapshot = load_snapshot(tmp_path, dims=DIMS)
+
+    assert snapshot is not None
+    assert snapshot.generation == 1
+    assert len(snapshot) == 2
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test__snapshot_with_other_dimensions_is_ignored(tmp_path: Path) -> None:
+    """
+    Test whether a snapshot of embeddings with a different number of dimensions is ignored.
+
+    Asserts
+    -------
+    - No snapshot is loaded.
+    """
+    with SnapshotWriter(tmp_path, generation=1, dims=DIMS) as writer:
+        writer.append(np.ones((1, DIMS), dtype=np.float32), _metadata(0, 1))
+
+    assert load_snapshot(tmp_path, dims=DIMS + 1) is None
+    assert load_snapshot(tmp_path / "missing", dims=DIMS) is None
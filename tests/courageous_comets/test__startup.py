@@ -0,0 +1,68 @@
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+from courageous_comets.startup import StartupProfiler
+
+
+def test__phases_are_reported_in_start_order() -> None:
+    """
+    Test whether nested phases and events are reported in the order they started.
+
+    Asserts
+    -------
+    - The outer phase is reported before the nested phase and the event.
+    - The outer phase lasts at least as long as the nested phase.
+    - Events have no duration.
+    """
+    profiler = StartupProfiler(enabled=True)
+
+    with profiler.phase("outer"), profiler.phase("inner"):
+        profiler.mark("event")
+
+    phases = profiler.report()["phases"]
+
+    assert [phase["name"] for phase in phases] == ["outer", "inner", "event"]  # type: ignore
+    assert phases[0]["duration"] >= phases[1]["duration"]  # type: ignore
+    assert phases[2]["duration"] == 0  # type: ignore
+
+
+def test__disabled_profiler_records_nothing() -> None:
+    """
+    Test whether a disabled profiler does not record phases.
+
+    Asserts
+    -------
+    - No phases are recorded.
+    """
+    profiler = StartupProfiler(enabled=False)
+
+    with profiler.phase("phase"):
+        profiler.mark("event")
+
+    assert profiler.phases == []
+
+
+def test__imports_are_timed(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    """
+    Test whether the first import of a tracked module is timed.
+
+    Asserts
+    -------
+    - The import is recorded as a phase.
+    - The module keeps its original loader.
+    """
+    (tmp_path / "startup_profiled.py").write_text("VALUE = 1\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(sys, "meta_path", list(sys.meta_path))
+    monkeypatch.delitem(sys.modules, "startup_profiled", raising=False)
+
+    profiler = StartupProfiler(enabled=True)
+    profiler.track_imports(["startup_profiled"])
+
+    module = importlib.import_module("startup_profiled")
+
+    assert [phase.name for phase in profiler.phases] == ["import startup_profiled"]
+    assert type(module.__loader__).__name__ == "SourceFileLoader"
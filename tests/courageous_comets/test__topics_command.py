@@ -0,0 +1,56 @@
+import asyncio
+from collections import Counter
+from collections.abc import AsyncGenerator, Awaitable, Callable
+
+import pytest
+from pytest_mock import MockerFixture
+from redis.asyncio import Redis
+
+from courageous_comets import settings
+from courageous_comets.cogs.keywords import topics_command
+from courageous_comets.cogs.keywords.topics_command import TopicsCommand
+from courageous_comets.enums import StatisticScope
+
+
+async def test__timed_out_guild_count_cancels_aggregation(
+    mocker: MockerFixture,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """
+    Test whether a guild-wide count that times out stops the aggregation before falling back.
+
+    Asserts
+    -------
+    - The aggregation stream is closed before the fallback count runs.
+    - The fallback count is returned.
+    """
+    monkeypatch.setattr(settings, "AGGREGATE_TIMEOUT", 0.01)
+    closed = asyncio.Event()
+
+    async def stream_tokens(*_: object, **__: object) -> AsyncGenerator[list[dict[str, int]], None]:
+        try:
+            await asyncio.Event().wait()
+            yield []
+        finally:
+            closed.set()
+
+    async def get_tokens_count(*_: object, **__: object) -> Counter[str]:
+        assert closed.is_set()
+        return Counter({"recent": 1})
+
+    mocker.patch("courageous_comets.redis.messages.stream_tokens", side_effect=stream_tokens)
+    mocker.patch.object(topics_command, "get_tokens_count", side_effect=get_tokens_count)
+
+    redis = mocker.AsyncMock(spec=Redis)
+    redis.get = mocker.AsyncMock(return_value="1")
+
+    async def read(query: Callable[[Redis], Awaitable[object]]) -> object:
+        return await query(redis)
+
+    bot = mocker.MagicMock()
+    bot.read = read
+
+    cog = TopicsCommand(bot)
+    result = await cog._count_keywords("1", StatisticScope.GUILD, None)  # noqa: SLF001
+
+    assert result == Counter({"recent": 1})
@@ -0,0 +1,72 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import torch
+from pytest_mock import MockerFixture
+
+from courageous_comets import settings, vectorizer
+from courageous_comets.vectorizer import Vectorizer
+
+
+def test__warmup_encodes_representative_lengths_on_every_worker(mocker: MockerFixture) -> None:
+    """
+    Test whether the warmup encodes a message of every warmup length on every worker.
+
+    Asserts
+    -------
+    - Each warmup length is encoded the configured number of times per worker.
+    - The messages are encoded on the workers of the vectorizer.
+    """
+    mocker.patch.object(vectorizer, "EXECUTOR", vectorizer.create_executor(1))
+    instance = Vectorizer.__new__(Vectorizer)
+    threads: set[str] = set()
+
+    def encode(_: str) -> bytes:
+        threads.add(threading.current_thread().name)
+        return b""
+
+    encode = mocker.patch.object(instance, "encode", side_effect=encode)
+
+    instance.warmup()
+
+    lengths = [len(call.args[0]) for call in encode.call_args_list]
+
+    for length in vectorizer.WARMUP_LENGTHS:
+        assert lengths.count(length) == vectorizer.WARMUP_ROUNDS * settings.VECTORIZER_CONCURRENCY
+
+    assert len(threads) == settings.VECTORIZER_CONCURRENCY
+    assert all(name.startswith("vectorizer") for name in threads)
+
+
+def test__autotune_selects_the_fastest_configuration(mocker: MockerFixture) -> None:
+    """
+    Test whether autotuning keeps the number of threads that encodes messages the fastest.
+
+    Asserts
+    -------
+    - The fastest number of threads is returned.
+    - The workers of the vectorizer use the fastest number of threads.
+    """
+    # Like torch, keep the number of threads of each thread separately
+    local = threading.local()
+    mocker.patch("torch.set_num_threads", side_effect=lambda n: setattr(local, "threads", n))
+    mocker.patch("torch.get_num_threads", side_effect=lambda: getattr(local, "threads", 1))
+    executor = mocker.patch.object(vectorizer, "EXECUTOR", ThreadPoolExecutor())
+
+    def encode(_: str) -> bytes:
+        time.sleep(0.001 if torch.get_num_threads() == 2 else 0.003)
+        return b""
+
+    instance = Vectorizer.__new__(Vectorizer)
+    mocker.patch.object(instance, "encode", side_effect=encode)
+
+    assert instance.autotune([1, 2, 4]) == 2
+    assert vectorizer.EXECUTOR is not executor
+
+    threads: list[int] = []
+    vectorizer.run_on_each_worker(
+        vectorizer.EXECUTOR,
+        lambda: threads.append(torch.get_num_threads()),
+    )
+    assert threads == [2] * settings.VECTORIZER_CONCURRENCY
@@ -1,17 +1,31 @@
 import datetime
+import json
+from collections import Counter
+from pathlib import Path
 
 import pytest
 import pytest_asyncio
 from redis.asyncio import Redis
 
 from courageous_comets import models
+from courageous_comets.client import CourageousCometsBot
+from courageous_comets.enums import StatisticScope
+from courageous_comets.redis.bulk import export_guild, import_guild
+from courageous_comets.redis.embeddings import get_embeddings, save_embeddings
 from courageous_comets.redis.keys import key_schema
 from courageous_comets.redis.messages import (
+    delete_messages,
+    get_message_snippets,
+    get_messages_by_hybrid_similarity,
     get_messages_by_semantics_similarity,
     get_messages_by_sentiment_similarity,
+    get_messages_sentiment,
+    get_messages_within_distance,
     get_recent_messages,
+    get_tokens_count_exact,
     save_message,
 )
+from courageous_comets.redis.search import get_search_page, save_search_results
 from courageous_comets.sentiment import calculate_sentiment
 from courageous_comets.vectorizer import Vectorizer
 from courageous_comets.words import tokenize_sentence, word_frequency
@@ -167,6 +181,43 @@ async def test__get_messages_by_sentiment_similarity(
     assert messages[0].message_id == message.message_id
 
 
+@pytest.mark.num_messages(5)
+async def test__get_messages_by_sentiment_similarity_closest_first(
+    redis: Redis,
+    messages: list[models.MessageAnalysis],
+) -> None:
+    """
+    Tests that a sentiment similarity search returns the closest sentiment first.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    messages: list[courageous_comets.models.MessageAnalysis]
+        The messages to save.
+
+    Asserts
+    -------
+    - The messages within the radius are returned by the distance of their sentiment.
+    """
+    compounds = [0.3, -0.04, 0.08, 0.01, -0.06]
+
+    for message, compound in zip(messages, compounds, strict=True):
+        sentiment = message.sentiment.model_copy(update={"compound": compound})
+        await save_message(redis, message.model_copy(update={"sentiment": sentiment}))
+
+    results = await get_messages_by_sentiment_similarity(
+        redis,
+        guild_id=messages[0].guild_id,
+        sentiment=0.0,
+        radius=0.1,
+        limit=3,
+    )
+
+    expected = [messages[3], messages[1], messages[4]]
+    assert [result.message_id for result in results] == [message.message_id for message in expected]
+
+
 @pytest.mark.parametrize(("limit", "expect"), [(10, 10), (150, 100)])
 @pytest.mark.num_messages(100)
 async def test__get_recent_messages(
@@ -197,3 +248,343 @@ async def test__get_recent_messages(
     # Update its timestamp with the provided message_timestamp
     db_messages = await get_recent_messages(redis, guild_id=guild_id, limit=limit)
     assert len(db_messages) == expect
+
+
+async def test__get_messages_sentiment(
+    redis: Redis,
+    message: models.MessageAnalysis,
+    sentiment: models.SentimentResult,
+) -> None:
+    """
+    Tests that the sentiment of multiple messages is fetched in order of the given keys.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    message: courageous_comets.models.MessageAnalysis
+        The message to save.
+    sentiment : courageous_comets.models.SentimentResult
+        The sentiment analayis result of message.
+
+    Asserts
+    -------
+    - The sentiment of the saved message is returned.
+    - None is returned for a key that does not exist.
+    """
+    key = await save_message(redis, message)
+    missing = key_schema.guild_messages(guild_id=int(message.guild_id), message_id=0)
+
+    results = await get_messages_sentiment([missing, key, missing], redis=redis)
+
+    assert results == [None, sentiment, None]
+
+
+@pytest.mark.num_messages(50)
+async def test__get_tokens_count_exact(
+    redis: Redis,
+    messages: list[models.MessageAnalysis],
+) -> None:
+    """
+    Tests that the tokens of all messages are counted, across multiple chunks.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    messages list[courageous_comets.models.MessageAnalysis]
+        The messages to save
+
+    Asserts
+    -------
+    - The token counts equal the sum of the token counts of all saved messages.
+    """
+    # Messages with the same ID overwrite each other
+    saved = {message.message_id: message for message in messages}
+
+    for message in saved.values():
+        await save_message(redis, message)
+
+    expected = Counter()
+    for message in saved.values():
+        expected.update(message.tokens)
+
+    counter = await get_tokens_count_exact(
+        redis,
+        guild_id=messages[0].guild_id,
+        scope=StatisticScope.GUILD,
+        chunk_size=7,
+    )
+
+    assert counter == expected
+
+
+async def test__get_embeddings(
+    bot: CourageousCometsBot,
+    redis: Redis,
+    message: models.MessageAnalysis,
+) -> None:
+    """
+    Tests that stored embeddings are read back byte for byte on the binary connection.
+
+    Parameters
+    ----------
+    bot: courageous_comets.client.CourageousCometsBot
+        The bot instance that holds the binary Redis connection.
+    redis: redis.Redis
+        The Redis connection instance.
+    message: courageous_comets.models.MessageAnalysis
+        The message to save.
+
+    Asserts
+    -------
+    - The embedding of the saved message is returned unchanged.
+    - None is returned for a key that does not exist.
+    - The main connection is rejected because it decodes replies.
+    """
+    key = await save_message(redis, message)
+    missing = key_schema.guild_messages(guild_id=int(message.guild_id), message_id=0)
+
+    embeddings = await get_embeddings([key, missing], redis=bot.redis_binary)  # type: ignore
+
+    assert embeddings == [message.embedding, None]
+
+    with pytest.raises(ValueError, match="binary"):
+        await get_embeddings([key], redis=redis)
+
+
+async def test__save_embeddings_accepts_memoryview(
+    bot: CourageousCometsBot,
+    redis: Redis,
+    message: models.MessageAnalysis,
+) -> None:
+    """
+    Tests that embeddings can be written from a memoryview without conversion.
+
+    Parameters
+    ----------
+    bot: courageous_comets.client.CourageousCometsBot
+        The bot instance that holds the binary Redis connection.
+    redis: redis.Redis
+        The Redis connection instance.
+    message: courageous_comets.models.MessageAnalysis
+        The message to save.
+
+    Asserts
+    -------
+    - The embedding written from a memoryview is read back unchanged.
+    """
+    key = await save_message(redis, message)
+    embedding = bytes(reversed(message.embedding))
+
+    await save_embeddings({key: memoryview(embedding)}, redis=bot.redis_binary)  # type: ignore
+
+    assert await get_embeddings([key], redis=bot.redis_binary) == [embedding]  # type: ignore
+
+
+@pytest.mark.parametrize(("target", "expect"), [(None, 1), (0.0, 1), (1.0, 0)])
+async def test__get_messages_by_hybrid_similarity(
+    redis: Redis,
+    message: models.MessageAnalysis,
+    target: float | None,
+    expect: int,
+) -> None:
+    """
+    Tests that a hybrid search only returns messages within the sentiment range.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    message: courageous_comets.models.MessageAnalysis
+        The message to save. Its sentiment is neutral.
+    target: float | None
+        The target sentiment of the search.
+    expect: int
+        The expected number of results.
+
+    Asserts
+    -------
+    - The saved message is found if its sentiment is within range of the target.
+    """
+    await save_message(redis, message)
+    messages = await get_messages_by_hybrid_similarity(
+        redis,
+        guild_id=message.guild_id,
+        embedding=message.embedding,
+        sentiment=target,
+        sentiment_radius=0.5,
+    )
+    assert [result.message_id for result in messages] == [message.message_id] * expect
+
+
+@pytest.mark.parametrize(("distance", "expect"), [(0.1, 1), (0.0, 0)])
+async def test__get_messages_within_distance(
+    redis: Redis,
+    message: models.MessageAnalysis,
+    distance: float,
+    expect: int,
+) -> None:
+    """
+    Tests that a range search returns the messages within the given distance.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    message: courageous_comets.models.MessageAnalysis
+        The message to save.
+    distance: float
+        The distance threshold of the search.
+    expect: int
+        The expected number of results.
+
+    Asserts
+    -------
+    - The saved message is found with its own embedding if the distance is positive.
+    """
+    await save_message(redis, message)
+    messages = await get_messages_within_distance(
+        redis,
+        guild_id=message.guild_id,
+        embedding=message.embedding,
+        distance=distance,
+    )
+    assert len(messages) == expect
+
+
+@pytest.mark.num_messages(5)
+async def test__get_search_page(
+    redis: Redis,
+    messages: list[models.MessageAnalysis],
+) -> None:
+    """
+    Tests that stored search results are read back page by page.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    messages list[courageous_comets.models.MessageAnalysis]
+        The messages to store as search results.
+
+    Asserts
+    -------
+    - The first page holds the first messages.
+    - The last page holds the remaining messages in order.
+    - Reading unknown search results returns None.
+    """
+    results = [models.Message.model_validate(message.model_dump()) for message in messages]
+    result_ids = [result.message_id for result in results]
+    guild_id = messages[0].guild_id
+
+    first = await save_search_results(redis, results, guild_id=guild_id, page_size=2)
+    assert (first.page, first.page_count) == (0, 3)
+    assert [message.message_id for message in first.messages] == result_ids[:2]
+
+    last = await get_search_page(
+        redis,
+        guild_id=guild_id,
+        cursor_id=first.cursor_id,
+        page=2,
+        page_size=2,
+    )
+    assert last is not None
+    assert [message.message_id for message in last.messages] == result_ids[4:]
+
+    missing = await get_search_page(redis, guild_id=guild_id, cursor_id="missing", page=0)
+    assert missing is None
+
+
+@pytest.mark.num_messages(20)
+async def test__export_and_import_guild(
+    bot: CourageousCometsBot,
+    redis: Redis,
+    messages: list[models.MessageAnalysis],
+    tmp_path: Path,
+) -> None:
+    """
+    Tests that an exported guild is restored unchanged by an import.
+
+    Parameters
+    ----------
+    bot: courageous_comets.client.CourageousCometsBot
+        The bot instance that holds the binary Redis connection.
+    redis: redis.Redis
+        The Redis connection instance.
+    messages list[courageous_comets.models.MessageAnalysis]
+        The messages to export.
+    tmp_path: pathlib.Path
+        The directory to export to.
+
+    Asserts
+    -------
+    - All messages are exported and imported, across multiple chunks.
+    - The embeddings, sentiment, tokens and snippets of the messages are restored.
+    - Messages without a snippet are restored without a snippet.
+    """
+    # Give every other message a snippet, including characters outside of ASCII
+    saved = {
+        message.message_id: message.model_copy(update={"snippet": f"Snippet {i} ☄️"})
+        if i % 2
+        else message
+        for i, message in enumerate(messages)
+    }
+    keys = [await save_message(redis, message) for message in saved.values()]
+    guild_id = messages[0].guild_id
+
+    exported = await export_guild(
+        bot.redis_binary,  # type: ignore
+        guild_id=guild_id,
+        directory=tmp_path,
+        chunk_size=7,
+    )
+    await redis.delete(*keys)
+    imported = await import_guild(bot.redis_binary, directory=tmp_path, chunk_size=7)  # type: ignore
+
+    assert exported == imported == len(saved)
+
+    embeddings = await get_embeddings(keys, redis=bot.redis_binary)  # type: ignore
+    assert embeddings == [message.embedding for message in saved.values()]
+
+    sentiment = await get_messages_sentiment(keys, redis=redis)
+    assert sentiment == [message.sentiment for message in saved.values()]
+
+    for key, message in zip(keys, saved.values(), strict=True):
+        assert json.loads(await redis.hget(key, "tokens")) == message.tokens  # type: ignore
+        assert await redis.hget(key, "snippet") == message.snippet  # type: ignore
+
+
+async def test__delete_messages(
+    redis: Redis,
+    message: models.MessageAnalysis,
+) -> None:
+    """
+    Tests that the snippet of a message is returned by searches until the message is deleted.
+
+    Parameters
+    ----------
+    redis: redis.Redis
+        The Redis connection instance.
+    message: courageous_comets.models.MessageAnalysis
+        The message to save.
+
+    Asserts
+    -------
+    - Search results include the stored snippet.
+    - The message is deleted, and its snippet is no longer found.
+    """
+    snippet = message.model_copy(update={"snippet": "The quick brown fox"})
+    key = await save_message(redis, snippet)
+
+    results = await get_recent_messages(redis, guild_id=message.guild_id)
+    assert [result.snippet for result in results] == ["The quick brown fox"]
+
+    deleted = await delete_messages(
+        redis,
+        guild_id=message.guild_id,
+        message_ids=[message.message_id],
+    )
+
+    assert deleted == 1
+    assert await get_message_snippets([key], redis=redis) == [None]